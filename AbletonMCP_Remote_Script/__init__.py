@@ -2,30 +2,37 @@
 from __future__ import absolute_import, print_function, unicode_literals
 
 from _Framework.ControlSurface import ControlSurface
-import socket
-import json
-import threading
 import time
 import traceback
 
-# Change queue import for Python 2
-try:
-    import Queue as queue  # Python 2
-except ImportError:
-    import queue  # Python 3
-
 from . import handlers
+from .io_loop import IOLoop
+from .main_thread import MainThreadQueue, PendingResult, DEFAULT_TICK_BUDGET_MS
+from .modulation import ModulationEngine
+from .scheduler import CommandScheduler
+from .timeline import TimelinePlayer
+from .track_map import TrackIndexMap
+from .param_cache import DisplayValueCache, ParameterIndexCache
+from .realtime import RealtimeParameterBuffer
+from .session_model import SessionModel
+from .subscriptions import SubscriptionManager
 
 # Constants for socket communication
 DEFAULT_PORT = 9877
 UDP_REALTIME_PORT = 9882
 HOST = "localhost"
 
+# execute_batch limits: entry count cap and how long the client thread waits
+# for the single main-thread task that runs the whole batch.
+MAX_BATCH_COMMANDS = 500
+BATCH_TIMEOUT = 30.0
+
 # -----------------------------------------------------------------------
 # Command dispatch tables
 # -----------------------------------------------------------------------
 # Both modifying and read-only commands are dispatched on Ableton's main
-# thread via schedule_message + queue (Live API is not thread-safe).
+# thread via the MainThreadQueue drained in update_display (Live API is not
+# thread-safe).
 # The distinction controls timeout behaviour and future optimisation.
 #
 # Each value is a lambda(song, p, ctrl) that extracts parameters from *p*
@@ -167,6 +174,13 @@ _MODIFYING_HANDLERS = {
     "set_device_parameters_batch": lambda song, p, ctrl: handlers.devices.set_device_parameters_batch(
         song, p.get("track_index", 0), p.get("device_index", 0),
         p.get("parameters", []), p.get("track_type", "track"), ctrl),
+    "start_parameter_modulation": lambda song, p, ctrl: ctrl.modulation.start(song, p),
+    "modify_parameter_modulation": lambda song, p, ctrl: ctrl.modulation.modify(p),
+    "stop_parameter_modulation": lambda song, p, ctrl: ctrl.modulation.stop(p),
+    "schedule_command": lambda song, p, ctrl: ctrl.scheduler.schedule(song, p),
+    "cancel_scheduled_command": lambda song, p, ctrl: ctrl.scheduler.cancel(p),
+    "load_timeline": lambda song, p, ctrl: ctrl.timelines.load(song, p),
+    "control_timeline": lambda song, p, ctrl: ctrl.timelines.control(song, p),
     "delete_device": lambda song, p, ctrl: handlers.devices.delete_device(
         song, p.get("track_index", 0), p.get("device_index", 0),
         track_type=p.get("track_type", "track"), ctrl=ctrl),
@@ -235,6 +249,10 @@ _MODIFYING_HANDLERS = {
         p.get("action", "insert"), p.get("slice_time"), p.get("new_time"),
         track_type=p.get("track_type", "track"), ctrl=ctrl),
 
+    # --- LOM ---
+    "set_lom_properties": lambda song, p, ctrl: handlers.lom.set_lom_properties(
+        song, p.get("entries", []), p.get("undo_step", False), ctrl),
+
     # --- Browser ---
     "load_browser_item": lambda song, p, ctrl: handlers.browser.load_browser_item(song, p.get("track_index", 0), p.get("item_uri", ""), ctrl),
     "load_instrument_or_effect": lambda song, p, ctrl: handlers.browser.load_instrument_or_effect(song, p.get("track_index", 0), p.get("uri", ""), ctrl),
@@ -292,6 +310,10 @@ _MODIFYING_HANDLERS = {
         song, p.get("track_index", 0), p.get("clip_index", 0),
         p.get("beat_time", 0.0), ctrl),
 
+    # --- Remote Script internals ---
+    "set_main_thread_budget": lambda song, p, ctrl: {
+        "tick_budget_ms": ctrl.main_thread_queue.set_tick_budget_ms(p.get("tick_budget_ms", DEFAULT_TICK_BUDGET_MS))},
+
     # --- Looper ---
     "control_looper": lambda song, p, ctrl: handlers.devices.control_looper(
         song, p.get("track_index", 0), p.get("device_index", 0),
@@ -316,18 +338,23 @@ _READONLY_HANDLERS = {
     "get_playing_clips": lambda song, p, ctrl: handlers.session.get_playing_clips(song, ctrl),
 
     # --- Tracks ---
-    "get_track_info": lambda song, p, ctrl: handlers.tracks.get_track_info(song, p.get("track_index", 0), ctrl),
-    "get_all_tracks_info": lambda song, p, ctrl: handlers.tracks.get_all_tracks_info(song, ctrl),
+    "get_track_info": lambda song, p, ctrl: handlers.tracks.get_track_info(
+        song, p.get("track_index", 0), ctrl, p.get("fields"),
+        p.get("slot_offset", 0), p.get("slot_limit"), p.get("device_offset", 0), p.get("device_limit")),
+    "get_all_tracks_info": lambda song, p, ctrl: handlers.tracks.get_all_tracks_info(
+        song, ctrl, p.get("fields"), p.get("offset", 0), p.get("limit")),
     "get_return_tracks_info": lambda song, p, ctrl: handlers.tracks.get_return_tracks_info(song, ctrl),
     "get_track_routing": lambda song, p, ctrl: handlers.tracks.get_track_routing(song, p.get("track_index", 0), ctrl),
     "get_track_meters": lambda song, p, ctrl: handlers.tracks.get_track_meters(song, p.get("track_index", 0), ctrl),
     "get_take_lanes": lambda song, p, ctrl: handlers.tracks.get_take_lanes(song, p.get("track_index", 0), ctrl),
+    "get_track_hierarchy": lambda song, p, ctrl: handlers.tracks.get_track_hierarchy(song, ctrl),
 
     # --- Clips ---
     "get_clip_info": lambda song, p, ctrl: handlers.clips.get_clip_info(song, p.get("track_index", 0), p.get("clip_index", 0), ctrl),
 
     # --- Mixer ---
-    "get_scenes": lambda song, p, ctrl: handlers.mixer.get_scenes(song, ctrl),
+    "get_scenes": lambda song, p, ctrl: handlers.mixer.get_scenes(
+        song, ctrl, p.get("fields"), p.get("offset", 0), p.get("limit")),
     "get_return_tracks": lambda song, p, ctrl: handlers.mixer.get_return_tracks(song, ctrl),
     "get_return_track_info": lambda song, p, ctrl: handlers.mixer.get_return_track_info(song, p.get("return_track_index", 0), ctrl),
     "get_master_track_info": lambda song, p, ctrl: handlers.mixer.get_master_track_info(song, ctrl),
@@ -336,6 +363,9 @@ _READONLY_HANDLERS = {
     "get_device_parameters": lambda song, p, ctrl: handlers.devices.get_device_parameters(
         song, p.get("track_index", 0), p.get("device_index", 0),
         p.get("track_type", "track"), ctrl),
+    "prewarm_display_values": lambda song, p, ctrl: handlers.devices.prewarm_display_values(
+        song, p.get("track_index", 0), p.get("device_index", 0),
+        p.get("parameter_names"), p.get("track_type", "track"), ctrl),
     "get_macro_values": lambda song, p, ctrl: handlers.devices.get_macro_values(
         song, p.get("track_index", 0), p.get("device_index", 0),
         track_type=p.get("track_type", "track"), ctrl=ctrl),
@@ -361,6 +391,10 @@ _READONLY_HANDLERS = {
         song, p.get("track_index", 0), p.get("device_index", 0),
         track_type=p.get("track_type", "track"), ctrl=ctrl),
 
+    # --- LOM ---
+    "get_lom_properties": lambda song, p, ctrl: handlers.lom.get_lom_properties(
+        song, p.get("queries", []), p.get("properties"), ctrl),
+
     # --- Browser ---
     "get_browser_item": lambda song, p, ctrl: handlers.browser.get_browser_item(song, p.get("uri"), p.get("path"), ctrl),
     "get_browser_tree": lambda song, p, ctrl: handlers.browser.get_browser_tree(song, p.get("category_type", "all"), ctrl),
@@ -390,11 +424,44 @@ _READONLY_HANDLERS = {
     "analyze_audio_clip": lambda song, p, ctrl: handlers.audio.analyze_audio_clip(song, p.get("track_index", 0), p.get("clip_index", 0), ctrl),
     "get_warp_markers": lambda song, p, ctrl: handlers.clips.get_warp_markers(song, p.get("track_index", 0), p.get("clip_index", 0), ctrl),
 
+    # --- Remote Script internals ---
+    "get_main_thread_stats": lambda song, p, ctrl: ctrl.main_thread_queue.stats(),
+    "get_subscription_stats": lambda song, p, ctrl: ctrl.subscriptions.stats(),
+    "get_realtime_stats": lambda song, p, ctrl: ctrl.realtime_buffer.stats(),
+    "get_parameter_modulations": lambda song, p, ctrl: ctrl.modulation.describe(),
+    "get_scheduled_commands": lambda song, p, ctrl: ctrl.scheduler.describe(song),
+    "get_timelines": lambda song, p, ctrl: ctrl.timelines.describe(song),
+    "get_session_delta": lambda song, p, ctrl: ctrl.session_model.delta(song, p.get("since_generation", 0), p.get("epoch"), ctrl),
+
     # --- Arrangement ---
     "get_arrangement_clips": lambda song, p, ctrl: handlers.arrangement.get_arrangement_clips(song, p.get("track_index", 0), ctrl),
 }
 
 
+# Modifying commands that make Live rebuild part of its object model
+# (tracks, devices, clips, scenes, undo history).  Their responses are held
+# for one extra tick so the client only continues once the set has settled;
+# plain value writes answer as soon as the main-thread task has run.
+_SETTLE_COMMANDS = frozenset([
+    "create_midi_track", "create_audio_track", "create_return_track",
+    "delete_track", "duplicate_track", "create_midi_track_with_simpler",
+    "insert_device", "delete_device", "sliced_simpler_to_drum_rack",
+    "load_browser_item", "load_instrument_or_effect", "load_sample",
+    "create_scene", "delete_scene", "duplicate_scene",
+    "create_clip", "delete_clip", "duplicate_clip", "duplicate_clip_to_arrangement",
+    "duplicate_clip_region", "audio_to_midi", "capture_midi",
+    "freeze_track", "unfreeze_track", "create_take_lane", "copy_drum_pad",
+    "delete_time", "duplicate_time", "insert_silence",
+    "undo", "redo",
+])
+
+
+# Commands that manage scheduled execution can't themselves be scheduled
+_SCHEDULER_COMMANDS = frozenset([
+    "schedule_command", "cancel_scheduled_command", "load_timeline", "control_timeline",
+])
+
+
 def create_instance(c_instance):
     """Create and return the AbletonMCP script instance"""
     return AbletonMCP(c_instance)
@@ -408,21 +475,42 @@ class AbletonMCP(ControlSurface):
         ControlSurface.__init__(self, c_instance)
         self.log_message("AbletonMCP Beta Remote Script initializing...")
 
-        # Socket server for communication
-        self.server = None
-        self.client_threads = []
-        self.client_sockets = []
-        self.server_thread = None
-        self.running = False
+        # Work handed to Live's main thread, drained in update_display
+        self.main_thread_queue = MainThreadQueue(DEFAULT_TICK_BUDGET_MS, log=self.log_message)
+
+        # One selector loop serves the TCP command port and the UDP
+        # real-time parameter port
+        self.io_loop = None
+
+        # Listener-driven change events pushed to subscribed clients
+        self.subscriptions = SubscriptionManager(self, self._push_to_client)
+
+        # Generation counters behind get_session_delta
+        self.session_model = SessionModel(self)
+
+        # Track identity -> index and group tree, rebuilt when tracks change
+        self.track_map = TrackIndexMap()
 
-        # UDP real-time parameter server
-        self.udp_sock = None
-        self.udp_thread = None
-        self.udp_running = False
+        # Name->parameter tables for the parameter setters (UDP hot path)
+        self.param_cache = ParameterIndexCache()
+        # Display string -> raw value tables for value_display
+        self.display_cache = DisplayValueCache()
+
+        # UDP parameter writes, coalesced to one write per parameter per tick
+        self.realtime_buffer = RealtimeParameterBuffer(
+            self.main_thread_queue.submit, self._apply_realtime_updates, self.log_message)
+
+        # Parameter ramps/LFOs advanced every tick
+        self.modulation = ModulationEngine(self)
+
+        # Modifying commands held until a target song position, and
+        # uploaded cue lists of them
+        schedulable = frozenset(_MODIFYING_HANDLERS) - _SCHEDULER_COMMANDS
+        self.scheduler = CommandScheduler(self, self._dispatch_modifying, schedulable)
+        self.timelines = TimelinePlayer(self, self._dispatch_modifying, schedulable)
 
         # Start the socket servers
         self.start_server()
-        self.start_udp_server()
 
         self.log_message("AbletonMCP Beta initialized")
 
@@ -434,287 +522,108 @@ class AbletonMCP(ControlSurface):
         """Always return the current song, even after File > New"""
         return self.song()
 
+    def update_display(self):
+        """Live's periodic tick: drain main-thread work within the tick budget."""
+        ControlSurface.update_display(self)
+        # Scheduled commands first, so queued work can't delay them
+        self.scheduler.tick()
+        self.timelines.tick()
+        self.main_thread_queue.drain()
+        self.modulation.tick()
+        self.subscriptions.flush()
+        self.display_cache.prewarm_tick()
+
     def disconnect(self):
         """Called when Ableton closes or the control surface is removed"""
         self.log_message("AbletonMCP Beta disconnecting...")
-        self.running = False
-        self.udp_running = False
 
-        # Close all client sockets so their threads can exit
-        for sock in self.client_sockets[:]:
-            try:
-                sock.shutdown(socket.SHUT_RDWR)
-            except (OSError, socket.error):
-                pass
-            try:
-                sock.close()
-            except (OSError, socket.error):
-                pass
-        self.client_sockets = []
-
-        # Stop the server
-        if self.server:
-            try:
-                self.server.shutdown(socket.SHUT_RDWR)
-            except (OSError, socket.error):
-                pass
-            try:
-                self.server.close()
-            except (OSError, socket.error):
-                pass
-
-        # Wait for the server thread to exit
-        if self.server_thread and self.server_thread.is_alive():
-            self.server_thread.join(3.0)
-
-        # Wait briefly for client threads to exit
-        for client_thread in self.client_threads[:]:
-            if client_thread.is_alive():
-                client_thread.join(3.0)
-
-        # Close UDP socket
-        if self.udp_sock:
-            try:
-                self.udp_sock.close()
-            except (OSError, socket.error):
-                pass
-            self.udp_sock = None
+        self.scheduler.disconnect()
+        self.timelines.disconnect()
+        self.modulation.disconnect()
+        self.subscriptions.disconnect()
+        self.session_model.disconnect()
+        self.param_cache.disconnect()
+        self.track_map.disconnect()
 
-        if self.udp_thread and self.udp_thread.is_alive():
-            self.udp_thread.join(3.0)
+        # Closes the listener, every client and the UDP socket
+        if self.io_loop is not None:
+            self.io_loop.stop()
+            self.io_loop = None
 
         ControlSurface.disconnect(self)
         self.log_message("AbletonMCP Beta disconnected")
 
     def start_server(self):
-        """Start the socket server in a separate thread"""
+        """Start the TCP and UDP socket servers on a single I/O thread"""
         try:
-            self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.server.bind((HOST, DEFAULT_PORT))
-            self.server.listen(5)
-
-            self.running = True
-            self.server_thread = threading.Thread(target=self._server_thread)
-            self.server_thread.daemon = True
-            self.server_thread.start()
-
-            self.log_message("Server started on port " + str(DEFAULT_PORT))
+            self.io_loop = IOLoop(
+                HOST, DEFAULT_PORT, UDP_REALTIME_PORT,
+                submit=self._submit_client_command,
+                on_udp=self._process_udp_command,
+                log=self.log_message,
+                on_connect=self._on_client_connected,
+                on_disconnect=self._on_client_disconnected,
+            )
+            self.io_loop.start()
         except Exception as e:
+            self.io_loop = None
             self.log_message("Error starting server: " + str(e))
             self.show_message("AbletonMCP Beta: Error starting server - " + str(e))
 
-    def start_udp_server(self):
-        """Start the UDP real-time parameter server in a separate thread."""
-        try:
-            self.udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            self.udp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.udp_sock.bind((HOST, UDP_REALTIME_PORT))
-            self.udp_sock.settimeout(1.0)
+    def _on_client_connected(self, address):
+        self.show_message("AbletonMCP Beta: Client connected")
 
-            self.udp_running = True
-            self.udp_thread = threading.Thread(target=self._udp_server_loop)
-            self.udp_thread.daemon = True
-            self.udp_thread.start()
+    def _on_client_disconnected(self, client):
+        # I/O thread: listener removal has to happen on the main thread
+        self.main_thread_queue.submit(lambda: self.subscriptions.drop_client(client))
 
-            self.log_message("UDP real-time server started on port " + str(UDP_REALTIME_PORT))
-        except Exception as e:
-            self.udp_running = False
-            self.log_message("Error starting UDP server: " + str(e))
-
-    def _udp_server_loop(self):
-        """UDP server loop - receives fire-and-forget parameter updates."""
-        while self.udp_running:
-            try:
-                data, addr = self.udp_sock.recvfrom(4096)
-                if not data:
-                    continue
-
-                try:
-                    command = json.loads(data.decode("utf-8"))
-                except (ValueError, UnicodeDecodeError) as parse_err:
-                    self.log_message(
-                        "UDP: malformed packet from {0}: {1}".format(addr, parse_err))
-                    continue
-
-                self._process_udp_command(command)
-
-            except socket.timeout:
-                continue
-            except Exception as e:
-                if self.udp_running:
-                    self.log_message("UDP server error: " + str(e))
-                time.sleep(0.1)
+    def _push_to_client(self, client, message):
+        io_loop = self.io_loop
+        if io_loop is not None:
+            io_loop.push(client, message)
 
     def _process_udp_command(self, command):
         """Process a UDP command. Fire-and-forget - no response sent.
 
-        IMPORTANT: This runs on the UDP thread.  Do NOT access self._song
+        IMPORTANT: This runs on the I/O thread.  Do NOT access self._song
         here — the Live API is not thread-safe.  Instead, capture only the
         plain-data cmd/params on this thread and defer all Live API access
-        (including self._song) to the scheduled task that runs on the main
-        thread.  If schedule_message fails, drop the update with a log
-        message rather than calling the task inline from the wrong thread.
+        (including self._song) to the task queued for the main thread.
         """
         cmd = command.get("type", "")
         params = command.get("params", {})
 
         if cmd == "set_device_parameter":
-            def task():
-                try:
-                    handlers.devices.set_device_parameter(
-                        self._song,
-                        params.get("track_index", 0),
-                        params.get("device_index", 0),
-                        params.get("parameter_name", ""),
-                        params.get("value", 0.0),
-                        params.get("track_type", "track"),
-                        ctrl=self,
-                    )
-                except Exception as e:
-                    self.log_message("UDP set_device_parameter error: " + str(e))
-            try:
-                self.schedule_message(0, task)
-            except AssertionError:
-                self.log_message("UDP set_device_parameter: schedule_message unavailable, dropping update")
-
+            entry = {"name": params.get("parameter_name", "")}
+            if "value" in params:
+                entry["value"] = params["value"]
+            updates = [entry]
+            first_match = True
         elif cmd == "batch_set_device_parameters":
-            def task():
-                try:
-                    handlers.devices.set_device_parameters_batch(
-                        self._song,
-                        params.get("track_index", 0),
-                        params.get("device_index", 0),
-                        params.get("parameters", []),
-                        params.get("track_type", "track"),
-                        ctrl=self,
-                    )
-                except Exception as e:
-                    self.log_message("UDP batch_set error: " + str(e))
-            try:
-                self.schedule_message(0, task)
-            except AssertionError:
-                self.log_message("UDP batch_set: schedule_message unavailable, dropping update")
-
-    def _server_thread(self):
-        """Server thread implementation - handles client connections"""
-        try:
-            self.log_message("Server thread started")
-            self.server.settimeout(1.0)
-
-            while self.running:
-                try:
-                    client, address = self.server.accept()
-                    self.log_message("Connection accepted from " + str(address))
-                    self.show_message("AbletonMCP Beta: Client connected")
-
-                    client_thread = threading.Thread(
-                        target=self._handle_client,
-                        args=(client,)
-                    )
-                    client_thread.daemon = True
-                    client_thread.start()
-
-                    self.client_threads.append(client_thread)
-                    self.client_sockets.append(client)
-
-                    # Clean up finished client threads
-                    self.client_threads = [t for t in self.client_threads if t.is_alive()]
-
-                except socket.timeout:
-                    continue
-                except Exception as e:
-                    if self.running:
-                        self.log_message("Server accept error: " + str(e))
-                    time.sleep(0.5)
-
-            self.log_message("Server thread stopped")
-        except Exception as e:
-            self.log_message("Server thread error: " + str(e))
-
-    def _handle_client(self, client):
-        """Handle communication with a connected client"""
-        self.log_message("Client handler started")
-        client.settimeout(5.0)
-        buffer = ''
-
-        try:
-            while self.running:
-                try:
-                    try:
-                        data = client.recv(8192)
-                    except socket.timeout:
-                        continue
-
-                    if not data:
-                        self.log_message("Client disconnected")
-                        break
-
-                    # Accumulate data (replace invalid UTF-8 instead of crashing)
-                    buffer += data.decode('utf-8', errors='replace')
-
-                    # Process all complete newline-delimited messages
-                    while '\n' in buffer:
-                        line, buffer = buffer.split('\n', 1)
-                        line = line.strip()
-                        if not line:
-                            continue
-
-                        try:
-                            command = json.loads(line)
-                        except ValueError:
-                            self.log_message("Invalid JSON received, skipping: " + line[:100])
-                            continue
-
-                        self.log_message("Received command: " + str(command.get("type", "unknown")))
-
-                        response = self._process_command(command)
-
-                        response_str = json.dumps(response) + '\n'
-                        try:
-                            client.sendall(response_str.encode('utf-8'))
-                        except (OSError, socket.error):
-                            self.log_message("Client disconnected during response send")
-                            break
-
-                    # 1MB safety limit
-                    if len(buffer) > 1048576:
-                        self.log_message("Buffer overflow (>1MB without newline), disconnecting client")
-                        try:
-                            err = json.dumps({"status": "error", "message": "Request too large (>1MB)"}) + '\n'
-                            client.sendall(err.encode('utf-8'))
-                        except Exception:
-                            pass
-                        break
-
-                except Exception as e:
-                    self.log_message("Error handling client data: " + str(e))
-                    self.log_message(traceback.format_exc())
-
-                    error_response = {"status": "error", "message": self._safe_error_message(e)}
-                    try:
-                        client.sendall((json.dumps(error_response) + '\n').encode('utf-8'))
-                    except Exception:
-                        break
-
-                    if not isinstance(e, ValueError):
-                        break
-        except Exception as e:
-            self.log_message("Error in client handler: " + str(e))
-        finally:
-            try:
-                client.shutdown(socket.SHUT_RDWR)
-            except (OSError, socket.error):
-                pass
-            try:
-                client.close()
-            except (OSError, socket.error):
-                pass
-            try:
-                self.client_sockets.remove(client)
-            except ValueError:
-                pass
-            self.log_message("Client handler stopped")
+            updates = [entry for entry in params.get("parameters", []) if isinstance(entry, dict)]
+            first_match = False
+        else:
+            return
+        # Last write per parameter wins; one flush per tick applies them
+        self.realtime_buffer.offer(
+            params.get("track_type", "track"),
+            params.get("track_index", 0),
+            params.get("device_index", 0),
+            updates,
+            sender=command.get("sender"),
+            seq=command.get("seq"),
+            first_match=first_match,
+        )
+
+    def _apply_realtime_updates(self, track_type, track_index, device_index, entries, first_match):
+        """Main thread: write one device's coalesced UDP updates."""
+        params = {"track_index": track_index, "device_index": device_index,
+                  "parameters": entries, "track_type": track_type}
+        result = handlers.devices.set_device_parameters_batch(
+            self._song, track_index, device_index, entries, track_type, ctrl=self,
+            first_match=first_match)
+        self.session_model.note_command("set_device_parameters_batch", params)
+        return result["results"]
 
     # ------------------------------------------------------------------
     # Error sanitisation
@@ -734,8 +643,6 @@ class AbletonMCP(ControlSurface):
             return "Missing required parameter: {0}".format(e)
         if isinstance(e, TypeError):
             return "Invalid parameter type"
-        if isinstance(e, queue.Empty):
-            return "Operation timed out"
         return "Internal error - check Ableton log for details"
 
     # ------------------------------------------------------------------
@@ -744,59 +651,126 @@ class AbletonMCP(ControlSurface):
 
     def _process_command(self, command):
         """Process a command from the client and return a response."""
+        return self._submit_command(command).wait()
+
+    def _submit_client_command(self, command, client):
+        """Like _submit_command, plus the commands bound to a connection."""
+        command_type = command.get("type", "")
+        if command_type == "subscribe":
+            dispatch = lambda cmd, p: self.subscriptions.subscribe(client, p)
+        elif command_type == "unsubscribe":
+            dispatch = lambda cmd, p: self.subscriptions.unsubscribe(client, p)
+        else:
+            return self._submit_command(command)
+        return self._schedule_on_main_thread(
+            dispatch, command_type, command.get("params", {}), command.get("id"),
+            "Timeout waiting for {0}".format(command_type))
+
+    def _submit_command(self, command):
+        """Route *command* and schedule it without waiting for the result.
+
+        Returns a PendingResult that receives the response dict.  When the
+        request carries an ``id`` field it is echoed back so clients can
+        match out-of-order responses.
+        """
         command_type = command.get("type", "")
         params = command.get("params", {})
-        response = {"status": "success", "result": {}}
+        request_id = command.get("id")
 
         try:
             if command_type in _MODIFYING_HANDLERS:
-                response = self._dispatch_on_main_thread(command_type, params)
+                return self._schedule_on_main_thread(
+                    self._dispatch_modifying, command_type, params, request_id,
+                    "Timeout waiting for operation to complete",
+                    modifying=True, settle=command_type in _SETTLE_COMMANDS)
             elif command_type in _READONLY_HANDLERS:
-                response = self._dispatch_on_main_thread_readonly(command_type, params)
-            else:
-                response["status"] = "error"
-                response["message"] = "Unknown command: " + command_type
+                return self._schedule_on_main_thread(
+                    self._dispatch_read_only, command_type, params, request_id,
+                    "Timeout waiting for read-only operation to complete")
+            elif command_type == "execute_batch":
+                entry_types = self._validate_batch(params.get("commands", []))
+                return self._schedule_on_main_thread(
+                    self._dispatch_batch, command_type, params, request_id,
+                    "Timeout waiting for batch to complete",
+                    # Always settled: the client counts execute_batch as
+                    # modifying and would otherwise sleep after read-only batches
+                    modifying=True,
+                    settle=any(t in _SETTLE_COMMANDS for t in entry_types),
+                    timeout=BATCH_TIMEOUT)
+            response = {"status": "error", "message": "Unknown command: " + command_type}
         except Exception as e:
             self.log_message("Error processing command: " + str(e))
             self.log_message(traceback.format_exc())
-            response["status"] = "error"
-            response["message"] = self._safe_error_message(e)
-
-        return response
-
-    def _dispatch_on_main_thread_impl(self, dispatch_fn, command_type, params, timeout_msg):
-        """Schedule a command on Ableton's main thread and wait for the result."""
-        response_queue = queue.Queue()
+            response = {"status": "error", "message": self._safe_error_message(e)}
+
+        pending = PendingResult(request_id)
+        pending.set(response)
+        return pending
+
+    def _schedule_on_main_thread(self, dispatch_fn, command_type, params, request_id,
+                                 timeout_msg, modifying=False, settle=False, timeout=10.0):
+        """Schedule a command on Ableton's main thread.
+
+        *modifying* commands are answered with ``"settled": true`` plus
+        timings, which tells the MCP server it can skip its fixed safety
+        sleeps, and (while anyone is subscribed to changes) with the
+        ``event_seq`` at which subscribers see the write.  With *settle* the response is additionally held back for
+        one more tick after the handler returns, so Live has processed a
+        structural change (listeners, device loads, view updates) before
+        the client sends its next command.
+
+        Returns the PendingResult the response is delivered to; it reports
+        *timeout_msg* if the main thread hasn't answered within *timeout*.
+        """
+        pending = PendingResult(request_id, timeout, timeout_msg)
 
         def main_thread_task():
+            started = time.time()
             try:
                 result = dispatch_fn(command_type, params)
-                response_queue.put({"status": "success", "result": result})
             except Exception as e:
                 self.log_message("Error in main thread task: " + str(e))
                 self.log_message(traceback.format_exc())
-                response_queue.put({"status": "error", "message": self._safe_error_message(e)})
+                response = {"status": "error", "message": self._safe_error_message(e)}
+                if modifying:
+                    # A failed write may still have changed something
+                    self._add_event_seq(response)
+                pending.set(response)
+                return
+
+            response = {"status": "success", "result": result}
+            if not modifying:
+                pending.set(response)
+                return
+
+            finished = time.time()
+
+            def settled():
+                response["settled"] = True
+                response["timing"] = {
+                    "exec_ms": round((finished - started) * 1000.0, 2),
+                    "settle_ms": round((time.time() - finished) * 1000.0, 2),
+                }
+                self._add_event_seq(response)
+                pending.set(response)
+
+            if settle:
+                self.main_thread_queue.defer_to_next_tick(settled)
+            else:
+                settled()
 
-        try:
-            self.schedule_message(0, main_thread_task)
-        except AssertionError:
-            self.log_message("TCP command: schedule_message unavailable, returning error")
-            return {"status": "error", "message": "Ableton scheduling unavailable — try again shortly"}
+        self.main_thread_queue.submit(main_thread_task)
+        return pending
 
+    def _add_event_seq(self, response):
+        """Main thread: push a write's changes to subscribers now and name their seq."""
         try:
-            return response_queue.get(timeout=10.0)
-        except queue.Empty:
-            return {"status": "error", "message": timeout_msg}
-
-    def _dispatch_on_main_thread(self, command_type, params):
-        return self._dispatch_on_main_thread_impl(
-            self._dispatch_modifying, command_type, params,
-            "Timeout waiting for operation to complete")
-
-    def _dispatch_on_main_thread_readonly(self, command_type, params):
-        return self._dispatch_on_main_thread_impl(
-            self._dispatch_read_only, command_type, params,
-            "Timeout waiting for read-only operation to complete")
+            seq = self.subscriptions.sync()
+        except Exception as e:
+            self.log_message("Subscription sync failed: " + str(e))
+            return
+        if seq is not None:
+            response["event_seq"] = seq
 
     # ------------------------------------------------------------------
     # Modifying command dispatch
@@ -807,7 +781,71 @@ class AbletonMCP(ControlSurface):
         handler = _MODIFYING_HANDLERS.get(cmd)
         if handler is None:
             raise ValueError("Unknown modifying command: {0}".format(cmd))
-        return handler(self._song, p, self)
+        result = handler(self._song, p, self)
+        self.session_model.note_command(cmd, p)
+        return result
+
+    # ------------------------------------------------------------------
+    # Batch dispatch
+    # ------------------------------------------------------------------
+
+    def _validate_batch(self, commands):
+        """Check a batch before scheduling it; return the entry command types.
+
+        Rejects the whole batch up front (nothing is executed) if any entry
+        is malformed or names an unknown command.
+        """
+        if not isinstance(commands, list) or not commands:
+            raise ValueError("execute_batch requires a non-empty 'commands' list")
+        if len(commands) > MAX_BATCH_COMMANDS:
+            raise ValueError("execute_batch accepts at most {0} commands, got {1}".format(
+                MAX_BATCH_COMMANDS, len(commands)))
+        entry_types = []
+        for i, entry in enumerate(commands):
+            if not isinstance(entry, dict):
+                raise ValueError("Batch entry {0} must be an object with 'type' and 'params'".format(i))
+            entry_type = entry.get("type", "")
+            if entry_type not in _MODIFYING_HANDLERS and entry_type not in _READONLY_HANDLERS:
+                raise ValueError("Batch entry {0}: unknown command '{1}'".format(i, entry_type))
+            if not isinstance(entry.get("params", {}), dict):
+                raise ValueError("Batch entry {0}: 'params' must be an object".format(i))
+            entry_types.append(entry_type)
+        return entry_types
+
+    def _dispatch_batch(self, cmd, p):
+        """Run every batch entry back-to-back inside one main-thread task.
+
+        Each entry gets its own result or error.  With ``stop_on_error``
+        (the default) execution halts at the first failure and the
+        remaining entries are reported as skipped.
+        """
+        commands = p.get("commands", [])
+        stop_on_error = p.get("stop_on_error", True)
+        results = []
+        failed = 0
+        for i, entry in enumerate(commands):
+            entry_type = entry.get("type", "")
+            entry_params = entry.get("params", {})
+            handler = _MODIFYING_HANDLERS.get(entry_type) or _READONLY_HANDLERS.get(entry_type)
+            try:
+                result = handler(self._song, entry_params, self)
+                if entry_type in _MODIFYING_HANDLERS:
+                    self.session_model.note_command(entry_type, entry_params)
+                results.append({"index": i, "type": entry_type, "status": "success", "result": result})
+            except Exception as e:
+                self.log_message("Batch entry {0} ({1}) failed: {2}".format(i, entry_type, e))
+                results.append({"index": i, "type": entry_type, "status": "error",
+                                "message": self._safe_error_message(e)})
+                failed += 1
+                if stop_on_error:
+                    break
+        return {
+            "results": results,
+            "executed": len(results),
+            "succeeded": len(results) - failed,
+            "failed": failed,
+            "skipped": len(commands) - len(results),
+        }
 
     # ------------------------------------------------------------------
     # Read-only command dispatch
@@ -61,6 +61,42 @@ def get_clip(song, track_index, clip_index, track_type="track"):
     return track, slot.clip
 
 
+def select_fields(fields, available):
+    """Normalize a ``fields`` projection against the *available* names.
+
+    Returns:
+        None when *fields* is empty (everything), else a frozenset.
+
+    Raises:
+        ValueError: If a requested field is unknown.
+    """
+    if not fields:
+        return None
+    if not isinstance(fields, (list, tuple)):
+        raise ValueError("fields must be a list of field names")
+    unknown = [f for f in fields if f not in available]
+    if unknown:
+        raise ValueError("Unknown field(s): {0}. Available: {1}".format(
+            ", ".join(str(f) for f in unknown), ", ".join(available)))
+    return frozenset(fields)
+
+
+def page_bounds(total, offset=0, limit=None):
+    """(start, stop) of the page ``[offset, offset + limit)`` clamped to *total*.
+
+    Raises:
+        ValueError: If offset or limit is negative.
+    """
+    offset = offset or 0
+    if offset < 0:
+        raise ValueError("offset must be >= 0")
+    if limit is not None and limit < 0:
+        raise ValueError("limit must be >= 0")
+    start = min(offset, total)
+    stop = total if limit is None else min(total, start + limit)
+    return start, stop
+
+
 def get_scene(song, scene_index):
     """Get a scene by index with bounds validation.
 
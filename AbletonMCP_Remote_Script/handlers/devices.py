@@ -10,6 +10,24 @@ def resolve_track(song, track_index, track_type="track"):
     return get_track(song, track_index, track_type)
 
 
+def _device_parameters(song, track_index, device_index, track_type, ctrl, indexed=True):
+    """Resolve a device and its parameter lookup tables.
+
+    Served from the controller's ParameterIndexCache when there is one;
+    otherwise the tables are built for this call only (without a name map
+    unless *indexed*, since a single lookup is cheaper as a scan).
+    """
+    cache = getattr(ctrl, "param_cache", None)
+    if cache is not None:
+        return cache.lookup(song, track_index, device_index, track_type)
+    from ..param_cache import DeviceParameters
+    track = resolve_track(song, track_index, track_type)
+    device_list = list(track.devices)
+    if device_index < 0 or device_index >= len(device_list):
+        raise IndexError("Device index out of range")
+    return DeviceParameters(device_list[device_index], indexed)
+
+
 def get_device_type(device, ctrl=None):
     """Get the type of a device."""
     try:
@@ -37,17 +55,12 @@ def _normalize_display(s):
 MAX_BRUTEFORCE_STEPS = 10000
 
 
-def _resolve_display_value_bruteforce(param, display_string, ctrl=None):
-    """For non-quantized params, find the raw value that produces a display string.
+def _integer_range(param):
+    """Return (lo, hi, span) for an integer-step param, capped to MAX_BRUTEFORCE_STEPS.
 
-    Iterates integer values in [min..max], checks param.str_for_value(v).
-    Works for params like LFO Rate (0-21) where each integer = a note value.
-    Uses aggressive normalization (strip all whitespace) for robust matching.
-    Capped at MAX_BRUTEFORCE_STEPS iterations to prevent UI stalls.
+    Raises ValueError for continuous ranges, where integer stepping is
+    meaningless.
     """
-    target_norm = _normalize_display(display_string)
-
-    # Detect float-range params where integer stepping is meaningless
     pmin, pmax = param.min, param.max
     is_float_range = (
         (pmin != int(pmin) or pmax != int(pmax))
@@ -58,19 +71,41 @@ def _resolve_display_value_bruteforce(param, display_string, ctrl=None):
             "value_display resolution is only supported for integer-step params. "
             "'{0}' has a continuous range ({1}-{2}); use a numeric value instead.".format(
                 param.name, pmin, pmax))
-
     lo = int(pmin)
-    hi = int(pmax)
-    span = hi - lo + 1
+    span = int(pmax) - lo + 1
+    return lo, lo + min(span, MAX_BRUTEFORCE_STEPS) - 1, span
+
+
+def _resolve_display_value_bruteforce(param, display_string, ctrl=None, device=None):
+    """For non-quantized params, find the raw value that produces a display string.
+
+    Iterates integer values in [min..max], checks param.str_for_value(v).
+    Works for params like LFO Rate (0-21) where each integer = a note value.
+    Uses aggressive normalization (strip all whitespace) for robust matching.
+    Capped at MAX_BRUTEFORCE_STEPS iterations to prevent UI stalls.
+
+    With the controller's DisplayValueCache and the owning *device*, the
+    scanned strings are kept per device class and parameter, so a string
+    seen before resolves without calling str_for_value.
+    """
+    target_norm = _normalize_display(display_string)
+    lo, hi, span = _integer_range(param)
+    capped = span > MAX_BRUTEFORCE_STEPS
+
+    cache = getattr(ctrl, "display_cache", None)
+    if cache is not None and device is not None:
+        from ..param_cache import display_table_key
+        value = cache.resolve(display_table_key(device, param, lo, hi), param, target_norm,
+                              _normalize_display, lo, hi)
+        if value is not None:
+            return value
+        _raise_not_matched(param, display_string, capped, span)
 
     if ctrl:
         ctrl.log_message("Bruteforce resolve '{0}' (norm: '{1}') for '{2}' (range {3}-{4}, span {5})".format(
             display_string, target_norm, param.name, lo, hi, span))
 
-    capped = False
-    if span > MAX_BRUTEFORCE_STEPS:
-        capped = True
-        hi = lo + MAX_BRUTEFORCE_STEPS - 1
+    if capped:
         if ctrl:
             ctrl.log_message("  Capped search to {0} steps (original span: {1})".format(
                 MAX_BRUTEFORCE_STEPS, span))
@@ -90,6 +125,10 @@ def _resolve_display_value_bruteforce(param, display_string, ctrl=None):
                 ctrl.log_message("  v={0} -> ERROR: {1}".format(v, e))
             continue
 
+    _raise_not_matched(param, display_string, capped, span)
+
+
+def _raise_not_matched(param, display_string, capped, span):
     msg = "'{0}' not matched for '{1}' (range {2}-{3})".format(
         display_string, param.name, param.min, param.max)
     if capped:
@@ -97,7 +136,7 @@ def _resolve_display_value_bruteforce(param, display_string, ctrl=None):
     raise ValueError(msg)
 
 
-def _resolve_display_value(param, display_string, ctrl=None):
+def _resolve_display_value(param, display_string, ctrl=None, device=None):
     """Resolve a display string to its raw value.
 
     For quantized params with value_items: direct lookup (fast).
@@ -125,7 +164,7 @@ def _resolve_display_value(param, display_string, ctrl=None):
             ))
 
     # Non-quantized: brute-force via str_for_value
-    return _resolve_display_value_bruteforce(param, display_string, ctrl)
+    return _resolve_display_value_bruteforce(param, display_string, ctrl, device)
 
 
 def get_device_parameters(song, track_index, device_index, track_type="track", ctrl=None):
@@ -181,18 +220,9 @@ def set_device_parameter(
     If provided, overrides the numeric value.
     """
     try:
-        track = resolve_track(song, track_index, track_type)
-        device_list = list(track.devices)
-        if device_index < 0 or device_index >= len(device_list):
-            raise IndexError("Device index out of range")
-        device = device_list[device_index]
-
-        # Find the parameter by name
-        target_param = None
-        for param in device.parameters:
-            if param.name == parameter_name:
-                target_param = param
-                break
+        lookup = _device_parameters(song, track_index, device_index, track_type, ctrl, indexed=False)
+        device = lookup.device
+        target_param = lookup.find(parameter_name)
 
         if target_param is None:
             raise ValueError("Parameter '{0}' not found on device '{1}'".format(
@@ -201,7 +231,7 @@ def set_device_parameter(
 
         # Resolve display string to raw value if provided
         if value_display is not None:
-            value = _resolve_display_value(target_param, value_display, ctrl)
+            value = _resolve_display_value(target_param, value_display, ctrl, device)
         else:
             value = float(value)
             if getattr(target_param, "is_quantized", False):
@@ -234,24 +264,20 @@ def set_device_parameter(
 
 
 def set_device_parameters_batch(
-    song, track_index, device_index, parameters, track_type="track", ctrl=None
+    song, track_index, device_index, parameters, track_type="track", ctrl=None,
+    first_match=False
 ):
     """Set multiple device parameters at once.
 
     parameters is a list of dicts with 'name' and either 'value' (numeric)
     or 'value_display' (display string like '1/4') for quantized params.
+    A name shared by several parameters targets the last of them, or the
+    first with *first_match* (as set_device_parameter does).
     """
     try:
-        track = resolve_track(song, track_index, track_type)
-        device_list = list(track.devices)
-        if device_index < 0 or device_index >= len(device_list):
-            raise IndexError("Device index out of range")
-        device = device_list[device_index]
-
-        # Build a name->param lookup once
-        param_map = {}
-        for param in device.parameters:
-            param_map[param.name] = param
+        lookup = _device_parameters(song, track_index, device_index, track_type, ctrl)
+        find = lookup.find if first_match else lookup.find_last
+        device = lookup.device
 
         results = []
         for entry in parameters:
@@ -261,7 +287,7 @@ def set_device_parameters_batch(
                 results.append({"name": pname, "error": "missing value or value_display"})
                 continue
             pvalue = entry.get("value", 0.0)
-            target = param_map.get(pname)
+            target = find(pname)
             if target is None:
                 results.append({"name": pname, "error": "not found"})
                 continue
@@ -270,7 +296,7 @@ def set_device_parameters_batch(
                 if ctrl:
                     ctrl.log_message("Batch resolve: '{0}' value_display='{1}'".format(pname, value_display))
                 try:
-                    pvalue = _resolve_display_value(target, value_display, ctrl)
+                    pvalue = _resolve_display_value(target, value_display, ctrl, device)
                 except ValueError as ve:
                     results.append({"name": pname, "error": str(ve)})
                     continue
@@ -299,6 +325,56 @@ def set_device_parameters_batch(
         raise
 
 
+def prewarm_display_values(song, track_index, device_index, parameter_names=None,
+                           track_type="track", ctrl=None):
+    """Fill the display-string tables of a device's integer-step params.
+
+    The str_for_value scans run a few hundred per tick after this returns,
+    so later value_display sets on this device class are dict lookups.
+    parameter_names limits the work to those params (default: all).
+    """
+    try:
+        cache = getattr(ctrl, "display_cache", None)
+        if cache is None:
+            raise ValueError("Display value cache is not available")
+        from ..param_cache import display_table_key, PREWARM_STEPS_PER_TICK
+        lookup = _device_parameters(song, track_index, device_index, track_type, ctrl)
+        device = lookup.device
+        wanted = set(parameter_names) if parameter_names else None
+
+        queued = []
+        skipped = []
+        for param in lookup.parameters:
+            if wanted is not None and param.name not in wanted:
+                continue
+            if param.is_quantized and list(param.value_items):
+                # Resolved from value_items directly; nothing to warm
+                skipped.append(param.name)
+                continue
+            try:
+                lo, hi, _span = _integer_range(param)
+            except ValueError:
+                skipped.append(param.name)
+                continue
+            remaining = cache.prewarm(display_table_key(device, param, lo, hi), param,
+                                      _normalize_display, lo, hi)
+            queued.append({"name": param.name, "pending_values": remaining})
+
+        result = {
+            "device_name": device.name,
+            "queued": queued,
+            "skipped": skipped,
+            "values_per_tick": PREWARM_STEPS_PER_TICK,
+        }
+        if wanted is not None:
+            result["not_found"] = sorted(wanted - set(p.name for p in lookup.parameters))
+        return result
+    except Exception as e:
+        if ctrl:
+            ctrl.log_message("Error prewarming display values: " + str(e))
+        raise
+
+
 def _resolve_device(song, track_index, device_index, track_type="track"):
     """Resolve a track and device by index, supporting track/return/master."""
     track = resolve_track(song, track_index, track_type)
@@ -0,0 +1,353 @@
+"""Batched reads and writes of Live Object Model properties.
+
+One get_lom_properties call evaluates many object selectors times many
+properties in a single main-thread pass and returns a compact columnar
+result, replacing a round trip per narrow get_* command.
+set_lom_properties is the write-side counterpart.
+
+A selector names a base object (song, track, return/master track,
+device, parameter, clip slot, clip or scene) and each property is a
+dotted path relative to it, e.g. ``name``, ``mixer_device.volume.value``
+or ``devices.0.name``.  Numeric path segments index into lists.  Every
+object resolved along the way is cached for the duration of the call, so
+shared prefixes such as the same track are looked up once.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+MAX_CELLS = 20000
+MAX_WRITES = 2000
+
+# Selector keys that may be "*" (every index)
+_WILDCARD_KEYS = ("track_index", "device_index", "parameter_index",
+                  "clip_slot_index", "scene_index")
+
+_SELECTOR_KEYS = frozenset(_WILDCARD_KEYS + ("track_type", "parameter_name", "clip"))
+_DEVICE_KEYS = ("device_index", "parameter_index", "parameter_name")
+_CLIP_KEYS = ("clip_slot_index", "clip")
+
+
+class _Resolver(object):
+    """Resolves paths below the song, caching every prefix for one call."""
+
+    def __init__(self, song):
+        self._cache = {(): song}
+
+    def resolve(self, path):
+        try:
+            return self._cache[path]
+        except KeyError:
+            pass
+        parent = self.resolve(path[:-1])
+        segment = path[-1]
+        if parent is None:
+            raise ValueError("'{0}' is None".format(format_path(path[:-1])))
+        if isinstance(segment, int):
+            if segment < 0 or segment >= len(parent):
+                raise IndexError("{0} out of range".format(format_path(path)))
+            value = parent[segment]
+        elif isinstance(segment, tuple):
+            # ("name", name): first list item with that name
+            for item in parent:
+                if item.name == segment[1]:
+                    value = item
+                    break
+            else:
+                raise ValueError("No item named '{0}' in {1}".format(
+                    segment[1], format_path(path[:-1])))
+        else:
+            try:
+                value = getattr(parent, segment)
+            except AttributeError:
+                raise ValueError("{0} has no property '{1}'".format(
+                    format_path(path[:-1]) or "song", segment))
+            if callable(value):
+                raise ValueError("'{0}' is a method, not a property".format(segment))
+        self._cache[path] = value
+        return value
+
+    def count(self, path):
+        return len(self.resolve(path))
+
+
+def format_path(path):
+    """Readable form of a resolver path, e.g. tracks.0.devices.1."""
+    parts = []
+    for segment in path:
+        if isinstance(segment, tuple):
+            parts.append("[{0}]".format(segment[1]))
+        else:
+            parts.append(str(segment))
+    return ".".join(parts).replace(".[", "[")
+
+
+def property_path(prop):
+    """Split a dotted property name into path segments."""
+    if not prop or not isinstance(prop, str):
+        raise ValueError("Property names must be non-empty strings")
+    segments = []
+    for part in prop.split("."):
+        if not part or part.startswith("_"):
+            raise ValueError("Invalid property '{0}'".format(prop))
+        segments.append(int(part) if part.isdigit() else part)
+    return tuple(segments)
+
+
+def _check_selector(selector):
+    """Reject unknown keys and combinations that name two different objects.
+
+    Silently ignoring them would let a write meant for a clip land on its
+    track, so any doubt fails the selector (and with it the whole batch).
+    """
+    unknown = sorted(k for k in selector if k not in _SELECTOR_KEYS)
+    if unknown:
+        raise ValueError("Unknown selector key(s): {0}".format(", ".join(unknown)))
+    present = lambda keys: [k for k in keys if k in selector]
+    if "scene_index" in selector:
+        others = present(("track_type", "track_index") + _DEVICE_KEYS + _CLIP_KEYS)
+        if others:
+            raise ValueError("scene_index cannot be combined with {0}".format(", ".join(others)))
+    if present(_DEVICE_KEYS) and present(_CLIP_KEYS):
+        raise ValueError("Device keys ({0}) cannot be combined with clip keys ({1})".format(
+            ", ".join(present(_DEVICE_KEYS)), ", ".join(present(_CLIP_KEYS))))
+    if "parameter_index" in selector and "parameter_name" in selector:
+        raise ValueError("Use either parameter_index or parameter_name, not both")
+    if present(("parameter_index", "parameter_name")) and "device_index" not in selector:
+        raise ValueError("Parameter keys need a device_index")
+    if "clip" in selector and "clip_slot_index" not in selector:
+        raise ValueError("'clip' needs a clip_slot_index")
+    is_master = selector.get("track_type") == "master"
+    if is_master and "track_index" in selector:
+        raise ValueError("The master track selector takes no track_index")
+    if (present(_DEVICE_KEYS) or present(_CLIP_KEYS)) and not (is_master or "track_index" in selector):
+        raise ValueError("Device and clip selectors need a track_index or track_type 'master'")
+
+
+def selector_paths(resolver, selector):
+    """Expand one selector into the resolver paths it names.
+
+    Keys: track_type ("track", "return", "master"), track_index,
+    device_index, parameter_index or parameter_name, clip_slot_index,
+    clip (true = the slot's clip) and scene_index.  Index keys accept
+    "*" for every index.  No keys selects the song itself.  Unknown keys
+    and conflicting combinations (a scene with a track, a clip slot with a
+    device) raise ValueError.
+    """
+    if not isinstance(selector, dict):
+        raise ValueError("Selectors must be objects")
+    _check_selector(selector)
+    track_type = selector.get("track_type", "track")
+    if track_type not in ("track", "return", "master"):
+        raise ValueError("track_type must be 'track', 'return', or 'master'")
+
+    steps = []
+    if track_type == "master":
+        steps.append(("master_track", None))
+    elif "track_index" in selector:
+        steps.append(("tracks" if track_type == "track" else "return_tracks", selector["track_index"]))
+    elif "scene_index" in selector:
+        steps.append(("scenes", selector["scene_index"]))
+    elif track_type == "return":
+        raise ValueError("A return track selector needs a track_index")
+
+    if steps and steps[0][0] != "scenes":
+        if "device_index" in selector:
+            steps.append(("devices", selector["device_index"]))
+            if "parameter_name" in selector:
+                steps.append(("parameters", ("name", selector["parameter_name"])))
+            elif "parameter_index" in selector:
+                steps.append(("parameters", selector["parameter_index"]))
+        elif "clip_slot_index" in selector:
+            steps.append(("clip_slots", selector["clip_slot_index"]))
+            if selector.get("clip"):
+                steps.append(("clip", None))
+
+    paths = [()]
+    for name, index in steps:
+        expanded = []
+        for path in paths:
+            if index is None:
+                expanded.append(path + (name,))
+            elif index == "*":
+                list_path = path + (name,)
+                expanded.extend(list_path + (i,) for i in range(resolver.count(list_path)))
+            elif isinstance(index, tuple) or (isinstance(index, int) and not isinstance(index, bool)):
+                expanded.append(path + (name, index))
+            else:
+                raise ValueError("Selector indices must be integers or \"*\"")
+        paths = expanded
+    return paths
+
+
+def json_value(value):
+    """Plain JSON value for a property; Live objects are reported by name."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [json_value(v) for v in value]
+    name = getattr(value, "name", None)
+    if isinstance(name, str):
+        return name
+    try:
+        # Live vectors and other sequences
+        return [json_value(v) for v in value]
+    except TypeError:
+        return str(value)
+
+
+def get_lom_properties(song, queries, properties=None, ctrl=None):
+    """Read many properties of many objects in one pass.
+
+    *queries* is a list of ``{"selector": {...}, "properties": [...]}``;
+    a query without its own property list uses *properties*.  Returns one
+    columnar block per query: ``columns`` (the property names), ``paths``
+    (one per selected object) and ``rows`` (one list of values per
+    object).  Failed cells are null and listed under ``errors``.
+    """
+    try:
+        if not isinstance(queries, list) or not queries:
+            raise ValueError("get_lom_properties requires a non-empty 'queries' list")
+        resolver = _Resolver(song)
+        results = []
+        cells = 0
+        for query_index, query in enumerate(queries):
+            if not isinstance(query, dict):
+                raise ValueError("Query {0} must be an object".format(query_index))
+            props = query.get("properties") or properties
+            if not isinstance(props, list) or not props:
+                raise ValueError("Query {0} has no properties".format(query_index))
+            prop_paths = [property_path(p) for p in props]
+            paths = selector_paths(resolver, query.get("selector", {}))
+            cells += len(paths) * len(props)
+            if cells > MAX_CELLS:
+                raise ValueError("get_lom_properties reads at most {0} values per call".format(MAX_CELLS))
+
+            rows = []
+            errors = []
+            for row_index, path in enumerate(paths):
+                row = []
+                for column, prop_path in enumerate(prop_paths):
+                    try:
+                        row.append(json_value(resolver.resolve(path + prop_path)))
+                    except Exception as e:
+                        row.append(None)
+                        errors.append({"row": row_index, "column": column, "message": str(e)})
+                rows.append(row)
+            block = {
+                "columns": props,
+                "paths": [format_path(path) or "song" for path in paths],
+                "rows": rows,
+            }
+            if errors:
+                block["errors"] = errors
+            results.append(block)
+        return {"results": results, "values": cells}
+    except Exception as e:
+        if ctrl:
+            ctrl.log_message("Error reading LOM properties: " + str(e))
+        raise
+
+
+def _touched(path):
+    """session_model.note_command params for a written object path."""
+    if len(path) < 2 or path[0] != "tracks":
+        return None
+    touched = {"track_index": path[1]}
+    if len(path) >= 4 and path[2] == "devices" and isinstance(path[3], int):
+        touched["device_index"] = path[3]
+    elif len(path) >= 4 and path[2] == "clip_slots":
+        touched["clip_index"] = path[3]
+    return touched
+
+
+def set_lom_properties(song, entries, undo_step=False, ctrl=None):
+    """Set many properties of many objects in one pass.
+
+    *entries* is a list of ``{"selector": {...}, "property": "...",
+    "value": ...}`` using the same selectors and dotted property paths as
+    get_lom_properties.  Every entry is validated (objects resolved,
+    property present and not a method) before anything is written; a
+    single invalid entry rejects the batch.  Values written to a
+    parameter's ``value`` are clamped to its range.  With *undo_step*
+    the writes form one Live undo step.
+
+    Returns one result per written object, each naming its entry index.
+    """
+    try:
+        if not isinstance(entries, list) or not entries:
+            raise ValueError("set_lom_properties requires a non-empty 'entries' list")
+        resolver = _Resolver(song)
+
+        # Validate everything before the first write
+        writes = []
+        for i, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                raise ValueError("Entry {0} must be an object with 'selector', 'property' and 'value'".format(i))
+            prop = property_path(entry.get("property"))
+            if not isinstance(prop[-1], str):
+                raise ValueError("Entry {0}: property must end in a property name".format(i))
+            value = entry.get("value")
+            if not (value is None or isinstance(value, (bool, int, float, str))):
+                raise ValueError("Entry {0}: value must be a number, string, boolean or null".format(i))
+            try:
+                paths = selector_paths(resolver, entry.get("selector", {}))
+            except (IndexError, ValueError) as e:
+                raise ValueError("Entry {0}: {1}".format(i, e))
+            for path in paths:
+                owner_path = path + prop[:-1]
+                try:
+                    owner = resolver.resolve(owner_path)
+                    current = getattr(owner, prop[-1])
+                except AttributeError:
+                    raise ValueError("Entry {0}: {1} has no property '{2}'".format(
+                        i, format_path(owner_path) or "song", prop[-1]))
+                except (IndexError, ValueError) as e:
+                    raise ValueError("Entry {0}: {1}".format(i, e))
+                if callable(current):
+                    raise ValueError("Entry {0}: '{1}' is a method, not a property".format(i, prop[-1]))
+                target = value
+                clamped = False
+                if prop[-1] == "value" and hasattr(owner, "min") and hasattr(owner, "max"):
+                    if isinstance(value, bool) or not isinstance(value, (int, float)):
+                        raise ValueError("Entry {0}: parameter values must be numbers".format(i))
+                    target = max(owner.min, min(owner.max, value))
+                    clamped = target != value
+                writes.append((i, owner_path + (prop[-1],), owner, prop[-1], target, clamped))
+                if len(writes) > MAX_WRITES:
+                    raise ValueError("set_lom_properties writes at most {0} values per call".format(MAX_WRITES))
+
+        if undo_step and hasattr(song, "begin_undo_step"):
+            song.begin_undo_step()
+        results = []
+        failed = 0
+        session_model = getattr(ctrl, "session_model", None)
+        try:
+            for i, path, owner, attr, target, clamped in writes:
+                result = {"entry": i, "path": format_path(path)}
+                try:
+                    setattr(owner, attr, target)
+                    result["status"] = "success"
+                    result["value"] = json_value(getattr(owner, attr))
+                    if clamped:
+                        result["clamped"] = True
+                    touched = _touched(path)
+                    if session_model is not None and touched is not None:
+                        session_model.note_command("set_lom_properties", touched)
+                except Exception as e:
+                    result["status"] = "error"
+                    result["message"] = str(e)
+                    failed += 1
+                results.append(result)
+        finally:
+            if undo_step and hasattr(song, "end_undo_step"):
+                song.end_undo_step()
+        return {
+            "results": results,
+            "written": len(results) - failed,
+            "failed": failed,
+            "undo_step": bool(undo_step),
+        }
+    except Exception as e:
+        if ctrl:
+            ctrl.log_message("Error setting LOM properties: " + str(e))
+        raise
@@ -1,7 +1,7 @@
 """Mixer: volume, pan, mute, solo, arm, sends, return tracks, master."""
 
 from __future__ import absolute_import, print_function, unicode_literals
-from ._helpers import get_track
+from ._helpers import get_track, page_bounds, select_fields
 
 
 def set_track_volume(song, track_index, volume, ctrl=None):
@@ -234,19 +234,38 @@ def set_master_volume(song, volume, ctrl=None):
 # --- Read-only info ---
 
 
-def get_scenes(song, ctrl=None):
-    """Get information about all scenes."""
+# Per-scene fields of get_scenes, in output order
+SCENE_FIELDS = (
+    ("index", lambda scene, i: i),
+    ("name", lambda scene, i: scene.name),
+    ("tempo", lambda scene, i: scene.tempo if hasattr(scene, 'tempo') else None),
+    ("is_triggered", lambda scene, i: scene.is_triggered if hasattr(scene, 'is_triggered') else False),
+    ("color_index", lambda scene, i: scene.color_index if hasattr(scene, 'color_index') else 0),
+)
+
+
+def get_scenes(song, ctrl=None, fields=None, offset=0, limit=None):
+    """Get information about all scenes.
+
+    *fields* limits each entry to the named SCENE_FIELDS and
+    *offset*/*limit* page the scene list; a paged result also reports the
+    total scene count.
+    """
     try:
+        selected = select_fields(fields, tuple(name for name, _ in SCENE_FIELDS))
+        getters = [(name, getter) for name, getter in SCENE_FIELDS
+                   if selected is None or name in selected]
+        all_scenes = song.scenes
+        start, stop = page_bounds(len(all_scenes), offset, limit)
         scenes = []
-        for i, scene in enumerate(song.scenes):
-            scenes.append({
-                "index": i,
-                "name": scene.name,
-                "tempo": scene.tempo if hasattr(scene, 'tempo') else None,
-                "is_triggered": scene.is_triggered if hasattr(scene, 'is_triggered') else False,
-                "color_index": scene.color_index if hasattr(scene, 'color_index') else 0,
-            })
-        return {"scenes": scenes, "count": len(scenes)}
+        for i in range(start, stop):
+            scene = all_scenes[i]
+            scenes.append(dict((name, getter(scene, i)) for name, getter in getters))
+        result = {"scenes": scenes, "count": len(scenes)}
+        if offset or limit is not None:
+            result["offset"] = start
+            result["total"] = len(all_scenes)
+        return result
     except Exception as e:
         if ctrl:
             ctrl.log_message("Error getting scenes: " + str(e))
@@ -868,10 +868,13 @@ def get_selection_state(song, ctrl=None):
             sel_track = song.view.selected_track
             if sel_track:
                 # Find track index
-                for i, t in enumerate(song.tracks):
-                    if t == sel_track:
-                        result["selected_track"] = {"index": i, "name": t.name, "type": "track"}
-                        break
+                track_map = getattr(ctrl, "track_map", None)
+                if track_map is not None:
+                    index = track_map.index_of(song, sel_track)
+                else:
+                    index = next((i for i, t in enumerate(song.tracks) if t == sel_track), None)
+                if index is not None:
+                    result["selected_track"] = {"index": index, "name": sel_track.name, "type": "track"}
                 else:
                     for i, t in enumerate(song.return_tracks):
                         if t == sel_track:
@@ -2,137 +2,150 @@
 
 from __future__ import absolute_import, print_function, unicode_literals
 
-from ._helpers import get_track, get_clip
+from ._helpers import get_track, get_clip, page_bounds, select_fields
 
 
-def get_track_info(song, track_index, ctrl=None):
-    """Get information about a track."""
+def clip_slot_info(slot_index, slot):
+    """Summary of one clip slot as reported by get_track_info."""
+    clip_info = None
     try:
-        track = get_track(song, track_index)
-
-        # Get clip slots
-        clip_slots = []
+        if slot.has_clip:
+            clip = slot.clip
+            clip_info = {
+                "name": clip.name,
+                "length": clip.length if hasattr(clip, 'length') else 0,
+                "is_playing": clip.is_playing if hasattr(clip, 'is_playing') else False,
+                "is_recording": clip.is_recording if hasattr(clip, 'is_recording') else False,
+            }
+    except Exception:
+        clip_info = None
+    return {
+        "index": slot_index,
+        "has_clip": slot.has_clip,
+        "clip": clip_info,
+    }
+
+
+def device_summary(device_index, device, ctrl=None):
+    """Summary of one device as reported by get_track_info."""
+    from . import devices as dev_mod
+    return {
+        "index": device_index,
+        "name": device.name,
+        "class_name": device.class_name,
+        "type": dev_mod.get_device_type(device, ctrl),
+    }
+
+
+def _safe_attr(name, default):
+    """Field getter for ``track.<name>``; *default* where the track lacks it."""
+    def getter(song, track, track_index, ctrl):
         try:
-            for slot_index, slot in enumerate(track.clip_slots):
-                clip_info = None
-                try:
-                    if slot.has_clip:
-                        clip = slot.clip
-                        clip_info = {
-                            "name": clip.name,
-                            "length": clip.length if hasattr(clip, 'length') else 0,
-                            "is_playing": clip.is_playing if hasattr(clip, 'is_playing') else False,
-                            "is_recording": clip.is_recording if hasattr(clip, 'is_recording') else False,
-                        }
-                except Exception:
-                    clip_info = None
-                clip_slots.append({
-                    "index": slot_index,
-                    "has_clip": slot.has_clip,
-                    "clip": clip_info,
-                })
+            return getattr(track, name)
         except Exception:
-            pass
+            return default
+    return getter
 
-        # Get devices
-        from . import devices as dev_mod
-        devices_list = []
-        try:
-            for device_index, device in enumerate(track.devices):
-                devices_list.append({
-                    "index": device_index,
-                    "name": device.name,
-                    "class_name": device.class_name,
-                    "type": dev_mod.get_device_type(device, ctrl),
-                })
-        except Exception:
-            pass
 
-        # Safely read properties -- group tracks don't support all of these
-        try:
-            arm = track.arm if track.can_be_armed else False
-        except Exception:
-            arm = False
+def _track_arm(song, track, track_index, ctrl):
+    # Group and return tracks can't be armed
+    try:
+        return track.arm if track.can_be_armed else False
+    except Exception:
+        return False
 
-        try:
-            is_group = track.is_foldable
-        except Exception:
-            is_group = False
 
-        try:
-            is_audio = track.has_audio_input
-        except Exception:
-            is_audio = False
+def _group_track_index(song, track, track_index, ctrl):
+    track_map = getattr(ctrl, "track_map", None)
+    if track_map is not None:
+        return track_map.group_index(song, track_index)
+    try:
+        if track.is_grouped:
+            gt = track.group_track
+            if gt:
+                for i, t in enumerate(song.tracks):
+                    if t == gt:
+                        return i
+    except Exception:
+        pass
+    return None
+
+
+# Track-level fields of get_track_info, in output order.  Each getter is
+# called as (song, track, track_index, ctrl) and only for requested fields,
+# so unrequested Live properties are never read.
+TRACK_FIELDS = (
+    ("index", lambda song, track, track_index, ctrl: track_index),
+    ("name", lambda song, track, track_index, ctrl: track.name),
+    ("is_group_track", _safe_attr("is_foldable", False)),
+    ("is_audio_track", _safe_attr("has_audio_input", False)),
+    ("is_midi_track", _safe_attr("has_midi_input", False)),
+    ("mute", lambda song, track, track_index, ctrl: track.mute),
+    ("solo", lambda song, track, track_index, ctrl: track.solo),
+    ("arm", _track_arm),
+    ("volume", lambda song, track, track_index, ctrl: track.mixer_device.volume.value),
+    ("panning", lambda song, track, track_index, ctrl: track.mixer_device.panning.value),
+    ("is_grouped", _safe_attr("is_grouped", False)),
+    ("group_track_index", _group_track_index),
+    ("is_visible", _safe_attr("is_visible", True)),
+    ("is_showing_chains", _safe_attr("is_showing_chains", False)),
+    ("can_show_chains", _safe_attr("can_show_chains", False)),
+    ("playing_slot_index", _safe_attr("playing_slot_index", -1)),
+    ("fired_slot_index", _safe_attr("fired_slot_index", -1)),
+)
+
+TRACK_INFO_FIELDS = tuple(name for name, _ in TRACK_FIELDS) + ("clip_slots", "devices")
+
+
+def track_properties(song, track, track_index, fields=None, ctrl=None):
+    """Track-level fields of get_track_info (everything but slots and devices).
+
+    *fields* is a set of names to include, or None for all of them.
+    """
+    return dict((name, getter(song, track, track_index, ctrl))
+                for name, getter in TRACK_FIELDS
+                if fields is None or name in fields)
 
-        try:
-            is_midi = track.has_midi_input
-        except Exception:
-            is_midi = False
 
-        # Group relationships
-        try:
-            is_grouped = track.is_grouped
-        except Exception:
-            is_grouped = False
+def get_track_info(song, track_index, ctrl=None, fields=None,
+                   slot_offset=0, slot_limit=None, device_offset=0, device_limit=None):
+    """Get information about a track.
 
-        group_track_index = None
-        if is_grouped:
+    *fields* limits the result to the named entries of TRACK_INFO_FIELDS;
+    the offset/limit pairs page the clip slot and device lists.  When a
+    list is paged its full length is reported as clip_slot_count /
+    device_count.
+    """
+    try:
+        track = get_track(song, track_index)
+        selected = select_fields(fields, TRACK_INFO_FIELDS)
+        result = track_properties(song, track, track_index, selected, ctrl)
+
+        if selected is None or "clip_slots" in selected:
+            slots = track.clip_slots
+            start, stop = page_bounds(len(slots), slot_offset, slot_limit)
+            clip_slots = []
             try:
-                gt = track.group_track
-                if gt:
-                    for i, t in enumerate(song.tracks):
-                        if t == gt:
-                            group_track_index = i
-                            break
+                for slot_index in range(start, stop):
+                    clip_slots.append(clip_slot_info(slot_index, slots[slot_index]))
             except Exception:
                 pass
+            result["clip_slots"] = clip_slots
+            if slot_offset or slot_limit is not None:
+                result["clip_slot_count"] = len(slots)
 
-        try:
-            is_visible = track.is_visible
-        except Exception:
-            is_visible = True
-
-        try:
-            is_showing_chains = track.is_showing_chains
-        except Exception:
-            is_showing_chains = False
-
-        try:
-            can_show_chains = track.can_show_chains
-        except Exception:
-            can_show_chains = False
-
-        try:
-            playing_slot_index = track.playing_slot_index
-        except Exception:
-            playing_slot_index = -1
-
-        try:
-            fired_slot_index = track.fired_slot_index
-        except Exception:
-            fired_slot_index = -1
-
-        result = {
-            "index": track_index,
-            "name": track.name,
-            "is_group_track": is_group,
-            "is_audio_track": is_audio,
-            "is_midi_track": is_midi,
-            "mute": track.mute,
-            "solo": track.solo,
-            "arm": arm,
-            "volume": track.mixer_device.volume.value,
-            "panning": track.mixer_device.panning.value,
-            "is_grouped": is_grouped,
-            "group_track_index": group_track_index,
-            "is_visible": is_visible,
-            "is_showing_chains": is_showing_chains,
-            "can_show_chains": can_show_chains,
-            "playing_slot_index": playing_slot_index,
-            "fired_slot_index": fired_slot_index,
-            "clip_slots": clip_slots,
-            "devices": devices_list,
-        }
+        if selected is None or "devices" in selected:
+            devices = track.devices
+            start, stop = page_bounds(len(devices), device_offset, device_limit)
+            devices_list = []
+            try:
+                for device_index in range(start, stop):
+                    devices_list.append(device_summary(device_index, devices[device_index], ctrl))
+            except Exception:
+                pass
+            result["devices"] = devices_list
+            if device_offset or device_limit is not None:
+                result["device_count"] = len(devices)
         return result
     except Exception as e:
         if ctrl:
@@ -301,42 +314,73 @@ def group_tracks(song, track_indices, name, ctrl=None):
     raise NotImplementedError(msg)
 
 
-def get_all_tracks_info(song, ctrl=None):
-    """Get summary info for all tracks at once."""
+def _device_names(song, track, track_index, ctrl):
+    return [{"name": d.name, "class_name": d.class_name} for d in track.devices]
+
+
+# Per-track fields of get_all_tracks_info, in output order
+TRACK_SUMMARY_FIELDS = (
+    ("index", lambda song, track, track_index, ctrl: track_index),
+    ("name", lambda song, track, track_index, ctrl: track.name),
+    ("is_audio", _safe_attr("has_audio_input", False)),
+    ("is_midi", _safe_attr("has_midi_input", False)),
+    ("mute", lambda song, track, track_index, ctrl: track.mute),
+    ("solo", lambda song, track, track_index, ctrl: track.solo),
+    ("volume", lambda song, track, track_index, ctrl: track.mixer_device.volume.value),
+    ("panning", lambda song, track, track_index, ctrl: track.mixer_device.panning.value),
+    ("color_index", _safe_attr("color_index", 0)),
+    ("devices", _device_names),
+    ("arm", _track_arm),
+    ("is_group_track", _safe_attr("is_foldable", False)),
+)
+
+
+def get_all_tracks_info(song, ctrl=None, fields=None, offset=0, limit=None):
+    """Get summary info for all tracks at once.
+
+    *fields* limits each entry to the named TRACK_SUMMARY_FIELDS and
+    *offset*/*limit* page the track list; a paged result also reports the
+    total track count.
+    """
     try:
+        selected = select_fields(fields, tuple(name for name, _ in TRACK_SUMMARY_FIELDS))
+        getters = [(name, getter) for name, getter in TRACK_SUMMARY_FIELDS
+                   if selected is None or name in selected]
+        tracks = song.tracks
+        start, stop = page_bounds(len(tracks), offset, limit)
         tracks_list = []
-        for i, track in enumerate(song.tracks):
-            devices_list = []
-            for d in track.devices:
-                devices_list.append({"name": d.name, "class_name": d.class_name})
-            track_info = {
-                "index": i,
-                "name": track.name,
-                "is_audio": track.has_audio_input if hasattr(track, 'has_audio_input') else False,
-                "is_midi": track.has_midi_input if hasattr(track, 'has_midi_input') else False,
-                "mute": track.mute,
-                "solo": track.solo,
-                "volume": track.mixer_device.volume.value,
-                "panning": track.mixer_device.panning.value,
-                "color_index": track.color_index if hasattr(track, 'color_index') else 0,
-                "devices": devices_list,
-            }
-            try:
-                track_info["arm"] = track.arm if track.can_be_armed else False
-            except Exception:
-                track_info["arm"] = False
-            try:
-                track_info["is_group_track"] = track.is_foldable
-            except Exception:
-                track_info["is_group_track"] = False
-            tracks_list.append(track_info)
-        return {"tracks": tracks_list, "count": len(tracks_list)}
+        for i in range(start, stop):
+            track = tracks[i]
+            tracks_list.append(dict((name, getter(song, track, i, ctrl)) for name, getter in getters))
+        result = {"tracks": tracks_list, "count": len(tracks_list)}
+        if offset or limit is not None:
+            result["offset"] = start
+            result["total"] = len(tracks)
+        return result
     except Exception as e:
         if ctrl:
             ctrl.log_message("Error getting all tracks info: " + str(e))
         raise
 
 
+def get_track_hierarchy(song, ctrl=None):
+    """Get the group tree of all tracks in one linear pass."""
+    try:
+        track_map = getattr(ctrl, "track_map", None)
+        if track_map is None:
+            from ..track_map import TrackIndexMap
+            track_map = TrackIndexMap()
+            try:
+                return track_map.hierarchy(song)
+            finally:
+                track_map.disconnect()
+        return track_map.hierarchy(song)
+    except Exception as e:
+        if ctrl:
+            ctrl.log_message("Error getting track hierarchy: " + str(e))
+        raise
+
+
 def get_return_tracks_info(song, ctrl=None):
     """Get info for all return tracks."""
     try:
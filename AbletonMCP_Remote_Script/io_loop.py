@@ -0,0 +1,466 @@
+"""Single-threaded, selector-based socket loop for the Remote Script.
+
+One background thread owns the listening TCP socket, every connected
+client and the UDP real-time socket.  Decoded commands are handed to the
+caller's submit function, which queues them for Live's main thread and
+returns a PendingResult.  When the main thread fills a result it wakes the
+loop through a socket pair, and the loop writes the responses back in
+arrival order for each client.  Unsolicited messages (subscription events)
+are queued with ``push`` and written after any responses that were already
+complete, so a subscribe reply always precedes its first event.
+
+Connections speak newline-delimited JSON until the client negotiates a
+binary format (see wire.py); the loop answers ``negotiate_wire_format``
+itself since it never needs the Live API.
+
+No socket operation here blocks, so stopping the loop takes one wakeup
+instead of waiting out accept/recv timeouts.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import collections
+import errno
+import json
+import selectors
+import socket
+import threading
+import time
+import traceback
+
+from .main_thread import PendingResult
+from .wire import CODECS, JsonCodec, choose_wire_format
+
+RECV_SIZE = 65536
+UDP_RECV_SIZE = 4096
+MAX_LINE_BUFFER = 1048576  # 1MB without a newline disconnects the client
+
+_LISTENER = "listener"
+_UDP = "udp"
+_WAKEUP = "wakeup"
+
+_WOULD_BLOCK = (errno.EAGAIN, errno.EWOULDBLOCK, getattr(errno, "WSAEWOULDBLOCK", errno.EWOULDBLOCK))
+
+
+def _make_wakeup_pair():
+    """Return a connected (reader, writer) socket pair, non-blocking."""
+    if hasattr(socket, "socketpair"):
+        reader, writer = socket.socketpair()
+    else:
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            listener.bind(("127.0.0.1", 0))
+            listener.listen(1)
+            writer = socket.create_connection(listener.getsockname())
+            reader, _ = listener.accept()
+        finally:
+            listener.close()
+    reader.setblocking(False)
+    writer.setblocking(False)
+    return reader, writer
+
+
+class _Client(object):
+    """Per-connection buffers and the responses it is still waiting on."""
+
+    __slots__ = ("sock", "address", "decoder", "codec", "inbuf", "outbuf", "pending",
+                 "closing", "switch_after", "next_codec")
+
+    def __init__(self, sock, address):
+        self.sock = sock
+        self.address = address
+        # Invalid UTF-8 is replaced rather than crashing the loop
+        self.decoder = self.codec = JsonCodec(errors="replace")
+        self.inbuf = self.decoder.framer()
+        self.outbuf = bytearray()
+        self.pending = collections.deque()
+        self.closing = False
+        # Outgoing encoding changes once this response has been written
+        self.switch_after = None
+        self.next_codec = None
+
+
+class IOLoop(object):
+    """Selector loop serving the TCP command port and the UDP real-time port.
+
+    *submit* takes a decoded command dict and the client it came from and
+    returns a PendingResult; *on_udp* takes a decoded UDP command dict
+    (fire-and-forget); *on_disconnect* is told about every closed client.
+    All are called on the loop thread and must not touch the Live API
+    directly.
+    """
+
+    def __init__(self, host, tcp_port, udp_port, submit, on_udp, log, on_connect=None,
+                 on_disconnect=None):
+        self.host = host
+        self.tcp_port = tcp_port
+        self.udp_port = udp_port
+        self._submit = submit
+        self._on_udp = on_udp
+        self._log = log
+        self._on_connect = on_connect
+        self._on_disconnect = on_disconnect
+        self._pushes = collections.deque()
+        self._selector = None
+        self._listener = None
+        self._udp_sock = None
+        self._wake_reader = None
+        self._wake_writer = None
+        self._clients = {}
+        self._thread = None
+        self.running = False
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Bind the sockets and start the loop thread.
+
+        A failure to bind the TCP port is raised; a failure to bind the UDP
+        port is logged and the loop runs without real-time updates.
+        """
+        self._selector = selectors.DefaultSelector()
+        try:
+            self._wake_reader, self._wake_writer = _make_wakeup_pair()
+            self._selector.register(self._wake_reader, selectors.EVENT_READ, _WAKEUP)
+
+            self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._listener.bind((self.host, self.tcp_port))
+            self._listener.listen(5)
+            self._listener.setblocking(False)
+            self._selector.register(self._listener, selectors.EVENT_READ, _LISTENER)
+        except Exception:
+            self._shutdown()
+            raise
+        self._log("Server started on port " + str(self.tcp_port))
+
+        try:
+            self._udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._udp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self._udp_sock.bind((self.host, self.udp_port))
+            self._udp_sock.setblocking(False)
+            self._selector.register(self._udp_sock, selectors.EVENT_READ, _UDP)
+            self._log("UDP real-time server started on port " + str(self.udp_port))
+        except Exception as e:
+            self._close_socket(self._udp_sock)
+            self._udp_sock = None
+            self._log("Error starting UDP server: " + str(e))
+
+        self.running = True
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, join_timeout=1.0):
+        """Stop the loop and close every socket it owns."""
+        if not self.running:
+            return
+        self.running = False
+        self.wake()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(join_timeout)
+
+    def wake(self):
+        """Interrupt select(); safe to call from any thread."""
+        writer = self._wake_writer
+        if writer is None:
+            return
+        try:
+            writer.send(b"\0")
+        except (OSError, socket.error):
+            # Buffer full means a wakeup is already pending
+            pass
+
+    def push(self, client, message):
+        """Queue an unsolicited *message* for *client*; safe from any thread."""
+        self._pushes.append((client, message))
+        self.wake()
+
+    @property
+    def client_count(self):
+        return len(self._clients)
+
+    # ------------------------------------------------------------------
+    # Loop
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        self._log("I/O loop started")
+        try:
+            while self.running:
+                events = self._selector.select(self._select_timeout())
+                for key, mask in events:
+                    if not self.running:
+                        break
+                    tag = key.data
+                    if tag == _WAKEUP:
+                        self._drain_wakeups()
+                    elif tag == _LISTENER:
+                        self._accept()
+                    elif tag == _UDP:
+                        self._read_udp()
+                    else:
+                        try:
+                            if mask & selectors.EVENT_READ:
+                                self._read_client(tag)
+                            if mask & selectors.EVENT_WRITE and tag.sock is not None:
+                                self._flush(tag)
+                        except Exception as e:
+                            self._log("Error handling client data: " + str(e))
+                            self._log(traceback.format_exc())
+                            self._close_client(tag)
+                if self.running:
+                    # Snapshot first: pushes queued after a response completed
+                    # must not overtake it
+                    pushes = self._take_pushes()
+                    self._collect_responses()
+                    self._write_pushes(pushes)
+        except Exception as e:
+            self._log("I/O loop error: " + str(e))
+            self._log(traceback.format_exc())
+        finally:
+            self._shutdown()
+            self._log("I/O loop stopped")
+
+    def _select_timeout(self):
+        """Seconds until the earliest pending response deadline, or None."""
+        earliest = None
+        for client in self._clients.values():
+            for pending in client.pending:
+                deadline = pending.deadline
+                if deadline is not None and (earliest is None or deadline < earliest):
+                    earliest = deadline
+        if earliest is None:
+            return None
+        return max(0.0, earliest - time.time())
+
+    def _drain_wakeups(self):
+        try:
+            while self._wake_reader.recv(4096):
+                pass
+        except (OSError, socket.error):
+            pass
+
+    def _accept(self):
+        while True:
+            try:
+                sock, address = self._listener.accept()
+            except (OSError, socket.error):
+                return
+            sock.setblocking(False)
+            client = _Client(sock, address)
+            self._clients[sock] = client
+            self._selector.register(sock, selectors.EVENT_READ, client)
+            self._log("Connection accepted from " + str(address))
+            if self._on_connect is not None:
+                self._on_connect(address)
+
+    def _read_udp(self):
+        while True:
+            try:
+                data, addr = self._udp_sock.recvfrom(UDP_RECV_SIZE)
+            except (OSError, socket.error):
+                return
+            if not data:
+                continue
+            try:
+                command = json.loads(data.decode("utf-8"))
+            except (ValueError, UnicodeDecodeError) as parse_err:
+                self._log("UDP: malformed packet from {0}: {1}".format(addr, parse_err))
+                continue
+            try:
+                self._on_udp(command)
+            except Exception as e:
+                self._log("UDP server error: " + str(e))
+
+    def _read_client(self, client):
+        try:
+            data = client.sock.recv(RECV_SIZE)
+        except (OSError, socket.error) as e:
+            if getattr(e, "errno", None) in _WOULD_BLOCK:
+                return
+            self._log("Client receive error: " + str(e))
+            self._close_client(client)
+            return
+
+        if not data:
+            self._log("Client disconnected")
+            self._close_client(client)
+            return
+
+        client.inbuf.feed(data)
+        self._read_frames(client)
+
+    def _read_frames(self, client):
+        """Decode and submit every complete request buffered for *client*."""
+        for frame in client.inbuf.frames():
+            try:
+                command = client.decoder.decode(frame)
+            except ValueError:
+                self._log("Invalid {0} message received, skipping: {1!r}".format(
+                    client.decoder.name, frame[:100]))
+                continue
+            if command is None:
+                continue
+            if not isinstance(command, dict):
+                self._log("Ignoring non-object message: {0!r}".format(frame[:100]))
+                continue
+            self._log("Received command: " + str(command.get("type", "unknown")))
+            if command.get("type") == "negotiate_wire_format":
+                # Everything after this message is in the new format
+                self._negotiate(client, command)
+                break
+            pending = self._submit(command, client)
+            pending.on_done(self._on_result)
+            client.pending.append(pending)
+
+        if client.inbuf.pending_bytes > MAX_LINE_BUFFER:
+            self._log("Buffer overflow (>1MB incomplete message), disconnecting client")
+            err = {"status": "error", "message": "Request too large (>1MB)"}
+            client.outbuf += client.codec.encode(err)
+            client.inbuf.clear()
+            client.closing = True
+
+    def _negotiate(self, client, command):
+        """Answer negotiate_wire_format and switch the client's codec.
+
+        The reply itself still goes out in the current format; requests
+        are read in the new format from here on.
+        """
+        params = command.get("params") or {}
+        name = choose_wire_format(params.get("formats"))
+        codec = CODECS[name](client.decoder.errors)
+
+        unframed = client.inbuf.take_unframed()
+        client.decoder = codec
+        client.inbuf = codec.framer()
+        client.inbuf.feed(unframed)
+
+        pending = PendingResult(command.get("id"))
+        pending.set({"status": "success", "result": {"format": name}})
+        client.pending.append(pending)
+        client.switch_after = pending
+        client.next_codec = codec
+        self._log("Wire format for {0}: {1}".format(client.address, name))
+        if unframed:
+            # Requests pipelined right behind the negotiation
+            self._read_frames(client)
+
+    def _on_result(self, pending):
+        # Called on whichever thread filled the result (usually Live's main thread)
+        self.wake()
+
+    def _collect_responses(self):
+        """Queue finished responses, in request order, and write them out."""
+        now = time.time()
+        for client in list(self._clients.values()):
+            queue = client.pending
+            while queue:
+                head = queue[0]
+                if not head.done() and not head.expire(now):
+                    break
+                queue.popleft()
+                client.outbuf += client.codec.encode(head.value)
+                if head is client.switch_after:
+                    client.codec = client.next_codec
+                    client.switch_after = client.next_codec = None
+            if client.outbuf:
+                self._flush(client)
+            elif client.closing:
+                self._close_client(client)
+
+    def _take_pushes(self):
+        pushes = []
+        while self._pushes:
+            pushes.append(self._pushes.popleft())
+        return pushes
+
+    def _write_pushes(self, pushes):
+        touched = []
+        for client, message in pushes:
+            if client.sock is None or client.closing:
+                continue
+            client.outbuf += client.codec.encode(message)
+            touched.append(client)
+        for client in touched:
+            if client.sock is not None:
+                self._flush(client)
+
+    def _flush(self, client):
+        if client.outbuf:
+            try:
+                sent = client.sock.send(client.outbuf)
+            except (OSError, socket.error) as e:
+                if getattr(e, "errno", None) in _WOULD_BLOCK:
+                    sent = 0
+                else:
+                    self._log("Client disconnected during response send")
+                    self._close_client(client)
+                    return
+            del client.outbuf[:sent]
+
+        if not client.outbuf and client.closing:
+            self._close_client(client)
+            return
+
+        events = selectors.EVENT_READ
+        if client.outbuf:
+            events |= selectors.EVENT_WRITE
+        try:
+            self._selector.modify(client.sock, events, client)
+        except (KeyError, ValueError):
+            pass
+
+    # ------------------------------------------------------------------
+    # Teardown
+    # ------------------------------------------------------------------
+
+    def _close_client(self, client):
+        sock = client.sock
+        if sock is None:
+            return
+        client.sock = None
+        self._clients.pop(sock, None)
+        try:
+            self._selector.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except (OSError, socket.error):
+            pass
+        self._close_socket(sock)
+        if self._on_disconnect is not None:
+            try:
+                self._on_disconnect(client)
+            except Exception as e:
+                self._log("Error in disconnect callback: " + str(e))
+
+    def _shutdown(self):
+        for client in list(self._clients.values()):
+            self._close_client(client)
+        for sock in (self._listener, self._udp_sock, self._wake_reader, self._wake_writer):
+            if sock is None:
+                continue
+            try:
+                self._selector.unregister(sock)
+            except (KeyError, ValueError):
+                pass
+            self._close_socket(sock)
+        self._listener = None
+        self._udp_sock = None
+        self._wake_reader = None
+        self._wake_writer = None
+        self._selector.close()
+        self.running = False
+
+    @staticmethod
+    def _close_socket(sock):
+        if sock is None:
+            return
+        try:
+            sock.close()
+        except (OSError, socket.error):
+            pass
@@ -0,0 +1,202 @@
+"""Main-thread work queue drained from the control surface's display tick.
+
+The Live API is not thread-safe, so socket threads hand work to Live's main
+thread.  Instead of one schedule_message() closure per request, every
+producer (TCP clients, UDP packets) appends to a single deque that
+AbletonMCP.update_display() drains once per tick, within a time budget so a
+burst of requests can't stall Live's UI.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import collections
+import threading
+import time
+
+DEFAULT_TICK_BUDGET_MS = 50.0
+MIN_TICK_BUDGET_MS = 1.0
+MAX_TICK_BUDGET_MS = 500.0
+
+
+class PendingResult(object):
+    """One-shot response slot for a single request.
+
+    The first ``set`` wins, so a result the main thread produces after the
+    deadline can't replace the timeout error already sent.  A request id,
+    when given, is echoed into the response dict.
+    """
+
+    __slots__ = ("_event", "_lock", "_callback", "value", "request_id",
+                 "deadline", "timeout_message")
+
+    def __init__(self, request_id=None, timeout=None, timeout_message="Timeout"):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callback = None
+        self.value = None
+        self.request_id = request_id
+        self.deadline = time.time() + timeout if timeout is not None else None
+        self.timeout_message = timeout_message
+
+    def set(self, value):
+        """Store *value*; returns False if a value was already stored."""
+        with self._lock:
+            if self._event.is_set():
+                return False
+            if self.request_id is not None:
+                value["id"] = self.request_id
+            self.value = value
+            self._event.set()
+            callback = self._callback
+        if callback is not None:
+            callback(self)
+        return True
+
+    def done(self):
+        return self._event.is_set()
+
+    def on_done(self, callback):
+        """Call ``callback(self)`` once a value is stored (now, if it already is)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callback = callback
+                return
+        callback(self)
+
+    def expire(self, now=None):
+        """Store the timeout error if the deadline has passed; True if it did."""
+        if self.deadline is None:
+            return False
+        if (now if now is not None else time.time()) < self.deadline:
+            return False
+        return self.set({"status": "error", "message": self.timeout_message})
+
+    def wait(self):
+        """Block until a value is stored or the deadline passes, then return it."""
+        timeout = None
+        if self.deadline is not None:
+            timeout = max(0.0, self.deadline - time.time())
+        if not self._event.wait(timeout):
+            self.expire()
+        return self.value
+
+
+class MainThreadQueue(object):
+    """Lock-free (deque-based) FIFO of callables run on Live's main thread.
+
+    ``submit`` may be called from any thread; ``drain`` must only be called
+    from the main thread (update_display).  Work submitted with
+    ``defer_to_next_tick`` runs at the start of the following drain, which
+    is how responses wait for Live to settle after a structural change.
+    """
+
+    def __init__(self, tick_budget_ms=DEFAULT_TICK_BUDGET_MS, log=None):
+        self._items = collections.deque()
+        self._next_tick = collections.deque()
+        self._log = log
+        self.tick_budget_ms = float(tick_budget_ms)
+        self.reset_stats()
+
+    # ------------------------------------------------------------------
+    # Producers (any thread)
+    # ------------------------------------------------------------------
+
+    def submit(self, fn):
+        """Queue *fn* (no arguments) to run on the next main-thread tick."""
+        self._items.append((fn, time.time()))
+
+    def defer_to_next_tick(self, fn):
+        """Queue *fn* to run at the start of the tick after the current one."""
+        self._next_tick.append(fn)
+
+    def __len__(self):
+        return len(self._items)
+
+    # ------------------------------------------------------------------
+    # Consumer (main thread)
+    # ------------------------------------------------------------------
+
+    def drain(self):
+        """Run queued work until empty or the per-tick budget is spent.
+
+        At least one item always runs per tick so progress is guaranteed
+        even when a single item exceeds the budget.
+        """
+        tick_start = time.time()
+        self._ticks += 1
+
+        deferred = len(self._next_tick)
+        for _ in range(deferred):
+            self._run(self._next_tick.popleft())
+
+        depth = len(self._items)
+        if depth > self._max_depth:
+            self._max_depth = depth
+
+        budget = self.tick_budget_ms / 1000.0
+        ran = 0
+        while self._items:
+            if ran and time.time() - tick_start >= budget:
+                self._ticks_over_budget += 1
+                break
+            fn, enqueued_at = self._items.popleft()
+            wait_ms = (time.time() - enqueued_at) * 1000.0
+            self._total_wait_ms += wait_ms
+            if wait_ms > self._max_wait_ms:
+                self._max_wait_ms = wait_ms
+            self._run(fn)
+            self._executed += 1
+            ran += 1
+
+        tick_ms = (time.time() - tick_start) * 1000.0
+        self._last_tick_ms = tick_ms
+        if tick_ms > self._max_tick_ms:
+            self._max_tick_ms = tick_ms
+
+    def _run(self, fn):
+        try:
+            fn()
+        except Exception as e:
+            self._errors += 1
+            if self._log:
+                self._log("Main-thread work item failed: " + str(e))
+
+    # ------------------------------------------------------------------
+    # Configuration and counters
+    # ------------------------------------------------------------------
+
+    def set_tick_budget_ms(self, budget_ms):
+        budget_ms = float(budget_ms)
+        if budget_ms < MIN_TICK_BUDGET_MS or budget_ms > MAX_TICK_BUDGET_MS:
+            raise ValueError("tick_budget_ms must be between {0} and {1}, got {2}".format(
+                MIN_TICK_BUDGET_MS, MAX_TICK_BUDGET_MS, budget_ms))
+        self.tick_budget_ms = budget_ms
+        return budget_ms
+
+    def reset_stats(self):
+        self._ticks = 0
+        self._ticks_over_budget = 0
+        self._executed = 0
+        self._errors = 0
+        self._max_depth = 0
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+        self._last_tick_ms = 0.0
+        self._max_tick_ms = 0.0
+
+    def stats(self):
+        """Return counters describing main-thread saturation."""
+        executed = self._executed
+        return {
+            "tick_budget_ms": self.tick_budget_ms,
+            "queue_depth": len(self._items),
+            "max_queue_depth": self._max_depth,
+            "executed": executed,
+            "errors": self._errors,
+            "ticks": self._ticks,
+            "ticks_over_budget": self._ticks_over_budget,
+            "avg_wait_ms": round(self._total_wait_ms / executed, 2) if executed else 0.0,
+            "max_wait_ms": round(self._max_wait_ms, 2),
+            "last_tick_ms": round(self._last_tick_ms, 2),
+            "max_tick_ms": round(self._max_tick_ms, 2),
+        }
@@ -0,0 +1,290 @@
+"""Parameter ramps and periodic modulators evaluated on Live's tick.
+
+Instead of streaming one UDP packet per step from the server, a client
+starts a modulator once and the Remote Script moves the parameter itself
+every control-surface tick.
+
+Two kinds:
+    ramp  from ``start_value`` to ``end_value`` over ``duration``, then
+          holds the end value and finishes.  Shapes: linear, exponential,
+          s_curve, stepped.
+    lfo   periodic between ``min_value`` and ``max_value`` with period
+          ``period``, optionally for ``duration``.  Shapes: sine, triangle,
+          saw, square, stepped.
+
+With ``sync`` the clock is ``song.current_song_time`` in beats, so motion
+follows tempo changes and pauses with the transport; otherwise it is wall
+clock seconds.  Synced modulators accumulate only forward per-tick
+advances, so loop wraps, stop/play and jumps in song position neither
+rewind nor skip them.  Values are in the parameter's own units, clamped
+to its range.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import math
+import time
+
+from .scheduler import MAX_TICK_ADVANCE
+
+RAMP_SHAPES = ("linear", "exponential", "s_curve", "stepped")
+LFO_SHAPES = ("sine", "triangle", "saw", "square", "stepped")
+
+MAX_MODULATORS = 64
+
+# Fields that modify_parameter_modulation may change
+_MUTABLE_FIELDS = ("shape", "start_value", "end_value", "min_value", "max_value",
+                   "duration", "period", "phase", "steps")
+
+
+def _ramp_fraction(shape, t, steps):
+    """Progress 0..1 of a ramp at normalized time *t* (0..1)."""
+    if shape == "s_curve":
+        return t * t * (3.0 - 2.0 * t)
+    if shape == "stepped":
+        return min(math.floor(t * steps) / float(steps - 1), 1.0) if steps > 1 else float(t >= 1.0)
+    return t
+
+
+def _lfo_level(shape, phase, steps):
+    """Level 0..1 of a periodic modulator at *phase* (0..1)."""
+    if shape == "sine":
+        return 0.5 - 0.5 * math.cos(2.0 * math.pi * phase)
+    if shape == "triangle":
+        return 1.0 - abs(2.0 * phase - 1.0)
+    if shape == "saw":
+        return phase
+    if shape == "square":
+        return 1.0 if phase < 0.5 else 0.0
+    # stepped: a rising staircase of `steps` levels per cycle
+    return math.floor(phase * steps) / float(steps - 1) if steps > 1 else 0.0
+
+
+class Modulator(object):
+    """One running ramp or LFO bound to a single parameter."""
+
+    def __init__(self, modulator_id, param, target, spec, now):
+        self.id = modulator_id
+        self.param = param
+        self.target = target
+        self.kind = spec["kind"]
+        self.sync = bool(spec.get("sync", False))
+        self.restart(now)
+        self.last_value = None
+        self.finished = False
+        self.update(spec)
+
+    def update(self, spec):
+        for field in _MUTABLE_FIELDS:
+            if field in spec and spec[field] is not None:
+                setattr(self, field, spec[field])
+        param = self.param
+        if self.kind == "ramp":
+            if not hasattr(self, "start_value"):
+                self.start_value = param.value
+            self.shape = getattr(self, "shape", "linear")
+            if self.shape not in RAMP_SHAPES:
+                raise ValueError("Ramp shape must be one of: " + ", ".join(RAMP_SHAPES))
+            if getattr(self, "end_value", None) is None:
+                raise ValueError("A ramp needs an end_value")
+            if float(getattr(self, "duration", 0) or 0) <= 0:
+                raise ValueError("A ramp needs a positive duration")
+            if self.shape == "exponential" and (self.start_value <= 0) != (self.end_value <= 0):
+                # Geometric interpolation can't cross zero
+                raise ValueError("Exponential ramps need start and end values of the same sign")
+        else:
+            self.shape = getattr(self, "shape", "sine")
+            if self.shape not in LFO_SHAPES:
+                raise ValueError("LFO shape must be one of: " + ", ".join(LFO_SHAPES))
+            if float(getattr(self, "period", 0) or 0) <= 0:
+                raise ValueError("An LFO needs a positive period")
+            if getattr(self, "min_value", None) is None:
+                self.min_value = param.min
+            if getattr(self, "max_value", None) is None:
+                self.max_value = param.max
+            self.phase = float(getattr(self, "phase", 0.0) or 0.0)
+            self.duration = getattr(self, "duration", None)
+        self.steps = max(1, int(getattr(self, "steps", 4) or 4))
+
+    def restart(self, now):
+        self.started_at = now
+        self._last_clock = now
+        self._beats = 0.0
+
+    def elapsed(self, now):
+        """Clock units run since the start, as of the last advance."""
+        if self.sync:
+            return self._beats
+        return max(0.0, now - self.started_at)
+
+    def advance(self, now):
+        """Fold the song-time step since the last tick into a synced clock."""
+        if self.sync:
+            delta = now - self._last_clock
+            if 0 < delta < MAX_TICK_ADVANCE:
+                self._beats += delta
+            self._last_clock = now
+
+    def value_at(self, now):
+        """Parameter value at clock *now*; sets ``finished`` when done."""
+        self.advance(now)
+        elapsed = self.elapsed(now)
+        if self.kind == "ramp":
+            duration = float(self.duration)
+            t = min(elapsed / duration, 1.0)
+            if t >= 1.0:
+                self.finished = True
+            start, end = float(self.start_value), float(self.end_value)
+            if self.shape == "exponential" and start != 0:
+                return start * math.pow(end / start, t)
+            return start + (end - start) * _ramp_fraction(self.shape, t, self.steps)
+
+        if self.duration is not None and elapsed >= float(self.duration):
+            self.finished = True
+        phase = (elapsed / float(self.period) + self.phase) % 1.0
+        level = _lfo_level(self.shape, phase, self.steps)
+        return float(self.min_value) + (float(self.max_value) - float(self.min_value)) * level
+
+    def describe(self, now=None):
+        info = {
+            "modulator_id": self.id,
+            "kind": self.kind,
+            "shape": self.shape,
+            "sync": self.sync,
+            "parameter_name": self.param.name,
+            "last_value": self.last_value,
+        }
+        info.update(self.target)
+        if self.kind == "ramp":
+            info.update({"start_value": self.start_value, "end_value": self.end_value,
+                         "duration": self.duration})
+        else:
+            info.update({"min_value": self.min_value, "max_value": self.max_value,
+                         "period": self.period, "phase": self.phase, "duration": self.duration})
+        if self.shape == "stepped":
+            info["steps"] = self.steps
+        if now is not None:
+            info["elapsed"] = round(self.elapsed(now), 4)
+        return info
+
+
+class ModulationEngine(object):
+    """Runs every active Modulator once per control-surface tick.
+
+    Main thread only.  A modulator whose parameter disappears (device
+    deleted) is dropped and logged.
+    """
+
+    def __init__(self, ctrl):
+        self._ctrl = ctrl
+        self._modulators = {}
+        self._next_id = 1
+        self.writes = 0
+
+    def _clock(self, sync):
+        if sync:
+            return float(self._ctrl.song().current_song_time)
+        return time.time()
+
+    def start(self, song, params):
+        kind = params.get("kind", "ramp")
+        if kind not in ("ramp", "lfo"):
+            raise ValueError("kind must be 'ramp' or 'lfo'")
+        if len(self._modulators) >= MAX_MODULATORS:
+            raise ValueError("At most {0} modulators can run at once".format(MAX_MODULATORS))
+
+        track_type = params.get("track_type", "track")
+        track_index = params.get("track_index", 0)
+        device_index = params.get("device_index", 0)
+        name = params.get("parameter_name", "")
+        from .handlers.devices import _device_parameters
+        lookup = _device_parameters(song, track_index, device_index, track_type, self._ctrl)
+        param = lookup.find(name)
+        if param is None:
+            raise ValueError("Parameter '{0}' not found on device '{1}'".format(name, lookup.device.name))
+
+        # One modulator per parameter: a new one replaces the old
+        target = {"track_type": track_type, "track_index": track_index,
+                  "device_index": device_index}
+        for mod in list(self._modulators.values()):
+            if mod.param == param:
+                del self._modulators[mod.id]
+
+        spec = dict(params, kind=kind)
+        mod = Modulator(self._next_id, param, target, spec, self._clock(spec.get("sync")))
+        self._next_id += 1
+        self._modulators[mod.id] = mod
+        self._apply(mod, mod.started_at)
+        return mod.describe()
+
+    def modify(self, params):
+        mod = self._get(params.get("modulator_id"))
+        previous = dict(mod.__dict__)
+        try:
+            mod.update(params)
+        except ValueError:
+            # Leave the running modulator as it was
+            mod.__dict__.update(previous)
+            raise
+        if params.get("restart"):
+            mod.restart(self._clock(mod.sync))
+            mod.finished = False
+        return mod.describe(self._clock(mod.sync))
+
+    def stop(self, params):
+        """Stop one modulator (or all); the parameter keeps its current value."""
+        modulator_id = params.get("modulator_id")
+        if modulator_id is None:
+            stopped = sorted(self._modulators)
+            self._modulators.clear()
+        else:
+            self._get(modulator_id)
+            stopped = [self._modulators.pop(modulator_id).id]
+        return {"stopped": stopped, "active": len(self._modulators)}
+
+    def describe(self):
+        return {
+            "modulators": [mod.describe(self._clock(mod.sync))
+                           for _, mod in sorted(self._modulators.items())],
+            "max_modulators": MAX_MODULATORS,
+            "writes": self.writes,
+        }
+
+    def tick(self):
+        if not self._modulators:
+            return
+        wall = time.time()
+        beats = None
+        for mod in list(self._modulators.values()):
+            if mod.sync:
+                if beats is None:
+                    beats = float(self._ctrl.song().current_song_time)
+                now = beats
+            else:
+                now = wall
+            self._apply(mod, now)
+            if mod.finished:
+                self._modulators.pop(mod.id, None)
+
+    def disconnect(self):
+        self._modulators.clear()
+
+    def _get(self, modulator_id):
+        try:
+            return self._modulators[int(modulator_id)]
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("No active modulator with id {0}".format(modulator_id))
+
+    def _apply(self, mod, now):
+        try:
+            param = mod.param
+            value = max(param.min, min(param.max, mod.value_at(now)))
+            if getattr(param, "is_quantized", False):
+                value = int(round(value))
+            if value != mod.last_value:
+                param.value = value
+                mod.last_value = value
+                self.writes += 1
+        except Exception as e:
+            self._ctrl.log_message("Modulator {0} stopped: {1}".format(mod.id, e))
+            self._modulators.pop(mod.id, None)
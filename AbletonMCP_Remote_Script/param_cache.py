@@ -0,0 +1,316 @@
+"""Per-device parameter lookup tables for the parameter setters.
+
+Resolving ``(track, device, parameter name)`` the plain way walks the
+track list, the device list and every parameter of the device.  Real-time
+UDP automation does that for every packet, so the result is cached per
+device location: the device, its parameters by index and a name->parameter
+map.
+
+Entries are invalidated by Live listeners -- the device's ``parameters``
+list, the track's ``devices`` list and the song's ``tracks`` /
+``return_tracks`` lists -- so a cached entry never outlives the layout it
+was built from.  Main thread only, like every Live API access.
+
+DisplayValueCache holds the reverse of ``str_for_value`` for integer-step
+parameters (LFO rates, filter types), shared by every device of the same
+class, so resolving a ``value_display`` costs a dict lookup once the
+string has been seen.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import collections
+
+from .handlers._helpers import get_track
+from .subscriptions import listen, unlisten_all
+
+MAX_CACHED_DEVICES = 256
+
+
+class DeviceParameters(object):
+    """A device with its parameters indexed by position and by name.
+
+    With ``indexed=False`` no name maps are built and lookups scan, which
+    is cheaper for a one-off lookup.  On duplicate names ``find`` returns
+    the first match (as set_device_parameter always did) and
+    ``find_last`` the last (as set_device_parameters_batch always did).
+    """
+
+    __slots__ = ("device", "parameters", "first_by_name", "by_name", "bindings")
+
+    def __init__(self, device, indexed=True):
+        self.device = device
+        self.parameters = tuple(device.parameters)
+        self.first_by_name = self.by_name = None
+        if indexed:
+            self.first_by_name = {}
+            self.by_name = {}
+            for param in self.parameters:
+                self.first_by_name.setdefault(param.name, param)
+                self.by_name[param.name] = param
+        self.bindings = []
+
+    def find(self, name):
+        """First parameter called *name*, or None."""
+        if self.first_by_name is not None:
+            return self.first_by_name.get(name)
+        for param in self.parameters:
+            if param.name == name:
+                return param
+        return None
+
+    def find_last(self, name):
+        """Last parameter called *name*, or None."""
+        if self.by_name is not None:
+            return self.by_name.get(name)
+        for param in reversed(self.parameters):
+            if param.name == name:
+                return param
+        return None
+
+
+class ParameterIndexCache(object):
+    """LRU of DeviceParameters keyed by (track_type, track_index, device_index)."""
+
+    def __init__(self, max_devices=MAX_CACHED_DEVICES):
+        self.max_devices = max_devices
+        self._entries = collections.OrderedDict()
+        # Track-level device-list listeners, one per cached track
+        self._track_bindings = {}
+        self._song_bindings = []
+        self._song = None
+        # Listeners are removed outside of Live's notifications
+        self._retired = []
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def lookup(self, song, track_index, device_index, track_type="track"):
+        """Return the DeviceParameters for a device, building it on a miss.
+
+        Raises IndexError for an unknown track or device, like the uncached
+        resolution.
+        """
+        if song is not self._song:
+            self._watch_song(song)
+        key = (track_type, track_index, device_index)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        self._release_retired()
+        track = get_track(song, track_index, track_type)
+        device_list = list(track.devices)
+        if device_index < 0 or device_index >= len(device_list):
+            raise IndexError("Device index out of range")
+
+        entry = DeviceParameters(device_list[device_index])
+        listen(entry.bindings, entry.device, "parameters", lambda: self.invalidate(key))
+        track_key = (track_type, track_index)
+        if track_key not in self._track_bindings:
+            bindings = self._track_bindings[track_key] = []
+            listen(bindings, track, "devices", lambda: self.invalidate_track(track_key))
+        self._entries[key] = entry
+        while len(self._entries) > self.max_devices:
+            _, evicted = self._entries.popitem(last=False)
+            self._retired.append(evicted.bindings)
+        return entry
+
+    def invalidate(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.invalidations += 1
+            self._retired.append(entry.bindings)
+
+    def invalidate_track(self, track_key):
+        for key in [k for k in self._entries if k[:2] == track_key]:
+            self.invalidate(key)
+        bindings = self._track_bindings.pop(track_key, None)
+        if bindings is not None:
+            self._retired.append(bindings)
+
+    def clear(self):
+        """Drop every entry; track indices may have shifted."""
+        for track_key in list(self._track_bindings):
+            self.invalidate_track(track_key)
+        for key in list(self._entries):
+            self.invalidate(key)
+
+    def disconnect(self):
+        self.clear()
+        self._retired.append(self._song_bindings)
+        self._song_bindings = []
+        self._song = None
+        self._release_retired()
+
+    def stats(self):
+        return {
+            "devices": len(self._entries),
+            "max_devices": self.max_devices,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+    def _watch_song(self, song):
+        if self._song is not None and self._song == song:
+            # Another wrapper for the same Song
+            return
+        # A different Song object means a new set was loaded
+        self.clear()
+        unlisten_all(self._song_bindings)
+        self._song = song
+        listen(self._song_bindings, song, "tracks", self.clear)
+        listen(self._song_bindings, song, "return_tracks", self.clear)
+
+    def _release_retired(self):
+        for bindings in self._retired:
+            unlisten_all(bindings)
+        self._retired = []
+
+
+# ----------------------------------------------------------------------
+# Display string -> raw value tables
+# ----------------------------------------------------------------------
+
+MAX_DISPLAY_TABLES = 128
+
+# str_for_value calls per tick spent completing tables in the background
+PREWARM_STEPS_PER_TICK = 256
+
+# Device classes whose parameter layout depends on the loaded plugin/patch
+_PER_INSTANCE_CLASSES = ("PluginDevice", "AuPluginDevice", "MxDeviceAudioEffect",
+                         "MxDeviceInstrument", "MxDeviceMidiEffect")
+
+
+def display_table_key(device, param, lo, hi):
+    """Key under which *param*'s display table is shared between devices."""
+    class_name = device.class_name
+    if class_name in _PER_INSTANCE_CLASSES:
+        class_name = class_name + ":" + device.name
+    return (class_name, param.name, lo, hi)
+
+
+class DisplayTable(object):
+    """Normalized display string -> raw value for the integers lo..hi.
+
+    Filled lazily: a lookup scans only as far as its match, and later
+    lookups resume where the last one stopped, so no integer is ever
+    passed to str_for_value twice.
+    """
+
+    __slots__ = ("values", "next_value", "hi")
+
+    def __init__(self, lo, hi):
+        self.values = {}
+        self.next_value = lo
+        self.hi = hi
+
+    @property
+    def complete(self):
+        return self.next_value > self.hi
+
+    def scan(self, param, normalize, target=None, max_steps=None):
+        """Extend the table; stop early at *target* or after *max_steps*.
+
+        Returns the raw value for *target* if it was found.
+        """
+        values = self.values
+        v = self.next_value
+        stop = self.hi if max_steps is None else min(self.hi, v + max_steps - 1)
+        while v <= stop:
+            try:
+                disp = param.str_for_value(float(v))
+            except Exception:
+                disp = None
+            v += 1
+            if disp is None:
+                continue
+            norm = normalize(disp)
+            if norm not in values:
+                # First match wins, as with a linear scan
+                values[norm] = float(v - 1)
+                if norm == target:
+                    break
+        self.next_value = v
+        return values.get(target) if target is not None else None
+
+
+class DisplayValueCache(object):
+    """LRU of DisplayTables keyed by device class and parameter name."""
+
+    def __init__(self, max_tables=MAX_DISPLAY_TABLES):
+        self.max_tables = max_tables
+        self._tables = collections.OrderedDict()
+        # (table, param, normalize) still to complete, see prewarm_tick
+        self._prewarm = collections.deque()
+        self.hits = 0
+        self.misses = 0
+        self.steps = 0
+
+    def table(self, key, lo, hi):
+        table = self._tables.get(key)
+        if table is None:
+            table = self._tables[key] = DisplayTable(lo, hi)
+            while len(self._tables) > self.max_tables:
+                self._tables.popitem(last=False)
+        else:
+            self._tables.move_to_end(key)
+        return table
+
+    def resolve(self, key, param, target, normalize, lo, hi):
+        """Raw value for normalized display string *target*, or None."""
+        table = self.table(key, lo, hi)
+        value = table.values.get(target)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        if table.complete:
+            return None
+        start = table.next_value
+        value = table.scan(param, normalize, target)
+        self.steps += table.next_value - start
+        return value
+
+    def prewarm(self, key, param, normalize, lo, hi):
+        """Queue *param*'s table for completion by prewarm_tick.
+
+        Returns the number of values still to scan.
+        """
+        table = self.table(key, lo, hi)
+        remaining = max(0, table.hi - table.next_value + 1)
+        if remaining:
+            self._prewarm.append((table, param, normalize))
+        return remaining
+
+    def prewarm_tick(self, budget=PREWARM_STEPS_PER_TICK):
+        """Spend up to *budget* str_for_value calls on queued tables."""
+        while budget > 0 and self._prewarm:
+            table, param, normalize = self._prewarm[0]
+            start = table.next_value
+            try:
+                table.scan(param, normalize, max_steps=budget)
+            except Exception:
+                # Device deleted while warming; the partial table stays valid
+                self._prewarm.popleft()
+                continue
+            done = table.next_value - start
+            self.steps += done
+            budget -= max(done, 1)
+            if table.complete:
+                self._prewarm.popleft()
+
+    def stats(self):
+        return {
+            "tables": len(self._tables),
+            "max_tables": self.max_tables,
+            "complete": sum(1 for t in self._tables.values() if t.complete),
+            "prewarm_pending": len(self._prewarm),
+            "hits": self.hits,
+            "misses": self.misses,
+            "str_for_value_calls": self.steps,
+        }
@@ -0,0 +1,123 @@
+"""Last-write-wins buffer for the UDP real-time parameter path.
+
+An automation sweep sends far more datagrams than Live has ticks, and
+queueing one main-thread task per datagram makes Live apply every stale
+intermediate value.  Instead the I/O thread records the newest entry per
+(track_type, track, device, parameter) and schedules a single flush; the
+flush applies whatever is pending once, grouped per device.  Entries are
+kept whole, so ``value_display`` writes survive coalescing.
+
+Datagrams may carry ``"sender"`` and ``"seq"``.  A datagram that is not
+newer than the last one seen for its device from the same sender arrived
+out of order and is dropped whole.  Entries within one datagram share its
+seq, so a parameter named twice in it coalesces last-wins, exactly as
+without a seq.  Packets without them (older servers) are always accepted.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import collections
+import threading
+
+
+class RealtimeParameterBuffer(object):
+    """Collapses bursts of UDP parameter writes into one write per tick.
+
+    *submit* queues a zero-argument callable on Live's main thread;
+    *apply* is called there as ``apply(track_type, track_index,
+    device_index, [{"name", "value" | "value_display"}, ...], first_match)``
+    and returns per-entry results (entries with an ``"error"`` key failed).
+    *first_match* is true for entries from single-parameter sets, which
+    target the first of several parameters sharing a name.
+    """
+
+    def __init__(self, submit, apply, log):
+        self._submit = submit
+        self._apply = apply
+        self._log = log
+        self._lock = threading.Lock()
+        self._pending = collections.OrderedDict()
+        # (track_type, track, device, sender) -> seq of the newest datagram seen
+        self._latest = {}
+        self._scheduled = False
+        self.received = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.applied = 0
+        self.errors = 0
+        self.flushes = 0
+
+    def offer(self, track_type, track_index, device_index, updates, sender=None, seq=None,
+              first_match=False):
+        """Record parameter entry dicts *updates*; called on the I/O thread.
+
+        Entries carrying neither ``"value"`` nor ``"value_display"`` are
+        dropped and counted as errors rather than written as a default.
+        """
+        schedule = False
+        with self._lock:
+            if seq is not None:
+                device_key = (track_type, track_index, device_index, sender)
+                last = self._latest.get(device_key)
+                if last is not None and seq <= last:
+                    self.received += len(updates)
+                    self.dropped += len(updates)
+                    return
+                self._latest[device_key] = seq
+            for entry in updates:
+                self.received += 1
+                if "value" not in entry and entry.get("value_display") is None:
+                    self.errors += 1
+                    continue
+                name = entry.get("name", "")
+                # Single and batch sets may resolve a shared name differently
+                key = (track_type, track_index, device_index, first_match, name)
+                if key in self._pending:
+                    # Overwrites in place: the parameter keeps its flush position
+                    self.coalesced += 1
+                self._pending[key] = entry
+            if self._pending and not self._scheduled:
+                self._scheduled = schedule = True
+        if schedule:
+            self._submit(self.flush)
+
+    def flush(self):
+        """Apply every pending entry once; main thread only."""
+        with self._lock:
+            pending, self._pending = self._pending, collections.OrderedDict()
+            self._scheduled = False
+        if not pending:
+            return
+
+        by_device = collections.OrderedDict()
+        for key, entry in pending.items():
+            by_device.setdefault(key[:4], []).append(entry)
+
+        applied = errors = 0
+        for (track_type, track_index, device_index, first_match), entries in by_device.items():
+            try:
+                results = self._apply(track_type, track_index, device_index, entries, first_match)
+            except Exception as e:
+                errors += len(entries)
+                self._log("UDP real-time update error: " + str(e))
+                continue
+            failed = sum(1 for r in results if "error" in r)
+            errors += failed
+            applied += len(results) - failed
+
+        with self._lock:
+            self.applied += applied
+            self.errors += errors
+            self.flushes += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "received": self.received,
+                "coalesced": self.coalesced,
+                "dropped_out_of_order": self.dropped,
+                "applied": self.applied,
+                "errors": self.errors,
+                "flushes": self.flushes,
+                "pending": len(self._pending),
+            }
@@ -0,0 +1,245 @@
+"""Beat-quantized execution of modifying commands.
+
+A command sent over TCP runs whenever the network and the main-thread
+queue get to it, which is tens of milliseconds of jitter.  Scheduled
+commands are instead held in a heap ordered by target song time and fired
+from the control-surface tick closest to that time.
+
+Targets are song positions in beats (``at_beat``), 1-based bars
+(``at_bar``) or the next quantization boundary (``quantize``).  Commands
+only fire while the transport is playing; a command whose target is
+passed by a jump in song position fires on the next tick unless it is
+later than its ``max_lateness_beats``, in which case it is skipped.
+
+Each fired command records its lateness (fired position minus target, in
+beats and milliseconds at the current tempo).  Live ticks roughly every
+60 ms, so a command fires on the tick nearest its target: the scheduler
+fires once the target is less than half a tick's song-time advance away,
+which makes lateness land in about +/- half a tick.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import collections
+import heapq
+import math
+
+MAX_PENDING = 256
+HISTORY_SIZE = 100
+
+# Grid sizes in quarter-note beats; bar-based grids are scaled by the
+# song's bar length
+_QUANTIZE_BEATS = {
+    "8_bars": ("bars", 8.0),
+    "4_bars": ("bars", 4.0),
+    "2_bars": ("bars", 2.0),
+    "bar": ("bars", 1.0),
+    "half": ("beats", 2.0),
+    "half_triplet": ("beats", 4.0 / 3.0),
+    "quarter": ("beats", 1.0),
+    "beat": ("beats", 1.0),
+    "quarter_triplet": ("beats", 2.0 / 3.0),
+    "eighth": ("beats", 0.5),
+    "eighth_triplet": ("beats", 1.0 / 3.0),
+    "sixteenth": ("beats", 0.25),
+    "sixteenth_triplet": ("beats", 1.0 / 6.0),
+    "thirtysecond": ("beats", 0.125),
+}
+# Song.clip_trigger_quantization values, in Live's enum order
+_GLOBAL_QUANTIZATION = (
+    None, "8_bars", "4_bars", "2_bars", "bar", "half", "half_triplet",
+    "quarter", "quarter_triplet", "eighth", "eighth_triplet",
+    "sixteenth", "sixteenth_triplet", "thirtysecond",
+)
+
+# Boundary tolerance so a position that is on the grid counts as on it
+_EPSILON = 1e-6
+
+# Larger per-tick advances (beats) are jumps in song position, not playback
+MAX_TICK_ADVANCE = 1.0
+
+
+def _beats_per_bar(song):
+    return song.signature_numerator * 4.0 / song.signature_denominator
+
+
+def next_boundary(song, quantize, now):
+    """First grid position strictly after *now* for *quantize*."""
+    if quantize == "global":
+        index = int(song.clip_trigger_quantization)
+        quantize = _GLOBAL_QUANTIZATION[index] if 0 <= index < len(_GLOBAL_QUANTIZATION) else None
+        if quantize is None:
+            # Global quantization is off: as soon as possible
+            return now
+    if quantize not in _QUANTIZE_BEATS:
+        raise ValueError("quantize must be 'global' or one of: "
+                         + ", ".join(sorted(_QUANTIZE_BEATS)))
+    unit, size = _QUANTIZE_BEATS[quantize]
+    grid = size * _beats_per_bar(song) if unit == "bars" else size
+    return (math.floor(now / grid + _EPSILON) + 1) * grid
+
+
+class ScheduledCommand(object):
+    __slots__ = ("id", "command", "params", "target", "max_lateness", "cancelled")
+
+    def __init__(self, scheduled_id, command, params, target, max_lateness):
+        self.id = scheduled_id
+        self.command = command
+        self.params = params
+        self.target = target
+        self.max_lateness = max_lateness
+        self.cancelled = False
+
+    def describe(self):
+        return {
+            "scheduled_id": self.id,
+            "command": self.command,
+            "target_beat": round(self.target, 6),
+        }
+
+
+class CommandScheduler(object):
+    """Heap of commands waiting for a song position; main thread only.
+
+    *execute* runs a command as ``execute(command_type, params)``; only
+    types in *allowed* may be scheduled.
+    """
+
+    def __init__(self, ctrl, execute, allowed):
+        self._ctrl = ctrl
+        self._execute = execute
+        self._allowed = allowed
+        self._heap = []
+        self._pending = {}
+        self._next_id = 1
+        self._last_time = None
+        self._tick_advance = 0.0
+        self._history = collections.deque(maxlen=HISTORY_SIZE)
+        self.fired = 0
+        self.failed = 0
+        self.missed = 0
+        self._abs_lateness_ms = 0.0
+        self._max_lateness_ms = 0.0
+
+    def schedule(self, song, params):
+        command = params.get("command", "")
+        if command not in self._allowed:
+            raise ValueError("Command '{0}' cannot be scheduled".format(command))
+        command_params = params.get("params", {})
+        if not isinstance(command_params, dict):
+            raise ValueError("'params' must be an object")
+        if len(self._pending) >= MAX_PENDING:
+            raise ValueError("At most {0} commands can be pending".format(MAX_PENDING))
+
+        now = float(song.current_song_time)
+        if params.get("at_beat") is not None:
+            target = float(params["at_beat"])
+        elif params.get("at_bar") is not None:
+            bar = float(params["at_bar"])
+            if bar < 1:
+                raise ValueError("at_bar is 1-based")
+            target = (bar - 1.0) * _beats_per_bar(song)
+        elif params.get("quantize"):
+            target = next_boundary(song, params["quantize"], now)
+        else:
+            raise ValueError("Give one of at_beat, at_bar or quantize")
+
+        max_lateness = params.get("max_lateness_beats")
+        entry = ScheduledCommand(self._next_id, command, command_params, target,
+                                 float(max_lateness) if max_lateness is not None else None)
+        self._next_id += 1
+        self._pending[entry.id] = entry
+        heapq.heappush(self._heap, (entry.target, entry.id, entry))
+        info = entry.describe()
+        info["current_beat"] = round(now, 6)
+        info["pending"] = len(self._pending)
+        return info
+
+    def cancel(self, params):
+        """Cancel one pending command, or all when no id is given."""
+        scheduled_id = params.get("scheduled_id")
+        if scheduled_id is None:
+            cancelled = sorted(self._pending)
+            for entry in self._pending.values():
+                entry.cancelled = True
+            self._pending.clear()
+            self._heap = []
+        else:
+            try:
+                entry = self._pending.pop(int(scheduled_id))
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("No pending scheduled command with id {0}".format(scheduled_id))
+            # Lazily removed from the heap when it reaches the top
+            entry.cancelled = True
+            cancelled = [entry.id]
+        return {"cancelled": cancelled, "pending": len(self._pending)}
+
+    def tick(self):
+        if not self._heap:
+            self._last_time = None
+            return
+        song = self._ctrl.song()
+        if not song.is_playing:
+            self._last_time = None
+            return
+        now = float(song.current_song_time)
+        if self._last_time is not None and 0 < now - self._last_time < MAX_TICK_ADVANCE:
+            self._tick_advance = now - self._last_time
+        self._last_time = now
+
+        # Fire on the tick nearest the target rather than the first one after it
+        horizon = now + self._tick_advance / 2.0
+        while self._heap and self._heap[0][0] <= horizon:
+            _target, _id, entry = heapq.heappop(self._heap)
+            if entry.cancelled:
+                continue
+            del self._pending[entry.id]
+            self._fire(song, entry, now)
+
+    def _fire(self, song, entry, now):
+        lateness = now - entry.target
+        lateness_ms = lateness * 60000.0 / song.tempo
+        record = entry.describe()
+        record.update({
+            "fired_beat": round(now, 6),
+            "lateness_beats": round(lateness, 6),
+            "lateness_ms": round(lateness_ms, 2),
+        })
+        if entry.max_lateness is not None and lateness > entry.max_lateness:
+            record["status"] = "missed"
+            self.missed += 1
+            self._history.append(record)
+            return
+        try:
+            self._execute(entry.command, entry.params)
+            record["status"] = "success"
+            self.fired += 1
+            self._abs_lateness_ms += abs(lateness_ms)
+            self._max_lateness_ms = max(self._max_lateness_ms, abs(lateness_ms))
+        except Exception as e:
+            self._ctrl.log_message("Scheduled command {0} ({1}) failed: {2}".format(
+                entry.id, entry.command, e))
+            record["status"] = "error"
+            record["message"] = str(e)
+            self.failed += 1
+        self._history.append(record)
+
+    def describe(self, song):
+        pending = sorted(self._pending.values(), key=lambda e: (e.target, e.id))
+        return {
+            "current_beat": round(float(song.current_song_time), 6),
+            "is_playing": bool(song.is_playing),
+            "pending": [entry.describe() for entry in pending],
+            "history": list(self._history),
+            "stats": {
+                "fired": self.fired,
+                "failed": self.failed,
+                "missed": self.missed,
+                "mean_abs_lateness_ms": round(self._abs_lateness_ms / self.fired, 2) if self.fired else None,
+                "max_abs_lateness_ms": round(self._max_lateness_ms, 2),
+            },
+        }
+
+    def disconnect(self):
+        self._heap = []
+        self._pending.clear()
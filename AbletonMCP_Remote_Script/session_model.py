@@ -0,0 +1,231 @@
+"""Generation counters for incremental session queries.
+
+Every regular track, clip slot and device has a generation number: the
+value of a global counter at the moment it last changed.  Changes are
+seen through Live listeners and through our own modifying commands
+(``note_command``), so ``delta(since)`` can return just the objects whose
+generation is newer than what the client already has, instead of walking
+every slot and device of the set.
+
+Structural changes (tracks or scenes added, removed, moved, undo/redo)
+shift indices, so they bump a structure generation instead; a client
+behind it gets a full resync.  Listeners are (re)registered lazily by
+``delta`` -- until then any delta is a full resync anyway.
+
+Return and master tracks are not covered.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import time
+
+from .handlers import tracks as track_handlers
+from .subscriptions import listen, unlisten_all
+
+# Commands that add, remove or reorder tracks, scenes or clip slots
+STRUCTURAL_COMMANDS = frozenset([
+    "create_midi_track", "create_audio_track", "delete_track", "duplicate_track",
+    "create_midi_track_with_simpler", "group_tracks",
+    "create_scene", "delete_scene", "duplicate_scene",
+    "undo", "redo",
+])
+
+# Commands that replace a track's device list
+DEVICE_LIST_COMMANDS = frozenset([
+    "insert_device", "delete_device", "load_browser_item", "load_instrument_or_effect",
+    "load_sample", "load_drum_kit", "sliced_simpler_to_drum_rack",
+])
+
+_TRACK_PROPERTIES = ("name", "mute", "solo", "color", "playing_slot_index", "fired_slot_index")
+
+
+class SessionModel(object):
+    """Tracks what changed since a given generation.  Main thread only."""
+
+    def __init__(self, ctrl):
+        self._ctrl = ctrl
+        # Changes when the Remote Script is reloaded; clients compare it to
+        # tell a restarted counter from an unchanged session
+        self.epoch = "{0:x}".format(int(time.time() * 1000))
+        # 0 is reserved for "nothing yet" (always a full resync)
+        self.generation = 1
+        self._structure_generation = 1
+        self._tracks = {}        # track index -> generation
+        self._slots = {}         # (track index, slot index) -> generation
+        self._devices = {}       # (track index, device index) -> generation
+        self._device_lists = {}  # track index -> generation of its device list
+        self._bindings = []
+        self._bound_generation = None
+
+    # ------------------------------------------------------------------
+    # Bumps
+    # ------------------------------------------------------------------
+
+    def _bump(self, table, key):
+        self.generation += 1
+        table[key] = self.generation
+
+    def bump_structure(self):
+        self.generation += 1
+        self._structure_generation = self.generation
+        # Index-keyed generations are meaningless after a structural change
+        self._tracks.clear()
+        self._slots.clear()
+        self._devices.clear()
+        self._device_lists.clear()
+
+    def note_command(self, command_type, params):
+        """Record what a successful modifying command touched."""
+        params = params or {}
+        if command_type in STRUCTURAL_COMMANDS:
+            self.bump_structure()
+            return
+        if params.get("track_type", "track") != "track":
+            return
+        track_index = params.get("track_index")
+        if not isinstance(track_index, int):
+            return
+        if command_type in DEVICE_LIST_COMMANDS:
+            self._bump(self._device_lists, track_index)
+        elif isinstance(params.get("device_index"), int):
+            self._bump(self._devices, (track_index, params["device_index"]))
+        elif isinstance(params.get("clip_index"), int):
+            self._bump(self._slots, (track_index, params["clip_index"]))
+        else:
+            self._bump(self._tracks, track_index)
+
+    # ------------------------------------------------------------------
+    # Listeners
+    # ------------------------------------------------------------------
+
+    def _ensure_bound(self, song):
+        if self._bound_generation == self._structure_generation and self._bindings:
+            return
+        unlisten_all(self._bindings)
+        listen(self._bindings, song, "tracks", self._structure_changed)
+        listen(self._bindings, song, "scenes", self._structure_changed)
+        for t, track in enumerate(song.tracks):
+            self._bind_track(track, t)
+        self._bound_generation = self._structure_generation
+
+    def _bind_track(self, track, t):
+        bump_track = lambda: self._bump(self._tracks, t)
+        for prop in _TRACK_PROPERTIES:
+            self._try_listen(track, prop, bump_track)
+        try:
+            if track.can_be_armed:
+                self._try_listen(track, "arm", bump_track)
+        except Exception:
+            pass
+        mixer = track.mixer_device
+        self._try_listen(mixer.volume, "value", bump_track)
+        self._try_listen(mixer.panning, "value", bump_track)
+        self._try_listen(track, "devices", self._device_list_callback(t))
+        for s, slot in enumerate(track.clip_slots):
+            self._try_listen(slot, "has_clip", self._slot_callback(t, s))
+        self._bind_devices(track, t)
+
+    def _bind_devices(self, track, t):
+        for d, device in enumerate(track.devices):
+            self._try_listen(device, "name", self._device_callback(t, d))
+
+    def _try_listen(self, subject, prop, callback):
+        try:
+            listen(self._bindings, subject, prop, callback)
+        except Exception:
+            # Not every track type has every property (e.g. arm on groups)
+            pass
+
+    def _structure_changed(self):
+        self.bump_structure()
+
+    def _slot_callback(self, t, s):
+        return lambda: self._bump(self._slots, (t, s))
+
+    def _device_callback(self, t, d):
+        return lambda: self._bump(self._devices, (t, d))
+
+    def _device_list_callback(self, t):
+        def changed():
+            self._bump(self._device_lists, t)
+            # Name listeners follow the new device list on the next delta
+            self._bound_generation = None
+        return changed
+
+    def disconnect(self):
+        unlisten_all(self._bindings)
+        self._bound_generation = None
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def delta(self, song, since_generation=0, epoch=None, ctrl=None):
+        """Objects changed after *since_generation*.
+
+        A full resync (every track, slot and device) is returned when the
+        client has nothing yet, is behind a structural change, or holds a
+        generation from another epoch.
+        """
+        self._ensure_bound(song)
+        since = int(since_generation or 0)
+        full = (since <= 0 or since < self._structure_generation or since > self.generation
+                or (epoch is not None and epoch != self.epoch))
+        track_list = list(song.tracks)
+
+        if full:
+            changed_tracks = range(len(track_list))
+            changed_slots = [(t, s) for t, track in enumerate(track_list)
+                             for s in range(len(track.clip_slots))]
+            device_lists = list(changed_tracks)
+            changed_devices = []
+        else:
+            changed_tracks = sorted(t for t, g in self._tracks.items() if g > since)
+            changed_slots = sorted(k for k, g in self._slots.items() if g > since)
+            device_lists = sorted(t for t, g in self._device_lists.items() if g > since)
+            changed_devices = sorted(k for k, g in self._devices.items()
+                                     if g > since and k[0] not in device_lists)
+
+        tracks = []
+        for t in changed_tracks:
+            if t < len(track_list):
+                tracks.append(track_handlers.track_properties(song, track_list[t], t, ctrl=ctrl))
+
+        clip_slots = []
+        for t, s in changed_slots:
+            if t < len(track_list):
+                slots = track_list[t].clip_slots
+                if s < len(slots):
+                    entry = track_handlers.clip_slot_info(s, slots[s])
+                    entry["track_index"] = t
+                    clip_slots.append(entry)
+
+        devices = []
+        for t in device_lists:
+            if t < len(track_list):
+                for d, device in enumerate(track_list[t].devices):
+                    entry = track_handlers.device_summary(d, device, ctrl)
+                    entry["track_index"] = t
+                    devices.append(entry)
+        for t, d in changed_devices:
+            if t < len(track_list):
+                device_list = list(track_list[t].devices)
+                if d < len(device_list):
+                    entry = track_handlers.device_summary(d, device_list[d], ctrl)
+                    entry["track_index"] = t
+                    devices.append(entry)
+
+        return {
+            "epoch": self.epoch,
+            "generation": self.generation,
+            "since_generation": since,
+            "full": full,
+            "track_count": len(track_list),
+            "scene_count": len(song.scenes),
+            "tracks": tracks,
+            "clip_slots": clip_slots,
+            "devices": devices,
+            # Tracks whose device list was replaced wholesale: drop devices
+            # not listed here
+            "device_lists": [t for t in device_lists if t < len(track_list)],
+        }
@@ -0,0 +1,395 @@
+"""Push-based change notifications built on Live API listeners.
+
+A TCP client sends ``subscribe`` with the topics it wants; the listeners
+for those topics are registered on Live's main thread and their callbacks
+only record *what* changed.  Once per display tick ``flush`` reads the
+current value of every changed object and pushes one ``event`` message
+per subscribed client, so a parameter sweep that fires hundreds of
+listener callbacks costs one message per tick.
+
+Topics:
+    song        tempo and is_playing
+    tracks      the track list (name per index), including renames
+    clip_slots  has_clip for every clip slot
+    devices     the device list of every track (index, name, class_name,
+                type as in get_track_info), including renames
+    parameters  values of the parameters of specific devices, given as
+                ``{"track_index", "device_index", "track_type"}`` entries
+
+Event messages have no ``id`` and look like::
+
+    {"type": "event", "seq": 12, "events": [{"topic": "song", ...}, ...]}
+
+After every write command, ``sync`` flushes at once and sends each client
+``{"type": "sync", "seq": 12}``; the write's response carries the same
+number as ``event_seq``, so a client can tell when its mirror has caught
+up with its own writes.
+
+Index-based listeners are rebuilt whenever tracks, scenes or device lists
+change; affected clients then get the full current state of those topics
+again, since indices may have shifted.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+from .handlers._helpers import get_track
+from .handlers.tracks import device_summary
+
+TOPICS = ("song", "tracks", "clip_slots", "devices", "parameters")
+
+# Per-client cap on devices watched through the "parameters" topic
+MAX_PARAMETER_DEVICES = 32
+
+
+def listen(bindings, subject, prop, callback):
+    """Add a Live ``prop`` listener and record it in *bindings* for removal."""
+    getattr(subject, "add_{0}_listener".format(prop))(callback)
+    bindings.append((subject, prop, callback))
+
+
+def unlisten_all(bindings):
+    """Remove every listener recorded in *bindings* and empty it."""
+    for subject, prop, callback in bindings:
+        try:
+            if getattr(subject, "{0}_has_listener".format(prop))(callback):
+                getattr(subject, "remove_{0}_listener".format(prop))(callback)
+        except Exception:
+            # The object is gone (track/device deleted); nothing to remove
+            pass
+    del bindings[:]
+
+
+class SubscriptionManager(object):
+    """Owns every listener registered on behalf of subscribed clients.
+
+    All methods run on Live's main thread.  *push* is called with
+    ``(client, message)`` and must be thread-safe (IOLoop.push).
+    """
+
+    def __init__(self, ctrl, push):
+        self._ctrl = ctrl
+        self._push = push
+        # client -> set of topic keys ("song", ..., ("parameters", tt, t, d))
+        self._clients = {}
+        # topic key -> [(subject, property, callback)]
+        self._bindings = {}
+        # song-level structure listeners, live while any topic is subscribed
+        self._structure = []
+        # coalesced changes: event key -> zero-arg builder returning the event
+        self._pending = {}
+        self._rebind = False
+        self._seq = 0
+
+    # ------------------------------------------------------------------
+    # Commands
+    # ------------------------------------------------------------------
+
+    def subscribe(self, client, params):
+        """Add topics for *client*; returns their current state as events."""
+        keys = self._topic_keys(params)
+        if not keys:
+            raise ValueError("Nothing to subscribe to; topics must be among: " + ", ".join(TOPICS))
+        current = self._clients.setdefault(client, set())
+        param_devices = [k for k in current | keys if isinstance(k, tuple)]
+        if len(param_devices) > MAX_PARAMETER_DEVICES:
+            raise ValueError("At most {0} devices can be watched for parameter changes".format(
+                MAX_PARAMETER_DEVICES))
+
+        for key in keys - current:
+            if key not in self._bindings:
+                self._bind(key)
+        current.update(keys)
+        self._bind_structure()
+
+        return {
+            "subscribed": self._describe(current),
+            "seq": self._seq,
+            "snapshot": [event for key in keys for event in self._state_events(key)],
+        }
+
+    def unsubscribe(self, client, params):
+        """Remove topics (or, with no params, everything) for *client*."""
+        current = self._clients.get(client, set())
+        if params and (params.get("topics") or params.get("parameters")):
+            current -= self._topic_keys(params)
+        else:
+            current.clear()
+        if not current:
+            self._clients.pop(client, None)
+        self._release_unused()
+        return {"subscribed": self._describe(current)}
+
+    def drop_client(self, client):
+        """Forget a disconnected client and any listeners only it needed."""
+        if self._clients.pop(client, None) is not None:
+            self._release_unused()
+
+    def disconnect(self):
+        """Remove every listener (control surface shutdown)."""
+        self._clients.clear()
+        self._release_unused()
+
+    def stats(self):
+        return {
+            "clients": len(self._clients),
+            "topics": len(self._bindings),
+            "listeners": sum(len(b) for b in self._bindings.values()) + len(self._structure),
+            "seq": self._seq,
+        }
+
+    # ------------------------------------------------------------------
+    # Tick
+    # ------------------------------------------------------------------
+
+    def flush(self):
+        """Push the changes recorded since the last tick to their subscribers."""
+        if not self._clients:
+            return
+        if self._rebind:
+            self._rebind = False
+            self._rebind_indexed()
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        events = []
+        for builder in pending.values():
+            try:
+                event = builder()
+            except Exception as e:
+                # Object deleted between the callback and this tick
+                self._ctrl.log_message("Subscription event skipped: " + str(e))
+                continue
+            if event is not None:
+                events.append(event)
+        if not events:
+            return
+
+        self._seq += 1
+        for client, keys in list(self._clients.items()):
+            mine = [e for e in events if self._event_topic(e) in keys]
+            if mine:
+                self._push(client, {"type": "event", "seq": self._seq, "events": mine})
+
+    def sync(self):
+        """Flush now and send every client the current seq; returns it.
+
+        Returns None when nobody is subscribed.
+        """
+        if not self._clients:
+            return None
+        self.flush()
+        for client in list(self._clients):
+            self._push(client, {"type": "sync", "seq": self._seq})
+        return self._seq
+
+    # ------------------------------------------------------------------
+    # Topic keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _topic_keys(params):
+        params = params or {}
+        keys = set()
+        for topic in params.get("topics") or []:
+            if topic not in TOPICS or topic == "parameters":
+                raise ValueError("Unknown topic '{0}'; expected one of: {1}".format(
+                    topic, ", ".join(t for t in TOPICS if t != "parameters")))
+            keys.add(topic)
+        for entry in params.get("parameters") or []:
+            keys.add(("parameters", entry.get("track_type", "track"),
+                      int(entry.get("track_index", 0)), int(entry.get("device_index", 0))))
+        return keys
+
+    @staticmethod
+    def _describe(keys):
+        topics = sorted(k for k in keys if not isinstance(k, tuple))
+        devices = [{"track_type": k[1], "track_index": k[2], "device_index": k[3]}
+                   for k in sorted(k for k in keys if isinstance(k, tuple))]
+        return {"topics": topics, "parameters": devices}
+
+    @staticmethod
+    def _event_topic(event):
+        topic = event["topic"]
+        if topic == "clip_slot":
+            return "clip_slots"
+        if topic == "parameter":
+            return ("parameters", event["track_type"], event["track_index"], event["device_index"])
+        return topic
+
+    # ------------------------------------------------------------------
+    # Listener bookkeeping
+    # ------------------------------------------------------------------
+
+    def _mark(self, key, builder):
+        self._pending[key] = builder
+
+    def _bind_structure(self):
+        if self._structure:
+            return
+        song = self._ctrl.song()
+
+        def structure_changed():
+            self._rebind = True
+            self._mark(("tracks",), lambda: self._tracks_event(song))
+
+        listen(self._structure, song, "tracks", structure_changed)
+        listen(self._structure, song, "scenes", structure_changed)
+
+    def _bind(self, key):
+        song = self._ctrl.song()
+        bindings = self._bindings.setdefault(key, [])
+        if key == "song":
+            for prop in ("tempo", "is_playing"):
+                listen(bindings, song, prop, self._song_callback(song, prop))
+        elif key == "tracks":
+            renamed = self._tracks_callback(song)
+            for track in song.tracks:
+                listen(bindings, track, "name", renamed)
+        elif key == "clip_slots":
+            for t, track in enumerate(song.tracks):
+                for s, slot in enumerate(track.clip_slots):
+                    listen(bindings, slot, "has_clip", self._slot_callback(slot, t, s))
+        elif key == "devices":
+            for t, track in enumerate(song.tracks):
+                changed = self._devices_callback(track, t)
+                listen(bindings, track, "devices", self._device_list_callback(changed))
+                for device in track.devices:
+                    listen(bindings, device, "name", changed)
+        elif isinstance(key, tuple):
+            _, track_type, t, d = key
+            try:
+                track = get_track(song, t, track_type)
+                device = list(track.devices)[d]
+            except (IndexError, TypeError):
+                # Device no longer exists; the binding stays empty until it does
+                return
+            listen(bindings, track, "devices", self._parameter_devices_callback())
+            for p, param in enumerate(device.parameters):
+                listen(bindings, param, "value", self._param_callback(param, key, p))
+        # Track list changes themselves come from the structure listeners
+
+    def _rebind_indexed(self):
+        """Re-register index-based listeners and resend their state."""
+        for key in list(self._bindings):
+            if key in ("tracks", "clip_slots", "devices") or isinstance(key, tuple):
+                unlisten_all(self._bindings[key])
+                self._bind(key)
+                for event in self._state_events(key):
+                    self._mark(self._event_key(event), lambda e=event: e)
+
+    def _release_unused(self):
+        wanted = set()
+        for keys in self._clients.values():
+            wanted |= keys
+        for key in list(self._bindings):
+            if key not in wanted:
+                unlisten_all(self._bindings.pop(key))
+        if not self._clients:
+            unlisten_all(self._structure)
+            self._pending.clear()
+            self._rebind = False
+
+    # ------------------------------------------------------------------
+    # Callbacks (record only; values are read at flush time)
+    # ------------------------------------------------------------------
+
+    def _song_callback(self, song, prop):
+        def changed():
+            self._mark(("song", prop), lambda: self._song_event(song, prop))
+        return changed
+
+    def _tracks_callback(self, song):
+        def changed():
+            self._mark(("tracks",), lambda: self._tracks_event(song))
+        return changed
+
+    def _slot_callback(self, slot, t, s):
+        def changed():
+            self._mark(("clip_slot", t, s), lambda: self._slot_event(slot, t, s))
+        return changed
+
+    def _devices_callback(self, track, t):
+        def changed():
+            self._mark(("devices", t), lambda: self._devices_event(track, t))
+        return changed
+
+    def _device_list_callback(self, changed):
+        def list_changed():
+            # New devices need their own name listeners
+            self._rebind = True
+            changed()
+        return list_changed
+
+    def _parameter_devices_callback(self):
+        def changed():
+            # Device indices on this track moved; parameter listeners follow
+            self._rebind = True
+        return changed
+
+    def _param_callback(self, param, key, p):
+        def changed():
+            self._mark(("parameter",) + key[1:] + (p,), lambda: self._param_event(param, key, p))
+        return changed
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _event_key(event):
+        topic = event["topic"]
+        if topic == "song":
+            return ("song", event["property"])
+        if topic == "clip_slot":
+            return ("clip_slot", event["track_index"], event["slot_index"])
+        if topic == "devices":
+            return ("devices", event["track_index"])
+        if topic == "parameter":
+            return ("parameter", event["track_type"], event["track_index"],
+                    event["device_index"], event["parameter_index"])
+        return (topic,)
+
+    def _state_events(self, key):
+        """Current state of *key* as a list of events."""
+        song = self._ctrl.song()
+        if key == "song":
+            return [self._song_event(song, "tempo"), self._song_event(song, "is_playing")]
+        if key == "tracks":
+            return [self._tracks_event(song)]
+        if key == "clip_slots":
+            return [self._slot_event(slot, t, s)
+                    for t, track in enumerate(song.tracks)
+                    for s, slot in enumerate(track.clip_slots)]
+        if key == "devices":
+            return [self._devices_event(track, t) for t, track in enumerate(song.tracks)]
+        _, track_type, t, d = key
+        try:
+            device = list(get_track(song, t, track_type).devices)[d]
+        except (IndexError, TypeError):
+            return []
+        return [self._param_event(param, key, p) for p, param in enumerate(device.parameters)]
+
+    @staticmethod
+    def _song_event(song, prop):
+        return {"topic": "song", "property": prop, "value": getattr(song, prop)}
+
+    @staticmethod
+    def _tracks_event(song):
+        return {"topic": "tracks",
+                "tracks": [{"index": i, "name": track.name} for i, track in enumerate(song.tracks)]}
+
+    @staticmethod
+    def _slot_event(slot, t, s):
+        return {"topic": "clip_slot", "track_index": t, "slot_index": s, "has_clip": slot.has_clip}
+
+    def _devices_event(self, track, t):
+        return {"topic": "devices", "track_index": t,
+                "devices": [device_summary(i, device, self._ctrl)
+                            for i, device in enumerate(track.devices)]}
+
+    @staticmethod
+    def _param_event(param, key, p):
+        return {"topic": "parameter", "track_type": key[1], "track_index": key[2],
+                "device_index": key[3], "parameter_index": p,
+                "name": param.name, "value": param.value}
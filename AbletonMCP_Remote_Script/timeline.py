@@ -0,0 +1,227 @@
+"""Cue lists of timed commands played back by the Remote Script.
+
+A timeline is uploaded once -- clip and scene launches, parameter, volume
+and tempo changes keyed by beat -- and executed from the control-surface
+tick while the transport runs, so the MCP server never has to drive
+real-time timing over TCP.
+
+Events are kept sorted by beat and each tick fires the half-open window
+``(cursor, horizon]`` found by bisection, so a tick only touches events
+that are due.  ``horizon`` looks half a tick ahead, as in the scheduler,
+so events fire on the tick nearest their beat.
+
+The cursor follows the transport: a loop wrap fires the rest of the loop
+and continues from ``loop_start``; any other jump (``set_song_time``, a
+click in the arrangement) moves the cursor without firing the skipped
+events; stopping the transport or pausing the timeline fires nothing,
+and resuming continues from the current song position.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import bisect
+
+from .scheduler import MAX_TICK_ADVANCE, next_boundary
+
+MAX_TIMELINES = 16
+MAX_EVENTS = 4096
+
+# Half-open windows include events exactly on their lower bound
+_EPSILON = 1e-6
+
+
+class Timeline(object):
+    """One uploaded cue list and its playback cursor."""
+
+    def __init__(self, timeline_id, name, events):
+        self.id = timeline_id
+        self.name = name
+        # (beat, index, type, params), sorted; `beats` is the bisect index
+        self.events = events
+        self.beats = [event[0] for event in events]
+        self.paused = False
+        self.cursor = None
+        self.fired = 0
+        self.failed = 0
+        self._abs_lateness_ms = 0.0
+        self._max_lateness_ms = 0.0
+
+    def due(self, lo, hi):
+        """Events with lo < beat <= hi."""
+        start = bisect.bisect_right(self.beats, lo)
+        end = bisect.bisect_right(self.beats, hi)
+        return self.events[start:end]
+
+    def record(self, lateness_ms, ok):
+        if ok:
+            self.fired += 1
+            self._abs_lateness_ms += abs(lateness_ms)
+            self._max_lateness_ms = max(self._max_lateness_ms, abs(lateness_ms))
+        else:
+            self.failed += 1
+
+    def describe(self, now):
+        upcoming = bisect.bisect_right(self.beats, now if self.cursor is None else self.cursor)
+        return {
+            "timeline_id": self.id,
+            "name": self.name,
+            "event_count": len(self.events),
+            "first_beat": self.beats[0],
+            "last_beat": self.beats[-1],
+            "paused": self.paused,
+            "next_beat": self.beats[upcoming] if upcoming < len(self.beats) else None,
+            "fired": self.fired,
+            "failed": self.failed,
+            "mean_abs_lateness_ms": round(self._abs_lateness_ms / self.fired, 2) if self.fired else None,
+            "max_abs_lateness_ms": round(self._max_lateness_ms, 2),
+        }
+
+
+class TimelinePlayer(object):
+    """Plays every loaded Timeline against the song position; main thread only.
+
+    *execute* runs an event as ``execute(command_type, params)``; only
+    types in *allowed* may appear in a timeline.
+    """
+
+    def __init__(self, ctrl, execute, allowed):
+        self._ctrl = ctrl
+        self._execute = execute
+        self._allowed = allowed
+        self._timelines = {}
+        self._next_id = 1
+        self._last_time = None
+        self._tick_advance = 0.0
+
+    def load(self, song, params):
+        events = params.get("events")
+        if not isinstance(events, list) or not events:
+            raise ValueError("load_timeline requires a non-empty 'events' list")
+        if len(events) > MAX_EVENTS:
+            raise ValueError("A timeline holds at most {0} events, got {1}".format(
+                MAX_EVENTS, len(events)))
+        if len(self._timelines) >= MAX_TIMELINES:
+            raise ValueError("At most {0} timelines can be loaded".format(MAX_TIMELINES))
+
+        if params.get("quantize"):
+            offset = next_boundary(song, params["quantize"], float(song.current_song_time))
+        else:
+            offset = float(params.get("start_beat", 0.0))
+
+        parsed = []
+        for i, entry in enumerate(events):
+            if not isinstance(entry, dict):
+                raise ValueError("Timeline event {0} must be an object with 'beat', 'type' and 'params'".format(i))
+            entry_type = entry.get("type", "")
+            if entry_type not in self._allowed:
+                raise ValueError("Timeline event {0}: command '{1}' cannot be scheduled".format(i, entry_type))
+            entry_params = entry.get("params", {})
+            if not isinstance(entry_params, dict):
+                raise ValueError("Timeline event {0}: 'params' must be an object".format(i))
+            try:
+                beat = float(entry["beat"]) + offset
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("Timeline event {0}: 'beat' must be a number".format(i))
+            parsed.append((beat, i, entry_type, entry_params))
+        # Events on the same beat keep their upload order
+        parsed.sort(key=lambda event: (event[0], event[1]))
+
+        timeline = Timeline(self._next_id, params.get("name") or "Timeline {0}".format(self._next_id), parsed)
+        timeline.paused = bool(params.get("paused", False))
+        self._next_id += 1
+        self._timelines[timeline.id] = timeline
+        return timeline.describe(float(song.current_song_time))
+
+    def control(self, song, params):
+        """Pause, resume or remove one timeline (or all when no id is given)."""
+        action = params.get("action", "")
+        if action not in ("pause", "resume", "remove"):
+            raise ValueError("action must be 'pause', 'resume' or 'remove'")
+        timeline_id = params.get("timeline_id")
+        if timeline_id is None:
+            targets = list(self._timelines.values())
+        else:
+            try:
+                targets = [self._timelines[int(timeline_id)]]
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("No timeline with id {0}".format(timeline_id))
+        for timeline in targets:
+            if action == "remove":
+                del self._timelines[timeline.id]
+            else:
+                timeline.paused = action == "pause"
+                # Resuming continues from wherever the song is now
+                timeline.cursor = None
+        return {"action": action, "timelines": [t.id for t in targets],
+                "loaded": len(self._timelines)}
+
+    def describe(self, song):
+        now = float(song.current_song_time)
+        return {
+            "current_beat": round(now, 6),
+            "is_playing": bool(song.is_playing),
+            "timelines": [t.describe(now) for _, t in sorted(self._timelines.items())],
+        }
+
+    def tick(self):
+        if not self._timelines:
+            self._last_time = None
+            return
+        song = self._ctrl.song()
+        if not song.is_playing:
+            self._last_time = None
+            for timeline in self._timelines.values():
+                timeline.cursor = None
+            return
+
+        now = float(song.current_song_time)
+        last = self._last_time
+        self._last_time = now
+        if last is not None and 0 < now - last < MAX_TICK_ADVANCE:
+            self._tick_advance = now - last
+
+        looping = bool(song.loop)
+        loop_start = float(song.loop_start)
+        loop_end = loop_start + float(song.loop_length)
+        wrapped = (last is not None and looping and now < last
+                   and last >= loop_end - MAX_TICK_ADVANCE and now < loop_start + MAX_TICK_ADVANCE)
+        jumped = last is not None and not wrapped and not (0 <= now - last < MAX_TICK_ADVANCE)
+
+        horizon = now + self._tick_advance / 2.0
+        if looping and now < loop_end:
+            # Never look past the loop end; the wrap picks those events up
+            horizon = min(horizon, loop_end - _EPSILON)
+
+        for timeline in list(self._timelines.values()):
+            if timeline.paused:
+                continue
+            windows = []
+            if timeline.cursor is None or jumped:
+                timeline.cursor = now - _EPSILON
+            elif wrapped:
+                windows.append((timeline.cursor, loop_end - _EPSILON))
+                timeline.cursor = loop_start - _EPSILON
+            windows.append((timeline.cursor, horizon))
+            timeline.cursor = max(timeline.cursor, horizon)
+            for lo, hi in windows:
+                if hi > lo:
+                    for event in timeline.due(lo, hi):
+                        self._fire(song, timeline, event, now, loop_end - loop_start if wrapped else 0.0)
+
+    def _fire(self, song, timeline, event, now, wrap_length):
+        beat, index, entry_type, entry_params = event
+        lateness = now - beat
+        if lateness < -MAX_TICK_ADVANCE:
+            # Fired after a loop wrap: measure against the wrapped position
+            lateness += wrap_length
+        lateness_ms = lateness * 60000.0 / song.tempo
+        try:
+            self._execute(entry_type, entry_params)
+            timeline.record(lateness_ms, True)
+        except Exception as e:
+            self._ctrl.log_message("Timeline {0} event {1} ({2}) failed: {3}".format(
+                timeline.id, index, entry_type, e))
+            timeline.record(lateness_ms, False)
+
+    def disconnect(self):
+        self._timelines.clear()
@@ -0,0 +1,122 @@
+"""Track identity -> index map and group hierarchy.
+
+Live tracks don't know their own index, so finding a group track's index
+(or the selected track's) meant scanning ``song.tracks`` and comparing
+every entry -- O(n) per lookup and O(n^2) for anything that walks every
+track.  TrackIndexMap builds the identity map and the group tree in one
+linear pass and keeps them until ``song.tracks`` changes (tracks added,
+deleted, moved, grouped or ungrouped all fire that listener).
+
+Main thread only.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+from .subscriptions import listen, unlisten_all
+
+
+def track_key(track):
+    """Hashable identity of a Live track, stable across wrapper objects."""
+    return getattr(track, "_live_ptr", None) or track
+
+
+class TrackIndexMap(object):
+    """Lazily rebuilt index and parent tables for ``song.tracks``."""
+
+    def __init__(self):
+        self._bindings = []
+        self._song = None
+        self._valid = False
+        self._index = {}
+        self._tracks = []
+        self._parents = []
+        self.builds = 0
+
+    def _invalidate(self):
+        self._valid = False
+
+    def _ensure(self, song):
+        if self._valid and song is self._song:
+            return
+        if song is not self._song:
+            # First use, or the set was replaced (File > New)
+            unlisten_all(self._bindings)
+            listen(self._bindings, song, "tracks", self._invalidate)
+            self._song = song
+        tracks = list(song.tracks)
+        index = dict((track_key(track), i) for i, track in enumerate(tracks))
+        parents = []
+        for track in tracks:
+            parent = None
+            try:
+                if track.is_grouped:
+                    parent = index.get(track_key(track.group_track))
+            except Exception:
+                pass
+            parents.append(parent)
+        self._tracks = tracks
+        self._index = index
+        self._parents = parents
+        self._valid = True
+        self.builds += 1
+
+    def index_of(self, song, track):
+        """Index of *track* in ``song.tracks``, or None (return/master tracks)."""
+        if track is None:
+            return None
+        self._ensure(song)
+        return self._index.get(track_key(track))
+
+    def group_index(self, song, track_index):
+        """Index of the group track containing track *track_index*, or None."""
+        self._ensure(song)
+        if 0 <= track_index < len(self._parents):
+            return self._parents[track_index]
+        return None
+
+    def hierarchy(self, song):
+        """The full group tree of ``song.tracks``, built in one pass.
+
+        Group tracks always precede their members, so every parent node
+        exists by the time its children are reached.
+        """
+        self._ensure(song)
+        nodes = []
+        roots = []
+        groups = 0
+        for i, track in enumerate(self._tracks):
+            node = {"index": i, "name": track.name}
+            try:
+                is_group = track.is_foldable
+            except Exception:
+                is_group = False
+            if is_group:
+                groups += 1
+                node["is_group_track"] = True
+                try:
+                    node["folded"] = bool(track.fold_state)
+                except Exception:
+                    pass
+                node["children"] = []
+            parent = self._parents[i]
+            if parent is None:
+                node["depth"] = 0
+                roots.append(node)
+            else:
+                parent_node = nodes[parent]
+                node["depth"] = parent_node["depth"] + 1
+                parent_node.setdefault("children", []).append(node)
+            nodes.append(node)
+        return {"tree": roots, "count": len(nodes), "group_count": groups,
+                "parents": list(self._parents)}
+
+    def stats(self):
+        return {"valid": self._valid, "tracks": len(self._tracks), "builds": self.builds}
+
+    def disconnect(self):
+        unlisten_all(self._bindings)
+        self._song = None
+        self._valid = False
+        self._index = {}
+        self._tracks = []
+        self._parents = []
@@ -58,6 +58,14 @@ function anything() {
             handleGetHiddenParams(args);
             break;
 
+        case "get_param_values":
+            handleGetParamValues(args);
+            break;
+
+        case "read_param_values":
+            handleReadParamValues(args);
+            break;
+
         case "set_hidden_param":
             handleSetHiddenParam(args);
             break;
@@ -66,10 +74,18 @@ function anything() {
             handleBatchSetHiddenParams(args);
             break;
 
+        case "set_hidden_params":
+            handleSetHiddenParams(args);
+            break;
+
         case "check_dashboard":
             handleCheckDashboard(args);
             break;
 
+        case "chunk_status":
+            handleChunkStatus(args);
+            break;
+
         // --- Phase 2: Device Chain Navigation ---
         case "discover_chains":
             handleDiscoverChains(args);
@@ -235,14 +251,22 @@ function anything() {
 // ---------------------------------------------------------------------------
 
 function handlePing(args) {
-    // args: [request_id (string)]
+    // args: [request_id (string), client features (string, optional)]
     var requestId = (args.length > 0) ? args[0].toString() : "";
+    // Servers that can reassemble binary frames say so in every ping;
+    // anything else (older servers) gets base64 JSON chunks
+    _clientFrames = (args.length > 1 && args[1].toString().indexOf("frames") !== -1 && _f64 !== null);
     var response = {
         status: "success",
-        result: { m4l_bridge: true, version: "3.6.0" },
+        result: {
+            m4l_bridge: true,
+            version: "3.6.0",
+            capabilities: ["set_hidden_params", "frames", "get_param_values", "read_param_values"],
+            chunk_delay_ms: _responseChunkDelay
+        },
         id: requestId
     };
-    sendResponse(JSON.stringify(response));
+    sendResponse(JSON.stringify(response), requestId);
 }
 
 // ---------------------------------------------------------------------------
@@ -404,11 +428,13 @@ function handleSetHiddenParam(args) {
 // 30 params × 7 get() calls = ~210 calls.
 //
 // Solution: process params in small chunks with deferred callbacks between
-// them, same pattern as batch_set_hidden_params.
+// them, same pattern as batch_set_hidden_params.  One device is discovered
+// at a time; further requests queue behind it rather than failing.
 // ---------------------------------------------------------------------------
 var DISCOVER_CHUNK_SIZE = 4;    // params per chunk (4 × 7 gets = 28 — well under limit)
 var DISCOVER_CHUNK_DELAY = 50;  // ms between chunks
 
+var _discoverQueue = [];
 var _discoverState = null;
 
 function _startChunkedDiscover(trackIdx, deviceIdx, requestId) {
@@ -417,15 +443,24 @@ function _startChunkedDiscover(trackIdx, deviceIdx, requestId) {
 }
 
 function _startChunkedDiscoverAtPath(devicePath, requestId) {
-    if (_discoverState) {
-        sendError("Discovery busy - try again shortly", requestId);
-        return;
+    _discoverQueue.push({ devicePath: devicePath, requestId: requestId });
+    if (!_discoverState) {
+        _startNextDiscover();
     }
+}
+
+function _startNextDiscover() {
+    _discoverState = null;
+    if (_discoverQueue.length === 0) return;
+    var job = _discoverQueue.shift();
+    var devicePath = job.devicePath;
+    var requestId = job.requestId;
 
     var cursor = new LiveAPI(null, devicePath);
 
     if (!cursor || !cursor.id || parseInt(cursor.id) === 0) {
         sendError("No device found at path: " + devicePath, requestId);
+        _startNextDiscover();
         return;
     }
 
@@ -472,13 +507,18 @@ function _discoverNextChunk() {
             // All chunks done — clean up cursor and send response
             s.cursor.goto(s.devicePath);
 
-            sendResult({
-                device_name:     s.deviceName,
-                device_class:    s.deviceClass,
-                parameter_count: s.parameters.length,
-                parameters:      s.parameters
-            }, s.requestId);
-            _discoverState = null;
+            if (_canFrame(s.requestId)) {
+                sendFramedResponse(FRAME_PARAM_TABLE,
+                    _packParamTable(s.deviceName, s.deviceClass, s.parameters), s.requestId);
+            } else {
+                sendResult({
+                    device_name:     s.deviceName,
+                    device_class:    s.deviceClass,
+                    parameter_count: s.parameters.length,
+                    parameters:      s.parameters
+                }, s.requestId);
+            }
+            _startNextDiscover();
         } else {
             // Schedule the next chunk after a short delay
             var t = new Task(_discoverNextChunk);
@@ -489,6 +529,217 @@ function _discoverNextChunk() {
         try { s.cursor.goto(s.devicePath); } catch (ignore) {}
         _discoverState = null;
         sendError("Discovery failed at param " + s.idx + ": " + safeErrorMessage(e), rid);
+        _startNextDiscover();
+    }
+}
+
+// ---------------------------------------------------------------------------
+// Values-only read
+//
+// Parameter names, ranges and value items are the same for every instance
+// of a built-in device, so the server caches those layouts and asks only
+// for the current values: one get() per parameter instead of seven, so far
+// bigger chunks stay under the limit above.  Requests queue rather than
+// failing with "busy".
+//
+// get_param_values reads one device.  read_param_values reads a list of
+// devices into one response and stamps it with a token; given the token
+// of an earlier read, a device whose values were last returned under that
+// token comes back as only the [index, value] pairs that changed.
+// ---------------------------------------------------------------------------
+var VALUES_CHUNK_SIZE = 24;   // gets per chunk, across devices
+
+var _valuesQueue = [];
+var _valuesState = null;
+var _valuesToken = 0;
+var _valueSnapshots = {};     // device path -> last values returned by read_param_values
+
+function handleGetParamValues(args) {
+    // args: [track_index (int), device_index (int), request_id (string)]
+    if (args.length < 3) {
+        sendError("get_param_values requires track_index, device_index, request_id", "");
+        return;
+    }
+    _queueValuesRead([[parseInt(args[0]), parseInt(args[1])]], 0, args[2].toString(), true);
+}
+
+function handleReadParamValues(args) {
+    // args: [since_token (int), (track_index (int), device_index (int))..., request_id (string)]
+    var requestId = (args.length > 0) ? args[args.length - 1].toString() : "";
+    if (args.length < 4 || (args.length - 2) % 2 !== 0) {
+        sendError("read_param_values requires since_token, (track_index, device_index) pairs, request_id", requestId);
+        return;
+    }
+    var devices = [];
+    for (var a = 1; a < args.length - 1; a += 2) {
+        devices.push([parseInt(args[a]), parseInt(args[a + 1])]);
+    }
+    _queueValuesRead(devices, parseInt(args[0]), requestId, false);
+}
+
+function _queueValuesRead(devices, since, requestId, single) {
+    var job = { devices: [], since: since, requestId: requestId, single: single };
+    for (var i = 0; i < devices.length; i++) {
+        job.devices.push({
+            trackIdx:  devices[i][0],
+            deviceIdx: devices[i][1],
+            path:      "live_set tracks " + devices[i][0] + " devices " + devices[i][1],
+            values:    null,
+            error:     null
+        });
+    }
+    _valuesQueue.push(job);
+    if (!_valuesState) {
+        _startNextValuesRead();
+    }
+}
+
+function _startNextValuesRead() {
+    _valuesState = null;
+    if (_valuesQueue.length === 0) return;
+    var job = _valuesQueue.shift();
+    job.cursor = new LiveAPI(null, "live_set");
+    job.dev = 0;
+    _valuesState = job;
+    // Deferred, like discovery: never read synchronously from the OSC callback
+    var t = new Task(_valuesNextChunk);
+    t.schedule(0);
+}
+
+function _valuesNextChunk() {
+    var s = _valuesState;
+    if (!s) return;
+
+    try {
+        var budget = VALUES_CHUNK_SIZE;
+        while (budget > 0 && s.dev < s.devices.length) {
+            var d = s.devices[s.dev];
+            if (d.values === null) {
+                s.cursor.goto(d.path);
+                if (!s.cursor.id || parseInt(s.cursor.id) === 0) {
+                    d.error = "No device found at track " + d.trackIdx + " device " + d.deviceIdx;
+                    s.dev++;
+                    continue;
+                }
+                d.deviceName  = s.cursor.get("name").toString();
+                d.deviceClass = s.cursor.get("class_name").toString();
+                d.paramCount  = parseInt(s.cursor.getcount("parameters"));
+                d.values      = [];
+                budget -= 3;
+                continue;
+            }
+            if (d.values.length >= d.paramCount) {
+                s.dev++;
+                continue;
+            }
+            s.cursor.goto(d.path + " parameters " + d.values.length);
+            var value = NaN;
+            if (s.cursor.id && parseInt(s.cursor.id) !== 0) {
+                try { value = parseFloat(s.cursor.get("value")); } catch (e) {}
+            }
+            d.values.push(value);
+            budget--;
+        }
+
+        if (s.dev < s.devices.length) {
+            var t = new Task(_valuesNextChunk);
+            t.schedule(DISCOVER_CHUNK_DELAY);
+            return;
+        }
+        s.cursor.goto("live_set");
+        if (s.single) {
+            _sendDeviceValues(s.devices[0], s.requestId);
+        } else {
+            _sendValueReadResult(s);
+        }
+    } catch (e) {
+        try { s.cursor.goto("live_set"); } catch (ignore) {}
+        sendError("Value read failed: " + safeErrorMessage(e), s.requestId);
+    }
+    _startNextValuesRead();
+}
+
+function _sendDeviceValues(d, requestId) {
+    if (d.error) {
+        sendError(d.error, requestId);
+    } else if (_canFrame(requestId)) {
+        var body = _str16(d.deviceName) + _str16(d.deviceClass) + _u16(d.values.length);
+        for (var v = 0; v < d.values.length; v++) {
+            body += _f64le(d.values[v]);
+        }
+        sendFramedResponse(FRAME_VALUE_TABLE, body, requestId);
+    } else {
+        // NaN (unreadable parameter) becomes null in JSON
+        sendResult({
+            device_name:     d.deviceName,
+            device_class:    d.deviceClass,
+            parameter_count: d.values.length,
+            values:          d.values
+        }, requestId);
+    }
+}
+
+function _sameValue(a, b) {
+    return a === b || (a !== a && b !== b);  // NaN equals NaN here
+}
+
+function _sendValueReadResult(s) {
+    // Frame format 3: [token u32][device count u16], then per device
+    // [track u16][device u16][kind u8] followed by
+    //   kind 0 (all values): [name str16][class str16][count u16][count x f64]
+    //   kind 1 (changed):    the same header, [n u16][n x (index u16, f64)]
+    //   kind 2 (error):      [message str16]
+    var token = ++_valuesToken;
+    var framed = _canFrame(s.requestId);
+    var body = _u32(token) + _u16(s.devices.length);
+    var entries = [];
+
+    for (var i = 0; i < s.devices.length; i++) {
+        var d = s.devices[i];
+        var entry = { track_index: d.trackIdx, device_index: d.deviceIdx };
+        body += _u16(d.trackIdx) + _u16(d.deviceIdx);
+        if (d.error) {
+            entry.error = d.error;
+            body += String.fromCharCode(2) + _str16(d.error);
+            entries.push(entry);
+            continue;
+        }
+        entry.device_name     = d.deviceName;
+        entry.device_class    = d.deviceClass;
+        entry.parameter_count = d.values.length;
+
+        var base = _valueSnapshots[d.path];
+        var changed = null;
+        if (s.since > 0 && base && base.token === s.since
+                && base.deviceClass === d.deviceClass && base.values.length === d.values.length) {
+            changed = [];
+            for (var p = 0; p < d.values.length; p++) {
+                if (!_sameValue(base.values[p], d.values[p])) changed.push([p, d.values[p]]);
+            }
+        }
+        _valueSnapshots[d.path] = { token: token, deviceClass: d.deviceClass, values: d.values };
+
+        var header = _str16(d.deviceName) + _str16(d.deviceClass) + _u16(d.values.length);
+        if (changed !== null) {
+            entry.changed = changed;
+            body += String.fromCharCode(1) + header + _u16(changed.length);
+            for (var c = 0; c < changed.length; c++) {
+                body += _u16(changed[c][0]) + _f64le(changed[c][1]);
+            }
+        } else {
+            entry.values = d.values;
+            body += String.fromCharCode(0) + header;
+            for (var v = 0; v < d.values.length; v++) {
+                body += _f64le(d.values[v]);
+            }
+        }
+        entries.push(entry);
+    }
+
+    if (framed) {
+        sendFramedResponse(FRAME_VALUE_READ, body, s.requestId);
+    } else {
+        sendResult({ token: token, since_token: s.since, devices: entries }, s.requestId);
     }
 }
 
@@ -669,6 +920,107 @@ function _batchProcessNextChunk() {
     }
 }
 
+// ---------------------------------------------------------------------------
+// Typed batch parameter writes
+//
+// /set_hidden_params carries its parameters as typed OSC arguments, so
+// there is no base64 JSON symbol for Max to split or mangle:
+//   [track_index (int), device_index (int),
+//    parameter_index (int), value (float), ..., request_id (string)]
+//
+// Writes run BATCH_CHUNK_SIZE at a time like batch_set_hidden_params, but
+// batches queue behind each other instead of failing with "busy", and the
+// reply acknowledges every parameter: "acks" holds [index, value written]
+// pairs and "errors" the parameters that could not be set.
+// ---------------------------------------------------------------------------
+var _paramWriteQueue = [];
+var _paramWriteState = null;
+
+function handleSetHiddenParams(args) {
+    var requestId = (args.length > 0) ? args[args.length - 1].toString() : "";
+    if (args.length < 5 || (args.length - 3) % 2 !== 0) {
+        sendError("set_hidden_params requires track_index, device_index, (parameter_index, value) pairs, request_id", requestId);
+        return;
+    }
+    var job = {
+        trackIdx:  parseInt(args[0]),
+        deviceIdx: parseInt(args[1]),
+        writes:    [],
+        requestId: requestId
+    };
+    for (var a = 2; a < args.length - 1; a += 2) {
+        job.writes.push([parseInt(args[a]), parseFloat(args[a + 1])]);
+    }
+    _paramWriteQueue.push(job);
+    if (!_paramWriteState) {
+        _startNextParamWrite(false);
+    }
+}
+
+function _startNextParamWrite(deferred) {
+    _paramWriteState = null;
+    while (_paramWriteQueue.length > 0) {
+        var job = _paramWriteQueue.shift();
+        job.devicePath = "live_set tracks " + job.trackIdx + " devices " + job.deviceIdx;
+        job.paramCursor = new LiveAPI(null, job.devicePath);
+        if (!_validateApi(job.paramCursor, job.requestId,
+                "No device found at track " + job.trackIdx + " device " + job.deviceIdx)) continue;
+        job.cursor = 0;
+        job.acks   = [];
+        job.errors = [];
+        _paramWriteState = job;
+        if (deferred) {
+            // Give Live a breather between back-to-back batches
+            var t = new Task(_paramWriteNextChunk);
+            t.schedule(BATCH_CHUNK_DELAY);
+        } else {
+            _paramWriteNextChunk();
+        }
+        return;
+    }
+}
+
+function _paramWriteNextChunk() {
+    var s = _paramWriteState;
+    if (!s) return;
+
+    try {
+        var end = Math.min(s.cursor + BATCH_CHUNK_SIZE, s.writes.length);
+        for (var i = s.cursor; i < end; i++) {
+            var paramIdx = s.writes[i][0];
+            try {
+                s.paramCursor.goto(s.devicePath + " parameters " + paramIdx);
+                if (!s.paramCursor.id || parseInt(s.paramCursor.id) === 0) {
+                    s.errors.push({ index: paramIdx, error: "not found" });
+                    continue;
+                }
+                var minVal  = parseFloat(s.paramCursor.get("min"));
+                var maxVal  = parseFloat(s.paramCursor.get("max"));
+                var clamped = Math.max(minVal, Math.min(maxVal, s.writes[i][1]));
+                s.paramCursor.set("value", clamped);
+                s.acks.push([paramIdx, clamped]);
+            } catch (e) {
+                s.errors.push({ index: paramIdx, error: safeErrorMessage(e) });
+            }
+        }
+        s.cursor = end;
+
+        if (s.cursor < s.writes.length) {
+            var t = new Task(_paramWriteNextChunk);
+            t.schedule(BATCH_CHUNK_DELAY);
+            return;
+        }
+        var result = { acks: s.acks };
+        if (s.errors.length > 0) {
+            result.errors = s.errors;
+        }
+        sendResult(result, s.requestId);
+    } catch (e) {
+        sendError("Parameter batch failed at cursor " + s.cursor + ": " + safeErrorMessage(e), s.requestId);
+    }
+    _startNextParamWrite(true);
+}
+
 function handleCheckDashboard(args) {
     var requestId = (args.length > 0) ? args[0].toString() : "";
     var response = {
@@ -680,7 +1032,7 @@ function handleCheckDashboard(args) {
         },
         id: requestId
     };
-    sendResponse(JSON.stringify(response));
+    sendResponse(JSON.stringify(response), requestId);
 }
 
 // ---------------------------------------------------------------------------
@@ -2249,7 +2601,7 @@ function sendResult(result, requestId) {
         result: result,
         id: requestId
     };
-    sendResponse(JSON.stringify(response));
+    sendResponse(JSON.stringify(response), requestId);
 }
 
 function safeErrorMessage(e) {
@@ -2267,7 +2619,7 @@ function sendError(message, requestId) {
         message: message,
         id: requestId
     };
-    sendResponse(JSON.stringify(response));
+    sendResponse(JSON.stringify(response), requestId);
 }
 
 // ---------------------------------------------------------------------------
@@ -2295,45 +2647,135 @@ function sendError(message, requestId) {
 //   - .replace() for URL-safe conversion is O(n) native, not O(n^2) loop
 //   - Each operation works on ≤ ~3.6KB strings — no memory pressure
 //   - First chunk is deferred (not synchronous from discovery callback)
+//
+// Frames (servers whose ping declares "frames"):
+//   Each chunk is one binary frame, base64'd once instead of twice:
+//     [0xB1][format][index u16][total u16][id length u8][request id][payload]
+//   format 0 is UTF-8 JSON; format 1 is a packed parameter table (see
+//   _packParamTable), a fraction of the size of its JSON; format 2 is a
+//   value table (name, class, count, then one f64 per parameter); format 3
+//   is a multi-device read_param_values result (see _sendValueReadResult).
+//   The server reports missing frame indices with /chunk_status, and the
+//   recent framed responses are kept so only those frames are resent.  An
+//   empty /chunk_status acknowledges a complete response.  The delay
+//   between outlet() calls backs off on every NACK and shrinks after each
+//   response that needed none.
 // ---------------------------------------------------------------------------
 var RESPONSE_PIECE_SIZE  = 2000;  // chars of RAW JSON per chunk (conservative)
-var RESPONSE_CHUNK_DELAY = 50;    // ms between outlet() calls
+var RESPONSE_FRAME_SIZE  = 2600;  // payload bytes per frame (~3.5KB after base64)
+var RESPONSE_CHUNK_DELAY = 50;    // ms between outlet() calls (initial value)
+var RESPONSE_CHUNK_DELAY_MIN = 10;
+var RESPONSE_CHUNK_DELAY_MAX = 200;
+var RESEND_CACHE_SIZE    = 4;     // framed responses kept for retransmission
+var FRAME_MAGIC          = 0xB1;
+var FRAME_JSON           = 0;
+var FRAME_PARAM_TABLE    = 1;
+var FRAME_VALUE_TABLE    = 2;
+var FRAME_VALUE_READ     = 3;
+
 var _responseSendState   = null;  // global state for deferred chunk sending
 var _responseSendQueue   = [];    // queued responses when send is busy
+var _responseChunkDelay  = RESPONSE_CHUNK_DELAY;
+var _resendCache         = [];    // recent framed responses, oldest first
+var _clientFrames        = false; // the server's last ping declared "frames"
 
 function _toUrlSafe(b64) {
     // O(n) native .replace() — NOT char-by-char concatenation
     return b64.replace(/\+/g, "-").replace(/\//g, "_").replace(/=/g, "");
 }
 
-function sendResponse(jsonStr) {
+function _canFrame(requestId) {
+    return _clientFrames && requestId && requestId.length < 256 && /^[A-Za-z0-9_-]+$/.test(requestId);
+}
+
+function sendResponse(jsonStr, requestId) {
     // If a chunked send is in progress, queue this response (regardless of size)
     if (_responseSendState) {
-        _responseSendQueue.push(jsonStr);
+        _responseSendQueue.push({ jsonStr: jsonStr, requestId: requestId });
         post("sendResponse: queued (send busy), queue depth=" + _responseSendQueue.length + "\n");
         return;
     }
 
     // Small response — encode + send directly (backward compatible)
     if (jsonStr.length <= 1500) {
-        outlet(0, _toUrlSafe(_base64encode(jsonStr)));
+        outlet(0, _toUrlSafe(_base64encode(_utf8(jsonStr))));
         return;
     }
 
-    // Large response — store raw JSON, defer ALL chunk sending via Task
+    if (_canFrame(requestId)) {
+        _startFramedSend(FRAME_JSON, _utf8(jsonStr), requestId);
+        return;
+    }
 
+    // Large response for a server without frames — store raw JSON, defer
+    // ALL chunk sending via Task
     var totalChunks = Math.ceil(jsonStr.length / RESPONSE_PIECE_SIZE);
     post("sendResponse: " + jsonStr.length + " chars JSON -> " + totalChunks + " chunks\n");
-
-    _responseSendState = {
-        jsonStr:     jsonStr,
+    _beginChunkSend({
+        framed:      false,
+        body:        jsonStr,
         totalChunks: totalChunks,
-        idx:         0
+        // Tags every chunk so the server can reassemble per request
+        requestId:   (requestId && /^[A-Za-z0-9_-]+$/.test(requestId)) ? requestId : ""
+    }, null);
+}
+
+function sendFramedResponse(format, body, requestId) {
+    // body: binary string (one byte per char)
+    if (_responseSendState) {
+        _responseSendQueue.push({ format: format, body: body, requestId: requestId });
+        return;
+    }
+    _startFramedSend(format, body, requestId);
+}
+
+function _startFramedSend(format, body, requestId) {
+    var entry = {
+        framed:      true,
+        format:      format,
+        body:        body,
+        totalChunks: Math.max(1, Math.ceil(body.length / RESPONSE_FRAME_SIZE)),
+        requestId:   requestId,
+        nacked:      false
     };
+    _resendCache.push(entry);
+    if (_resendCache.length > RESEND_CACHE_SIZE) {
+        _resendCache.shift();
+    }
+    post("sendResponse: " + body.length + " bytes (format " + format + ") -> " + entry.totalChunks + " frames\n");
+    _beginChunkSend(entry, null);
+}
+
+function _beginChunkSend(entry, indices) {
+    if (!indices) {
+        indices = [];
+        for (var i = 0; i < entry.totalChunks; i++) indices.push(i);
+    }
+    _responseSendState = { entry: entry, indices: indices, pos: 0 };
 
     // DEFER first chunk — don't send synchronously from discovery callback
     var t = new Task(_sendNextResponsePiece);
-    t.schedule(RESPONSE_CHUNK_DELAY);
+    t.schedule(_responseChunkDelay);
+}
+
+function _encodeFrame(entry, idx) {
+    var start = idx * RESPONSE_FRAME_SIZE;
+    return String.fromCharCode(FRAME_MAGIC, entry.format)
+        + _u16(idx) + _u16(entry.totalChunks)
+        + String.fromCharCode(entry.requestId.length) + entry.requestId
+        + entry.body.substring(start, start + RESPONSE_FRAME_SIZE);
+}
+
+function _encodeEnvelope(entry, idx) {
+    // Extract this piece of raw JSON
+    var start = idx * RESPONSE_PIECE_SIZE;
+    var piece = entry.body.substring(start, start + RESPONSE_PIECE_SIZE);
+
+    // Encode piece independently → URL-safe base64 (O(n) via .replace())
+    // pieceB64 is pure [A-Za-z0-9_-] — no escaping needed in the JSON string
+    var pieceB64 = _toUrlSafe(_base64encode(_utf8(piece)));
+    return '{"_c":' + idx + ',"_t":' + entry.totalChunks +
+        (entry.requestId ? ',"_i":"' + entry.requestId + '"' : '') + ',"_d":"' + pieceB64 + '"}';
 }
 
 function _sendNextResponsePiece() {
@@ -2341,19 +2783,9 @@ function _sendNextResponsePiece() {
     var s = _responseSendState;
 
     try {
-        // Extract this piece of raw JSON
-        var start = s.idx * RESPONSE_PIECE_SIZE;
-        var end   = Math.min(start + RESPONSE_PIECE_SIZE, s.jsonStr.length);
-        var piece = s.jsonStr.substring(start, end);
-
-        // Encode piece independently → URL-safe base64 (O(n) via .replace())
-        var pieceB64 = _toUrlSafe(_base64encode(piece));
-
-        // Wrap in chunk envelope, encode envelope, send
-        // pieceB64 is pure [A-Za-z0-9_-] — no escaping needed in the JSON string
-        var envelope = '{"_c":' + s.idx + ',"_t":' + s.totalChunks + ',"_d":"' + pieceB64 + '"}';
-        var envelopeB64 = _toUrlSafe(_base64encode(envelope));
-        outlet(0, envelopeB64);
+        var idx = s.indices[s.pos];
+        var packet = s.entry.framed ? _encodeFrame(s.entry, idx) : _encodeEnvelope(s.entry, idx);
+        outlet(0, _toUrlSafe(_base64encode(packet)));
     } catch (e) {
         post("_sendNextResponsePiece error: " + e.toString() + "\n");
         _responseSendState = null;
@@ -2361,10 +2793,10 @@ function _sendNextResponsePiece() {
         return;
     }
 
-    s.idx++;
-    if (s.idx < s.totalChunks) {
+    s.pos++;
+    if (s.pos < s.indices.length) {
         var t = new Task(_sendNextResponsePiece);
-        t.schedule(RESPONSE_CHUNK_DELAY);
+        t.schedule(_responseChunkDelay);
     } else {
         _responseSendState = null;
         _drainResponseQueue();
@@ -2374,13 +2806,112 @@ function _sendNextResponsePiece() {
 function _drainResponseQueue() {
     while (_responseSendQueue.length > 0) {
         var next = _responseSendQueue.shift();
-        sendResponse(next);
-        // If sendResponse started a chunked send, stop draining —
+        if (next.resend) {
+            _beginChunkSend(next.resend, next.indices);
+        } else if (next.body !== undefined) {
+            _startFramedSend(next.format, next.body, next.requestId);
+        } else {
+            sendResponse(next.jsonStr, next.requestId);
+        }
+        // If a chunked send started, stop draining —
         // the next drain will happen when _sendNextResponsePiece completes
         if (_responseSendState) break;
     }
 }
 
+function handleChunkStatus(args) {
+    // args: [request_id (string), missing frame index (int)...]
+    // No missing indices = the server has the whole response.
+    if (args.length < 1) return;
+    var requestId = args[0].toString();
+    var entry = null;
+    for (var i = 0; i < _resendCache.length; i++) {
+        if (_resendCache[i].requestId === requestId) {
+            entry = _resendCache[i];
+            break;
+        }
+    }
+    if (args.length === 1) {
+        if (entry) {
+            _resendCache.splice(i, 1);
+            if (!entry.nacked) {
+                _responseChunkDelay = Math.max(RESPONSE_CHUNK_DELAY_MIN, Math.floor(_responseChunkDelay * 3 / 4));
+            }
+        }
+        return;
+    }
+    _responseChunkDelay = Math.min(RESPONSE_CHUNK_DELAY_MAX, _responseChunkDelay * 2);
+    if (!entry) {
+        post("chunk_status: response " + requestId + " no longer cached\n");
+        return;
+    }
+    entry.nacked = true;
+    var missing = [];
+    for (var a = 1; a < args.length; a++) {
+        var idx = parseInt(args[a]);
+        if (idx >= 0 && idx < entry.totalChunks) missing.push(idx);
+    }
+    post("chunk_status: resending " + missing.length + " frame(s) of " + requestId
+         + ", delay now " + _responseChunkDelay + "ms\n");
+    if (_responseSendState) {
+        _responseSendQueue.push({ resend: entry, indices: missing });
+    } else {
+        _beginChunkSend(entry, missing);
+    }
+}
+
+// ---------------------------------------------------------------------------
+// Binary packing for frames (one byte per char, like _base64encode expects)
+// ---------------------------------------------------------------------------
+var _f64 = null;
+var _f64Bytes = null;
+try {
+    _f64 = new Float64Array(1);
+    _f64Bytes = new Uint8Array(_f64.buffer);
+} catch (e) {}
+
+function _utf8(str) {
+    return unescape(encodeURIComponent(str));
+}
+
+function _u16(n) {
+    return String.fromCharCode((n >> 8) & 255, n & 255);
+}
+
+function _u32(n) {
+    return _u16((n >>> 16) & 65535) + _u16(n & 65535);
+}
+
+function _str16(str) {
+    var bytes = _utf8(str);
+    return _u16(bytes.length) + bytes;
+}
+
+function _f64le(x) {
+    // Native byte order: little-endian on every platform Live runs on
+    _f64[0] = x;
+    var out = "";
+    for (var i = 0; i < 8; i++) out += String.fromCharCode(_f64Bytes[i]);
+    return out;
+}
+
+function _packParamTable(deviceName, deviceClass, parameters) {
+    // [name str16][class str16][count u16] then per parameter:
+    // [index u16][flags u8: 1 quantized, 2 value_items]
+    // [value f64][min f64][max f64][default f64][name str16][value_items str16]?
+    var parts = [_str16(deviceName), _str16(deviceClass), _u16(parameters.length)];
+    for (var i = 0; i < parameters.length; i++) {
+        var p = parameters[i];
+        var hasItems = (p.value_items !== undefined);
+        parts.push(_u16(p.index)
+            + String.fromCharCode((p.is_quantized ? 1 : 0) | (hasItems ? 2 : 0))
+            + _f64le(p.value) + _f64le(p.min) + _f64le(p.max) + _f64le(p.default_value)
+            + _str16(p.name)
+            + (hasItems ? _str16(p.value_items) : ""));
+    }
+    return parts.join("");
+}
+
 // ---------------------------------------------------------------------------
 // Base64 encode — Max's JS engine doesn't have btoa
 // ---------------------------------------------------------------------------
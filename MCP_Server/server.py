@@ -15,14 +15,177 @@ import os
 import gzip
 import threading
 import functools
-from collections import deque
+import itertools
+import copy
+from collections import deque, OrderedDict
 from datetime import datetime, timezone
 
+from MCP_Server.wire import CODECS, JsonCodec, WIRE_FORMAT_JSON, WIRE_FORMAT_MSGPACK
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("AbletonMCP-Beta")
 
+# Post-command pause for Remote Scripts that predate "settled" responses
+_LEGACY_SETTLE_DELAY = 0.1
+
+# Encoding requested from the Remote Script on connect ("json" disables the
+# binary format); Remote Scripts that don't support it keep using JSON
+WIRE_FORMAT = os.environ.get("ABLETON_MCP_WIRE_FORMAT", WIRE_FORMAT_MSGPACK)
+
+# Seconds a cached read-only result stays valid.  Writes sent through this
+# server invalidate entries immediately; the TTL only bounds how long an
+# edit made directly in Live's UI can go unnoticed.  0 disables the cache.
+RESULT_CACHE_TTL = float(os.environ.get("ABLETON_MCP_CACHE_TTL", "2.0"))
+RESULT_CACHE_MAX_ENTRIES = 256
+
+
+class ResultCache:
+    """Short-lived cache of read-only command results, invalidated by writes.
+
+    Entries are keyed by command and params.  Each write drops the entries
+    it could have changed: session-wide reads (session info, all tracks,
+    scenes) on any write, get_track_info for the touched track, and
+    get_device_parameters for the touched device.  Writes that shift track
+    or scene indices, or that don't name a track, clear everything.
+    """
+
+    CACHEABLE = frozenset([
+        "get_session_info", "get_track_info", "get_all_tracks_info",
+        "get_device_parameters", "get_scenes",
+    ])
+
+    # Reads that reflect the whole set, dropped on every write
+    _GLOBAL_READS = frozenset(["get_session_info", "get_all_tracks_info", "get_scenes"])
+
+    # Writes that renumber tracks or scenes
+    _STRUCTURAL_WRITES = frozenset([
+        "create_midi_track", "create_audio_track", "create_return_track",
+        "delete_track", "duplicate_track", "group_tracks", "set_track_fold",
+        "create_midi_track_with_simpler", "audio_to_midi",
+        "create_scene", "delete_scene", "duplicate_scene",
+        "undo", "redo",
+    ])
+
+    # Writes that add, remove or reorder devices on their track
+    _DEVICE_LIST_WRITES = frozenset([
+        "insert_device", "delete_device", "load_instrument_or_effect",
+        "load_browser_item", "load_sample", "load_drum_kit",
+        "sliced_simpler_to_drum_rack", "copy_drum_pad",
+    ])
+
+    # Name prefixes of commands that never modify the set
+    _READ_PREFIXES = ("get_", "search_", "list_", "analyze_")
+
+    def __init__(self, ttl: float = RESULT_CACHE_TTL, max_entries: int = RESULT_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # key -> (stored_at, result, params)
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so a read that raced a write is not stored
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.expirations = 0
+
+    def key(self, command_type: str, params: Optional[Dict[str, Any]]) -> Optional[tuple]:
+        """Cache key for a cacheable read, or None."""
+        if self.ttl <= 0 or command_type not in self.CACHEABLE:
+            return None
+        return (command_type, json.dumps(params or {}, sort_keys=True))
+
+    def get(self, key: tuple):
+        """Return (True, result) on a hit, (False, None) on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, result, _params = entry
+                if now - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, copy.deepcopy(result)
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def put(self, key: tuple, result: Any, generation: int):
+        """Store *result* unless something was invalidated since *generation*."""
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic(), copy.deepcopy(result), json.loads(key[1]))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def is_write(self, command_type: str) -> bool:
+        return (command_type in AbletonConnection._MODIFYING_COMMANDS
+                or not command_type.startswith(self._READ_PREFIXES))
+
+    def invalidate_for(self, command_type: str, params: Optional[Dict[str, Any]]):
+        """Drop every entry the write *command_type*/*params* may have changed."""
+        if not self.is_write(command_type):
+            return
+        params = params or {}
+        if command_type == "execute_batch":
+            for entry in params.get("commands", []):
+                self.invalidate_for(entry.get("type", ""), entry.get("params"))
+            return
+
+        track = params.get("track_index")
+        if command_type in self._STRUCTURAL_WRITES or not isinstance(track, int):
+            self.clear(count=True)
+            return
+        track_type = params.get("track_type", "track")
+        device = params.get("device_index")
+        if command_type in self._DEVICE_LIST_WRITES or not isinstance(device, int):
+            device = None
+
+        with self._lock:
+            self.generation += 1
+            for key, (_stored_at, _result, cached) in list(self._entries.items()):
+                command = key[0]
+                if command not in self._GLOBAL_READS:
+                    if cached.get("track_index", 0) != track:
+                        continue
+                    if cached.get("track_type", "track") != track_type:
+                        continue
+                    if (command == "get_device_parameters" and device is not None
+                            and cached.get("device_index", 0) != device):
+                        continue
+                del self._entries[key]
+                self.invalidations += 1
+
+    def clear(self, count: bool = False):
+        with self._lock:
+            self.generation += 1
+            if count:
+                self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.ttl > 0,
+                "ttl_seconds": self.ttl,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "expirations": self.expirations,
+            }
+
+
 @dataclass
 class AbletonConnection:
     host: str
@@ -40,8 +203,13 @@ class AbletonConnection:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.sock.settimeout(5.0)
             self.sock.connect((self.host, self.port))
-            self._recv_buffer = ""  # Clear buffer on new connection
+            # Every connection starts out as newline JSON
+            self._codec = JsonCodec()
+            self._framer = self._codec.framer()
+            # Live may have been restarted or switched sets meanwhile
+            self._result_cache.clear()
             logger.info("Connected to Ableton at %s:%s", self.host, self.port)
+            self._negotiate_wire_format()
             return True
         except Exception as e:
             logger.error("Failed to connect to Ableton: %s", e)
@@ -71,7 +239,48 @@ class AbletonConnection:
                 self._udp_sock = None
 
     def __post_init__(self):
-        self._recv_buffer = ""
+        self._codec = JsonCodec()
+        self._framer = self._codec.framer()
+        self._request_ids = itertools.count(1)
+        self._result_cache = ResultCache()
+        self._udp_sender = uuid.uuid4().hex[:8]
+        self._udp_seq = itertools.count(1)
+        # (event_seq, time) of the latest write; change-subscription
+        # mirrors must have caught up with it before they serve reads
+        self.write_barrier = (0, 0.0)
+
+    @property
+    def result_cache(self) -> "ResultCache":
+        return self._result_cache
+
+    @property
+    def wire_format(self) -> str:
+        return self._codec.name
+
+    def _negotiate_wire_format(self):
+        """Switch this connection to WIRE_FORMAT if the Remote Script supports it.
+
+        Remote Scripts that predate negotiation answer "Unknown command",
+        and the connection stays on JSON.
+        """
+        if WIRE_FORMAT == WIRE_FORMAT_JSON or WIRE_FORMAT not in CODECS:
+            return
+        request = {
+            "type": "negotiate_wire_format",
+            "params": {"formats": [WIRE_FORMAT, WIRE_FORMAT_JSON]},
+            "id": next(self._request_ids),
+        }
+        self.sock.sendall(self._codec.encode(request))
+        response = self.receive_full_response(self.sock, timeout=5.0)
+        chosen = None
+        if response.get("status") == "success":
+            chosen = (response.get("result") or {}).get("format")
+        if chosen in CODECS and chosen != self._codec.name:
+            unframed = self._framer.take_unframed()
+            self._codec = CODECS[chosen]()
+            self._framer = self._codec.framer()
+            self._framer.feed(unframed)
+        logger.info("Wire format: %s", self._codec.name)
 
     def _ensure_udp_socket(self):
         """Create a UDP socket for real-time parameter sending if not already open."""
@@ -82,30 +291,33 @@ class AbletonConnection:
     def send_udp_command(self, command_type: str, params: Dict[str, Any] = None):
         """Send a fire-and-forget UDP command to the Remote Script.
 
-        No response is expected or waited for.
+        No response is expected or waited for.  Each datagram carries this
+        connection's sender id and a sequence number, so the Remote Script
+        can drop datagrams that arrive out of order.
         """
         sock = self._ensure_udp_socket()
+        self._result_cache.invalidate_for(command_type, params)
         command = {
             "type": command_type,
-            "params": params or {}
+            "params": params or {},
+            "sender": self._udp_sender,
+            "seq": next(self._udp_seq),
         }
         payload = json.dumps(command).encode("utf-8")
         sock.sendto(payload, (self.host, self._udp_port))
         logger.debug("Sent UDP command: %s", command_type)
 
     def receive_full_response(self, sock, buffer_size=8192, timeout=15.0):
-        """Receive a complete newline-delimited JSON response and return the parsed object"""
+        """Receive one complete response in the connection's wire format and return the parsed object"""
         sock.settimeout(timeout)
 
         try:
             while True:
-                # Check if we already have a complete line in the buffer
-                if '\n' in self._recv_buffer:
-                    line, self._recv_buffer = self._recv_buffer.split('\n', 1)
-                    line = line.strip()
-                    if line:
-                        result = json.loads(line)
-                        logger.debug("Received complete response (%d chars)", len(line))
+                # Return the first message already in the buffer (blank lines are skipped)
+                for frame in self._framer.frames():
+                    result = self._codec.decode(frame)
+                    if result is not None:
+                        logger.debug("Received complete response (%d %s)", len(frame), self._codec.name)
                         return result
 
                 try:
@@ -113,14 +325,14 @@ class AbletonConnection:
                     if not chunk:
                         raise Exception("Connection closed before receiving any data")
 
-                    self._recv_buffer += chunk.decode('utf-8')
+                    self._framer.feed(chunk)
                 except socket.timeout:
                     logger.warning("Socket timeout during receive")
                     raise
                 except (ConnectionError, BrokenPipeError, ConnectionResetError) as e:
                     logger.error("Socket connection error during receive: %s", e)
                     raise
-        except (socket.timeout, json.JSONDecodeError):
+        except (socket.timeout, ValueError):
             raise
         except Exception as e:
             logger.error("Error during receive: %s", e)
@@ -130,10 +342,12 @@ class AbletonConnection:
         """Force a fresh reconnection, clearing all state."""
         logger.info("Forcing reconnection to Ableton...")
         self.disconnect()
-        self._recv_buffer = ""
+        self._framer.clear()
         return self.connect()
 
-    # Commands that modify Ableton state (need extra delays for stability)
+    # Commands that modify Ableton state.  Current Remote Scripts hold the
+    # response until Live has settled and mark it "settled"; older ones
+    # don't, so we fall back to a short fixed pause after those commands.
     _MODIFYING_COMMANDS = frozenset([
         "create_midi_track", "create_audio_track", "set_track_name",
         "create_clip", "add_notes_to_clip", "set_clip_name",
@@ -173,7 +387,10 @@ class AbletonConnection:
         "set_track_fold", "set_crossfade_assign",
         "duplicate_clip_region", "move_clip_playing_pos", "set_clip_grid",
         "set_simpler_properties", "simpler_sample_action", "manage_sample_slices",
-        "preview_browser_item",
+        "preview_browser_item", "execute_batch", "set_main_thread_budget",
+        "start_parameter_modulation", "modify_parameter_modulation",
+        "stop_parameter_modulation", "schedule_command", "cancel_scheduled_command",
+        "load_timeline", "control_timeline", "set_lom_properties",
     ])
 
     def send_command(self, command_type: str, params: Dict[str, Any] = None, timeout: float = None) -> Dict[str, Any]:
@@ -181,54 +398,83 @@ class AbletonConnection:
 
         Includes automatic retry: if the first attempt fails due to a
         socket error, the connection is reset and the command is retried once.
-        Adds small delays around modifying commands for stability.
+        Modifying commands return once the Remote Script reports that Live
+        has settled; a fixed delay is only added for Remote Scripts that
+        don't report it.
+
+        Results of the common read-only queries are served from a short-lived
+        cache (see ResultCache); writes invalidate what they touched.
         """
         max_attempts = 2
         is_modifying = command_type in self._MODIFYING_COMMANDS
 
+        cache_key = self._result_cache.key(command_type, params)
+        if cache_key is not None:
+            hit, cached = self._result_cache.get(cache_key)
+            if hit:
+                return cached
+            generation = self._result_cache.generation
+        else:
+            # Also covers writes that fail halfway through
+            self._result_cache.invalidate_for(command_type, params)
+
         for attempt in range(1, max_attempts + 1):
             if not self.sock and not self.connect():
                 raise ConnectionError("Not connected to Ableton")
 
+            response = None
+            request_id = next(self._request_ids)
             command = {
                 "type": command_type,
-                "params": params or {}
+                "params": params or {},
+                "id": request_id,
             }
 
             try:
                 logger.debug("Sending command: %s (attempt %d)", command_type, attempt)
 
-                # Send the command as newline-delimited JSON
-                self.sock.sendall((json.dumps(command) + '\n').encode('utf-8'))
-
-                # Add a small delay after sending modifying commands
-                # to give Ableton time to process before we read the response
-                if is_modifying:
-                    time.sleep(0.1)
+                self.sock.sendall(self._codec.encode(command))
 
                 # Set timeout based on command type (caller override takes priority)
                 if timeout is None:
                     timeout = 15.0 if is_modifying else 10.0
-                # Receive the response (already parsed by receive_full_response)
-                response = self.receive_full_response(self.sock, timeout=timeout)
+                # Receive the response (already parsed by receive_full_response).
+                # Older Remote Scripts don't echo the id; newer ones do, which
+                # lets us skip stale replies left over from an earlier request.
+                while True:
+                    response = self.receive_full_response(self.sock, timeout=timeout)
+                    resp_id = response.pop("id", None)
+                    if resp_id is None or resp_id == request_id:
+                        break
+                    logger.warning("Discarding stale response (id %s, expected %s)", resp_id, request_id)
                 logger.debug("Response status: %s", response.get('status', 'unknown'))
+                self._note_write(response)
 
                 if response.get("status") == "error":
                     logger.error("Ableton error: %s", response.get('message'))
                     raise Exception(response.get("message", "Unknown error from Ableton"))
 
-                # Add a small delay after modifying commands complete
-                # to let Ableton settle before the next command
-                if is_modifying:
-                    time.sleep(0.1)
+                # Remote Scripts without completion signalling need a
+                # fixed pause to let Ableton settle before the next command
+                if is_modifying and not response.get("settled"):
+                    time.sleep(_LEGACY_SETTLE_DELAY)
 
-                return response.get("result", {})
+                result = response.get("result", {})
+                if cache_key is not None:
+                    self._result_cache.put(cache_key, result, generation)
+                else:
+                    # Again after the fact, so reads that raced the write aren't cached
+                    self._result_cache.invalidate_for(command_type, params)
+                return result
 
             except Exception as e:
+                if response is None and self._result_cache.is_write(command_type):
+                    # The write may or may not have reached Live
+                    self.write_barrier = (math.inf, time.time())
                 logger.error("Command '%s' attempt %d failed: %s", command_type, attempt, e)
                 # Close the broken socket and clear buffer
                 self.disconnect()
-                self._recv_buffer = ""
+                self._framer.clear()
 
                 if attempt < max_attempts:
                     # Wait briefly then retry with a fresh connection
@@ -239,6 +485,437 @@ class AbletonConnection:
                 else:
                     raise Exception(f"Command '{command_type}' failed after {max_attempts} attempts: {e}")
 
+    def _note_write(self, response: Dict[str, Any]):
+        """Record the event_seq at which change subscribers see this write."""
+        if "event_seq" in response:
+            self.write_barrier = (response.pop("event_seq"), time.time())
+
+    def send_pipelined(self, commands: List[tuple], timeout: float = None,
+                       max_in_flight: int = 32) -> List[Dict[str, Any]]:
+        """Send many commands over one connection without waiting between them.
+
+        Keeps up to *max_in_flight* requests outstanding and matches
+        responses by their echoed request id (falling back to arrival
+        order for Remote Scripts that predate id echoing).  Meant for
+        bursts of read-only calls such as get_track_info across every
+        track, which would otherwise pay one full round trip each.
+
+        Parameters:
+        - commands: List of (command_type, params) tuples
+        - timeout: Per-response receive timeout (default 10s)
+        - max_in_flight: Upper bound on unanswered requests
+
+        Returns one response envelope per command, in input order:
+        {"status": "success", "result": {...}} or {"status": "error", "message": "..."}.
+        """
+        if not commands:
+            return []
+        if not self.sock and not self.connect():
+            raise ConnectionError("Not connected to Ableton")
+        if timeout is None:
+            timeout = 10.0
+
+        request_ids: List[int] = []
+        in_flight: deque = deque()
+        responses: Dict[int, Dict[str, Any]] = {}
+        next_index = 0
+
+        # Pipelined reads bypass the result cache; writes still invalidate it
+        writes = [(c, p) for c, p in commands if self._result_cache.is_write(c)]
+        for command_type, params in writes:
+            self._result_cache.invalidate_for(command_type, params)
+
+        try:
+            while len(responses) < len(commands):
+                payload = []
+                while next_index < len(commands) and len(in_flight) < max_in_flight:
+                    command_type, params = commands[next_index]
+                    request_id = next(self._request_ids)
+                    request_ids.append(request_id)
+                    in_flight.append(request_id)
+                    payload.append(self._codec.encode({
+                        "type": command_type,
+                        "params": params or {},
+                        "id": request_id,
+                    }))
+                    next_index += 1
+                if payload:
+                    self.sock.sendall(b"".join(payload))
+
+                response = self.receive_full_response(self.sock, timeout=timeout)
+                resp_id = response.pop("id", None)
+                if resp_id is None:
+                    resp_id = in_flight[0]
+                if resp_id not in in_flight:
+                    logger.warning("Discarding stale pipelined response (id %s)", resp_id)
+                    continue
+                in_flight.remove(resp_id)
+                responses[resp_id] = response
+                self._note_write(response)
+        except Exception as e:
+            if writes:
+                self.write_barrier = (math.inf, time.time())
+            logger.error("Pipelined send of %d commands failed: %s", len(commands), e)
+            self.disconnect()
+            self._framer.clear()
+            raise
+        finally:
+            for command_type, params in writes:
+                self._result_cache.invalidate_for(command_type, params)
+
+        logger.debug("Pipelined %d commands", len(commands))
+        return [responses[request_id] for request_id in request_ids]
+
+    def send_batch(self, commands: List[tuple], stop_on_error: bool = True,
+                   timeout: float = None) -> List[Dict[str, Any]]:
+        """Run several commands in one round trip and one main-thread tick.
+
+        Sends a single execute_batch command; the Remote Script runs the
+        entries back-to-back inside one scheduled task.  Remote Scripts
+        without execute_batch are served by pipelining the commands instead.
+
+        Parameters:
+        - commands: List of (command_type, params) tuples
+        - stop_on_error: Halt at the first failing entry (the rest are omitted)
+        - timeout: Receive timeout for the whole batch (default 30s)
+
+        Returns one entry per executed command, in order:
+        {"index", "type", "status": "success", "result"} or
+        {"index", "type", "status": "error", "message"}.
+        """
+        if not commands:
+            return []
+        batch = [{"type": command_type, "params": params or {}} for command_type, params in commands]
+        try:
+            result = self.send_command("execute_batch", {
+                "commands": batch,
+                "stop_on_error": stop_on_error,
+            }, timeout=timeout or 30.0)
+            return result.get("results", [])
+        except Exception as e:
+            if "Unknown command: execute_batch" not in str(e):
+                raise
+            logger.info("Remote Script has no execute_batch, pipelining %d commands instead", len(batch))
+
+        results = []
+        responses = self.send_pipelined(commands, timeout=timeout)
+        for i, ((command_type, _params), response) in enumerate(zip(commands, responses)):
+            entry = {"index": i, "type": command_type, "status": response.get("status", "error")}
+            if entry["status"] == "success":
+                entry["result"] = response.get("result", {})
+            else:
+                entry["message"] = response.get("message", "Unknown error from Ableton")
+            results.append(entry)
+            if stop_on_error and entry["status"] != "success":
+                break
+        return results
+
+
+class SessionMirror:
+    """Server-side copy of Live state kept current by pushed change events.
+
+    Fed by LiveChangeSubscriber from the Remote Script's ``subscribe``
+    channel, so reads of the mirrored state never touch the socket.
+    Thread-safe: events are applied on the subscriber thread while tools
+    read snapshots.
+
+    ``all_tracks_info`` and ``track_info`` answer the index/name/devices
+    projections of get_all_tracks_info and get_track_info in the same
+    shape Live would; they return None for anything the mirror lacks.
+    Callers first check ``caught_up`` against the connection's
+    write_barrier, so a read right after a write never sees the state
+    from before it.
+    """
+
+    MIRRORED_TRACK_FIELDS = frozenset(("index", "name", "devices"))
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._song: Dict[str, Any] = {}
+            self._tracks: List[Dict[str, Any]] = []
+            self._clip_slots: Dict[tuple, bool] = {}
+            self._devices: Dict[int, List[Dict[str, Any]]] = {}
+            self._parameters: Dict[tuple, Dict[str, Any]] = {}
+            self._events_applied = 0
+            self._messages = 0
+            self._last_seq = 0
+            self._last_event_at = 0.0
+            self._snapshot_at = 0.0
+
+    def apply_message(self, message: Dict[str, Any]):
+        """Apply one ``{"type": "event", "seq", "events"}`` push."""
+        with self._lock:
+            self._messages += 1
+            self._last_seq = message.get("seq", self._last_seq)
+            for event in message.get("events", []):
+                self._apply(event)
+            self._changed.notify_all()
+
+    def apply_sync(self, seq: int):
+        """Everything up to *seq* has been pushed (``{"type": "sync"}``)."""
+        with self._lock:
+            self._last_seq = max(self._last_seq, seq)
+            self._changed.notify_all()
+
+    def apply_snapshot(self, events: List[Dict[str, Any]], seq: int = 0):
+        with self._lock:
+            self._last_seq = seq
+            for event in events:
+                self._apply(event)
+            self._snapshot_at = time.time()
+            self._changed.notify_all()
+
+    def caught_up(self, barrier: tuple, timeout: float = 0.25) -> bool:
+        """Whether the mirror reflects a write with *barrier* (event_seq, time).
+
+        True once the write's seq has arrived, or when the current snapshot
+        was taken after the write (e.g. the Remote Script restarted).
+        Waits up to *timeout* for the pushed events to land.
+        """
+        seq, written_at = barrier
+        with self._lock:
+            return self._changed.wait_for(
+                lambda: self._last_seq >= seq or self._snapshot_at > written_at, timeout)
+
+    def _apply(self, event: Dict[str, Any]):
+        topic = event.get("topic")
+        if topic == "song":
+            self._song[event["property"]] = event["value"]
+        elif topic == "tracks":
+            self._tracks = event["tracks"]
+            # Slots and devices of removed tracks are never reported again
+            count = len(self._tracks)
+            self._clip_slots = {k: v for k, v in self._clip_slots.items() if k[0] < count}
+            self._devices = {k: v for k, v in self._devices.items() if k < count}
+        elif topic == "clip_slot":
+            self._clip_slots[(event["track_index"], event["slot_index"])] = event["has_clip"]
+        elif topic == "devices":
+            self._devices[event["track_index"]] = event["devices"]
+        elif topic == "parameter":
+            key = (event["track_type"], event["track_index"], event["device_index"])
+            self._parameters.setdefault(key, {})[event["parameter_index"]] = {
+                "name": event["name"], "value": event["value"]}
+        else:
+            return
+        self._events_applied += 1
+        self._last_event_at = time.time()
+
+    def snapshot(self, topic: str = "all") -> Dict[str, Any]:
+        with self._lock:
+            state = {
+                "song": dict(self._song),
+                "tracks": copy.deepcopy(self._tracks),
+                "clip_slots": [
+                    {"track_index": t, "slot_index": s, "has_clip": has_clip}
+                    for (t, s), has_clip in sorted(self._clip_slots.items())],
+                "devices": [
+                    {"track_index": t, "devices": copy.deepcopy(devices)}
+                    for t, devices in sorted(self._devices.items())],
+                "parameters": [
+                    {"track_type": tt, "track_index": t, "device_index": d,
+                     "parameters": [dict(index=p, **v) for p, v in sorted(params.items())]}
+                    for (tt, t, d), params in sorted(self._parameters.items())],
+            }
+        if topic == "all":
+            return state
+        if topic not in state:
+            raise ValueError(f"Unknown topic '{topic}'; expected one of: all, {', '.join(state)}")
+        return {topic: state[topic]}
+
+    def all_tracks_info(self, fields: List[str], offset: int = 0,
+                        limit: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """get_all_tracks_info result for *fields*, or None if not mirrored."""
+        with self._lock:
+            total = len(self._tracks)
+            start = min(offset, total)
+            stop = total if limit is None else min(total, start + limit)
+            tracks_list = []
+            for track in self._tracks[start:stop]:
+                entry = {}
+                # Same key order as Live's TRACK_SUMMARY_FIELDS
+                for field in ("index", "name", "devices"):
+                    if field not in fields:
+                        continue
+                    if field == "devices":
+                        devices = self._devices.get(track["index"])
+                        if devices is None:
+                            return None
+                        entry["devices"] = [{"name": d["name"], "class_name": d["class_name"]}
+                                            for d in devices]
+                    else:
+                        entry[field] = track[field]
+                tracks_list.append(entry)
+        result = {"tracks": tracks_list, "count": len(tracks_list)}
+        if offset or limit is not None:
+            result["offset"] = start
+            result["total"] = total
+        return result
+
+    def track_info(self, track_index: int, fields: List[str], device_offset: int = 0,
+                   device_limit: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """get_track_info result for *fields*, or None if not mirrored."""
+        with self._lock:
+            if track_index >= len(self._tracks):
+                # Let Live report the out-of-range error
+                return None
+            track = self._tracks[track_index]
+            result = {f: track[f] for f in ("index", "name") if f in fields}
+            if "devices" in fields:
+                devices = self._devices.get(track_index)
+                if devices is None:
+                    return None
+                start = min(device_offset, len(devices))
+                stop = len(devices) if device_limit is None else min(len(devices), start + device_limit)
+                result["devices"] = copy.deepcopy(devices[start:stop])
+                if device_offset or device_limit is not None:
+                    result["device_count"] = len(devices)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "messages": self._messages,
+                "events_applied": self._events_applied,
+                "last_seq": self._last_seq,
+                "last_event_age_s": round(time.time() - self._last_event_at, 1) if self._last_event_at else None,
+            }
+
+
+class LiveChangeSubscriber:
+    """Holds a dedicated Remote Script connection subscribed to change events.
+
+    The subscribe reply carries the current state, which seeds the mirror;
+    a background thread then applies every pushed event.  A dropped
+    connection is re-established and re-subscribed with backoff, starting
+    from a fresh snapshot.
+    """
+
+    RECONNECT_DELAYS = (0.5, 1.0, 2.0, 5.0)
+
+    def __init__(self, params: Dict[str, Any], host: str = "localhost", port: int = 9877):
+        self.params = params
+        self.mirror = SessionMirror()
+        self._connection = AbletonConnection(host=host, port=port)
+        self._running = False
+        self._thread = None
+        # True while the mirror is being kept current (False while reconnecting)
+        self.live = False
+        self.reconnects = 0
+        self.subscribed: Dict[str, Any] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self) -> Dict[str, Any]:
+        """Subscribe and start the event thread; raises if Live is unreachable."""
+        self._subscribe()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True, name="live-change-subscriber")
+        self._thread.start()
+        return self.subscribed
+
+    def mirror_for(self, *topics: str, barrier: tuple = (0, 0.0)) -> Optional[SessionMirror]:
+        """The mirror if it covers every one of *topics* and has caught up
+        with the write *barrier* (see AbletonConnection.write_barrier)."""
+        if not (self._running and self.live and set(topics) <= set(self.subscribed.get("topics", []))):
+            return None
+        return self.mirror if self.mirror.caught_up(barrier) else None
+
+    def stop(self):
+        self._running = False
+        self.live = False
+        sock = self._connection.sock
+        if sock is not None:
+            try:
+                # Wakes the blocking recv on the subscriber thread
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._connection.disconnect()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(2.0)
+
+    def _subscribe(self):
+        if not self._connection.connect():
+            raise ConnectionError("Could not connect to Ableton for change subscription")
+        result = self._connection.send_command("subscribe", self.params)
+        self.mirror.reset()
+        self.mirror.apply_snapshot(result.get("snapshot", []), result.get("seq", 0))
+        self.subscribed = result.get("subscribed", {})
+        self.live = True
+
+    def _run(self):
+        while self._running:
+            try:
+                message = self._connection.receive_full_response(self._connection.sock, timeout=None)
+                if message.get("type") == "event":
+                    self.mirror.apply_message(message)
+                elif message.get("type") == "sync":
+                    self.mirror.apply_sync(message.get("seq", 0))
+                continue
+            except Exception as e:
+                if not self._running:
+                    break
+                logger.warning("Change subscription lost: %s", e)
+            self.live = False
+            self._connection.disconnect()
+            self._connection._framer.clear()
+            for delay in itertools.chain(self.RECONNECT_DELAYS, itertools.repeat(self.RECONNECT_DELAYS[-1])):
+                time.sleep(delay)
+                if not self._running:
+                    return
+                try:
+                    self._subscribe()
+                    self.reconnects += 1
+                    logger.info("Change subscription re-established")
+                    break
+                except Exception as e:
+                    logger.debug("Resubscribe failed: %s", e)
+                    self._connection.disconnect()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.mirror.stats()
+        stats.update({"running": self._running, "live": self.live, "reconnects": self.reconnects})
+        return stats
+
+
+# How often the M4L receiver wakes up to expire abandoned chunk streams
+_M4L_RECV_POLL = 0.5
+# A chunked response keeps its request alive while chunks arrive at least
+# this often, however long the whole response takes
+_M4L_CHUNK_GAP = 5.0
+# Partial chunk streams nobody is waiting for are dropped after this long
+_M4L_PARTIAL_TTL = 30.0
+# Binary response frames, sent by bridges whose ping saw our "frames" feature:
+# [0xB1][format u8][index u16][total u16][id length u8][request id][payload]
+_M4L_FRAME_MAGIC = 0xB1
+_M4L_FRAME_PARAM_TABLE = 1  # format 0 is UTF-8 JSON
+_M4L_FRAME_VALUE_TABLE = 2
+_M4L_FRAME_VALUE_READ = 3
+# Missing frames of a stream quiet for this long are NACKed, up to
+# _M4L_MAX_NACKS times
+_M4L_NACK_AFTER = 0.5
+_M4L_MAX_NACKS = 5
+
+
+class _M4LRequest:
+    """One in-flight M4L bridge request, completed by the receiver thread."""
+
+    __slots__ = ("request_id", "event", "response", "error", "last_chunk_at")
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.event = threading.Event()
+        self.response: Optional[Dict[str, Any]] = None
+        self.error: Optional[Exception] = None
+        self.last_chunk_at = 0.0
+
 
 @dataclass
 class M4LConnection:
@@ -248,6 +925,16 @@ class M4LConnection:
     Communication uses two UDP ports:
       - send_port (9878): MCP server → M4L device (commands)
       - recv_port (9879): M4L device → MCP server (responses)
+
+    A background receiver thread parses every datagram, reassembles
+    chunked responses and completes the waiting request by its id, so
+    several tools can talk to the bridge at once: a quick ping no longer
+    waits behind a slow chunked discovery, and replies arriving out of
+    order are matched instead of drained away.
+
+    Bridges that support it answer large responses in binary frames;
+    frames lost on the way are requested again (NACKed) with
+    /chunk_status instead of failing the whole request.
     """
     send_host: str = "127.0.0.1"
     send_port: int = 9878
@@ -256,8 +943,20 @@ class M4LConnection:
     recv_sock: socket.socket = None
     _connected: bool = False
 
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[str, _M4LRequest] = {}
+        # chunk stream key ("_i" request id, "" for bridges that don't tag
+        # chunks) -> {"total", "parts", "updated"}
+        self._partials: Dict[str, Dict[str, Any]] = {}
+        self._stats = {"responses": 0, "chunked_responses": 0, "unmatched": 0,
+                       "parse_errors": 0, "timeouts": 0, "nacks": 0}
+        self._last_stall_check = 0.0
+        # Capabilities advertised by the bridge's ping reply; None = unknown
+        self._capabilities: Optional[frozenset] = None
+
     def connect(self) -> bool:
-        """Set up UDP sockets for M4L communication."""
+        """Set up UDP sockets for M4L communication and start the receiver."""
         try:
             self.send_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.recv_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -265,8 +964,10 @@ class M4LConnection:
             if hasattr(socket, "SO_EXCLUSIVEADDRUSE"):
                 self.recv_sock.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
             self.recv_sock.bind(("127.0.0.1", self.recv_port))
-            self.recv_sock.settimeout(5.0)
+            self.recv_sock.settimeout(_M4L_RECV_POLL)
             self._connected = True
+            threading.Thread(target=self._receive_loop, args=(self.recv_sock,),
+                             daemon=True, name="m4l-receiver").start()
             logger.info("M4L UDP sockets ready (send→:%d, recv←:%d)", self.send_port, self.recv_port)
             return True
         except Exception as e:
@@ -275,7 +976,7 @@ class M4LConnection:
             return False
 
     def disconnect(self):
-        """Close UDP sockets."""
+        """Close UDP sockets; the receiver exits and waiting requests fail."""
         for s in (self.send_sock, self.recv_sock):
             if s:
                 try:
@@ -285,6 +986,19 @@ class M4LConnection:
         self.send_sock = None
         self.recv_sock = None
         self._connected = False
+        self._capabilities = None
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+            self._partials.clear()
+        for request in pending:
+            request.error = ConnectionError("M4L connection closed.")
+            request.event.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._pending),
+                        partial_streams=len(self._partials))
 
     @staticmethod
     def _build_osc_message(address: str, osc_args: list = None) -> bytes:
@@ -316,13 +1030,27 @@ class M4LConnection:
     def _build_osc_packet(self, command_type: str, params: Dict[str, Any], request_id: str) -> bytes:
         """Build the OSC packet for a given command type."""
         if command_type == "ping":
-            return self._build_osc_message("/ping", [("s", request_id)])
+            # "frames": we reassemble binary response frames (older bridges
+            # ignore the extra argument)
+            return self._build_osc_message("/ping", [("s", request_id), ("s", "frames")])
         elif command_type == "discover_params":
             return self._build_osc_message("/discover_params", [
                 ("i", params["track_index"]),
                 ("i", params["device_index"]),
                 ("s", request_id),
             ])
+        elif command_type == "get_param_values":
+            return self._build_osc_message("/get_param_values", [
+                ("i", params["track_index"]),
+                ("i", params["device_index"]),
+                ("s", request_id),
+            ])
+        elif command_type == "read_param_values":
+            osc_args = [("i", params.get("since_token", 0))]
+            for track_index, device_index in params["devices"]:
+                osc_args += [("i", track_index), ("i", device_index)]
+            osc_args.append(("s", request_id))
+            return self._build_osc_message("/read_param_values", osc_args)
         elif command_type == "get_hidden_params":
             return self._build_osc_message("/get_hidden_params", [
                 ("i", params["track_index"]),
@@ -352,6 +1080,13 @@ class M4LConnection:
                 ("f", params["value"]),
                 ("s", request_id),
             ])
+        elif command_type == "set_hidden_params":
+            # Typed (index, value) pairs: no base64 payload for Max to split
+            osc_args = [("i", params["track_index"]), ("i", params["device_index"])]
+            for p in params["parameters"]:
+                osc_args += [("i", int(p["index"])), ("f", float(p["value"]))]
+            osc_args.append(("s", request_id))
+            return self._build_osc_message("/set_hidden_params", osc_args)
         elif command_type == "batch_set_hidden_params":
             # Use compact JSON (no spaces) + URL-safe base64 without padding.
             # Max's OSC/symbol handling mangles +, /, and = characters.
@@ -542,97 +1277,374 @@ class M4LConnection:
         else:
             raise ValueError(f"Unknown M4L command: {command_type}")
 
-    def _drain_recv_socket(self):
-        """Drain any stale data from the receive socket."""
-        self.recv_sock.setblocking(False)
-        try:
-            for _ in range(100):
-                self.recv_sock.recvfrom(65535)
-        except (BlockingIOError, OSError):
-            pass
-        self.recv_sock.setblocking(True)
-
-    def send_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Send a command to the M4L bridge using native OSC messages.
-
-        Includes automatic reconnect: if the send or receive fails, the
-        UDP sockets are recreated and the command is retried once.
-        """
-        params = params or {}
-        request_id = str(uuid.uuid4())[:8]
-        osc = self._build_osc_packet(command_type, params, request_id)
-
+    @staticmethod
+    def _timeout_for(command_type: str, params: Dict[str, Any]) -> float:
+        """Response timeout for *command_type*."""
         # Commands that use chunked async processing in the M4L bridge
         # need longer timeouts to account for discovery + response delays.
         if command_type == "batch_set_hidden_params":
             param_count = len(params.get("parameters", []))
             # ~150ms per param (chunk delay + LOM overhead), minimum 10s
-            timeout = max(10.0, param_count * 0.15)
-        elif command_type in ("discover_params", "get_hidden_params"):
-            # Chunked discovery: ~50ms per 4 params + chunked response sending
-            timeout = 15.0
-        elif command_type == "analyze_cross_track":
+            return max(10.0, param_count * 0.15)
+        if command_type == "set_hidden_params":
+            # Written 6 per 50ms by the bridge, possibly queued behind
+            # another batch
+            return max(5.0, len(params.get("parameters", [])) * 0.05)
+        if command_type in ("discover_params", "get_hidden_params"):
+            # Chunked discovery: ~50ms per 4 params + chunked response sending,
+            # possibly queued behind another discovery
+            return 15.0
+        if command_type == "get_param_values":
+            # ~50ms per 24 params, possibly queued behind another read
+            return 10.0
+        if command_type == "read_param_values":
+            return max(10.0, len(params.get("devices", [])) * 0.75)
+        if command_type == "analyze_cross_track":
             # Cross-track: wait_ms + overhead for send routing + restore + response
             wait_ms = params.get("wait_ms", 500)
-            timeout = max(3.0, (wait_ms / 1000.0) + 1.5)
-        else:
-            timeout = 5.0
+            return max(3.0, (wait_ms / 1000.0) + 1.5)
+        return 5.0
 
-        max_attempts = 2
-        for attempt in range(1, max_attempts + 1):
+    def send_command(self, command_type: str, params: Dict[str, Any] = None,
+                     timeout: float = None, attempts: int = 2) -> Dict[str, Any]:
+        """Send a command to the M4L bridge using native OSC messages.
+
+        Safe to call from several threads at once; each call waits only for
+        the response carrying its own request id.  A timed-out command is
+        resent once with a new id; if sending fails, the UDP sockets are
+        recreated first.
+        """
+        params = params or {}
+        if timeout is None:
+            timeout = self._timeout_for(command_type, params)
+
+        for attempt in range(1, attempts + 1):
             if not self._connected:
                 if not self.connect():
                     raise ConnectionError("Could not establish M4L UDP connection.")
 
-            # Drain any stale data in the recv socket before sending
-            self._drain_recv_socket()
-            self.recv_sock.settimeout(timeout)
+            request_id = str(uuid.uuid4())[:8]
+            osc = self._build_osc_packet(command_type, params, request_id)
+            request = _M4LRequest(request_id)
+            with self._lock:
+                self._pending[request_id] = request
 
             try:
                 self.send_sock.sendto(osc, (self.send_host, self.send_port))
             except Exception as e:
+                with self._lock:
+                    self._pending.pop(request_id, None)
                 logger.error("Failed to send UDP command to M4L (attempt %d): %s", attempt, e)
-                if attempt < max_attempts:
+                if attempt < attempts:
                     self.disconnect()
                     time.sleep(0.2)
                     continue
                 raise ConnectionError("Failed to send command to M4L bridge.")
 
+            if self._wait(request, timeout):
+                if request.error is not None:
+                    raise request.error
+                return request.response
+
+            logger.warning("M4L response timeout for %s (attempt %d)", command_type, attempt)
+            if attempt < attempts:
+                time.sleep(0.2)
+                continue
+            raise Exception("Timeout waiting for M4L bridge response. Is the M4L device loaded?")
+
+    def _wait(self, request: _M4LRequest, timeout: float) -> bool:
+        """Wait for *request*; chunks still arriving extend the deadline."""
+        deadline = time.time() + timeout
+        while not request.event.wait(max(0.01, min(_M4L_RECV_POLL, deadline - time.time()))):
+            now = time.time()
+            if now < deadline or now - request.last_chunk_at < _M4L_CHUNK_GAP:
+                continue
+            with self._lock:
+                self._pending.pop(request.request_id, None)
+                self._stats["timeouts"] += 1
+            # The receiver may have completed it just now
+            return request.event.is_set()
+        return True
+
+    # --- Receiver thread ---
+
+    def _receive_loop(self, sock: socket.socket):
+        """Parse every datagram and complete the request it answers."""
+        while True:
             try:
-                data, _addr = self.recv_sock.recvfrom(65535)
-                result = self._parse_m4l_response(data)
-
-                # Handle chunked responses from the M4L bridge.
-                # Large responses (>1500 chars JSON) are split into multiple
-                # UDP packets, each wrapped in an envelope: {"_c":idx,"_t":total,"_d":"base64piece"}
-                if "_c" in result and "_t" in result:
-                    result = self._reassemble_chunked_response(result)
-
-                # Verify request_id matches — drain stale responses if mismatch
-                resp_id = result.get("id", "")
-                if resp_id and resp_id != request_id:
-                    for _drain in range(5):
-                        logger.warning("M4L response id mismatch: expected %s, got %s — draining", request_id, resp_id)
-                        try:
-                            data, _addr = self.recv_sock.recvfrom(65535)
-                            result = self._parse_m4l_response(data)
-                            if "_c" in result and "_t" in result:
-                                result = self._reassemble_chunked_response(result)
-                            resp_id = result.get("id", "")
-                            if not resp_id or resp_id == request_id:
-                                break
-                        except socket.timeout:
-                            raise Exception(f"Timeout waiting for correct M4L response (expected {request_id})")
-                    else:
-                        logger.error("Could not find matching M4L response after 5 drains (expected %s)", request_id)
-                return result
+                data, _addr = sock.recvfrom(65535)
             except socket.timeout:
-                logger.warning("M4L response timeout (attempt %d)", attempt)
-                if attempt < max_attempts:
-                    self.disconnect()
-                    time.sleep(0.2)
+                self._expire_partials()
+                self._nack_stalled()
+                continue
+            except OSError:
+                # Socket closed by disconnect()
+                return
+            try:
+                frame = self._parse_frame(data)
+                if frame is not None:
+                    message = self._add_frame(*frame)
+                else:
+                    message = self._parse_m4l_response(data)
+                    # Large responses (>1500 chars JSON) from bridges without
+                    # frames arrive as several packets:
+                    # {"_c": idx, "_t": total, "_i": request_id, "_d": piece}
+                    if "_c" in message and "_t" in message:
+                        message = self._add_chunk(message)
+                self._nack_stalled()
+                if message is None:
                     continue
-                raise Exception("Timeout waiting for M4L bridge response. Is the M4L device loaded?")
+            except Exception as e:
+                logger.warning("Unparseable M4L packet (%d bytes): %s", len(data), e)
+                with self._lock:
+                    self._stats["parse_errors"] += 1
+                continue
+            self._complete(message)
+
+    def _add_chunk(self, chunk: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Store one chunk; returns the full response once every chunk is in."""
+        key = chunk.get("_i") or ""
+        now = time.time()
+        with self._lock:
+            partial = self._partials.get(key)
+            if partial is None or (chunk["_c"] == 0 and partial["parts"]):
+                # Untagged chunks: the bridge streams one response at a
+                # time, so chunk 0 starts a new one
+                partial = self._partials[key] = {"total": chunk["_t"], "parts": {}, "updated": now}
+            partial["parts"][chunk["_c"]] = chunk["_d"]
+            partial["updated"] = now
+            waiting = [self._pending[key]] if key in self._pending else (
+                list(self._pending.values()) if not key else [])
+            for request in waiting:
+                request.last_chunk_at = now
+            if len(partial["parts"]) < partial["total"]:
+                return None
+            del self._partials[key]
+            self._stats["chunked_responses"] += 1
+
+        json_parts = []
+        for i in range(partial["total"]):
+            piece_b64 = partial["parts"][i]
+            padded = piece_b64 + "=" * (-len(piece_b64) % 4)
+            json_parts.append(base64.urlsafe_b64decode(padded).decode("utf-8"))
+        full_json = "".join(json_parts)
+        logger.info("M4L chunked response reassembled: %d chars from %d chunks", len(full_json), partial["total"])
+        return json.loads(full_json)
+
+    @staticmethod
+    def _parse_frame(data: bytes) -> Optional[tuple]:
+        """(format, index, total, request_id, payload) of a binary frame, or None."""
+        # Base64 of the magic byte starts with "s"; of a JSON response with "e"
+        if not data.startswith(b"s"):
+            return None
+        null_pos = data.find(b"\x00")
+        text = data[:null_pos] if null_pos > 0 else data
+        raw = base64.urlsafe_b64decode(text + b"=" * (-len(text) % 4))
+        if len(raw) < 7 or raw[0] != _M4L_FRAME_MAGIC:
+            return None
+        fmt, index, total, id_len = struct.unpack_from(">BHHB", raw, 1)
+        request_id = raw[7:7 + id_len].decode("ascii")
+        return fmt, index, total, request_id, raw[7 + id_len:]
+
+    def _add_frame(self, fmt: int, index: int, total: int, request_id: str,
+                   payload: bytes) -> Optional[Dict[str, Any]]:
+        """Store one frame; returns the full response once every frame is in."""
+        now = time.time()
+        nack = None
+        with self._lock:
+            request = self._pending.get(request_id)
+            partial = self._partials.get(request_id)
+            if partial is None:
+                if request is None:
+                    # Retransmission for a request that finished or gave up
+                    return None
+                partial = self._partials[request_id] = {
+                    "total": total, "parts": {}, "updated": now, "format": fmt, "nacks": 0}
+            partial["parts"][index] = payload
+            partial["updated"] = now
+            if request is not None:
+                request.last_chunk_at = now
+            complete = len(partial["parts"]) >= partial["total"]
+            if complete:
+                del self._partials[request_id]
+                self._stats["chunked_responses"] += 1
+            elif index == total - 1:
+                # Frames are sent in order: the last one shows the gaps
+                nack = self._take_nack(partial)
+        if not complete:
+            if nack is not None:
+                self._send_chunk_status(request_id, nack)
+            return None
+
+        # Acknowledge, so the bridge can drop its copy and speed up
+        self._send_chunk_status(request_id, [])
+        body = b"".join(partial["parts"][i] for i in range(partial["total"]))
+        logger.info("M4L framed response reassembled: %d bytes from %d frames", len(body), partial["total"])
+        if partial["format"] == _M4L_FRAME_PARAM_TABLE:
+            return {"status": "success", "result": self._decode_param_table(body), "id": request_id}
+        if partial["format"] == _M4L_FRAME_VALUE_TABLE:
+            return {"status": "success", "result": self._decode_value_table(body), "id": request_id}
+        if partial["format"] == _M4L_FRAME_VALUE_READ:
+            return {"status": "success", "result": self._decode_value_read(body), "id": request_id}
+        return json.loads(body.decode("utf-8"))
+
+    def _take_nack(self, partial: Dict[str, Any]) -> Optional[List[int]]:
+        """Missing frame indices to NACK, or None once out of NACKs.  Call under _lock."""
+        if partial["nacks"] >= _M4L_MAX_NACKS:
+            return None
+        partial["nacks"] += 1
+        self._stats["nacks"] += 1
+        missing = [i for i in range(partial["total"]) if i not in partial["parts"]]
+        # Keep the NACK a small datagram; later rounds pick up the rest
+        return missing[:128]
+
+    def _nack_stalled(self):
+        """NACK framed streams that have gone quiet with frames missing."""
+        now = time.time()
+        if now - self._last_stall_check < _M4L_NACK_AFTER / 2:
+            return
+        self._last_stall_check = now
+        nacks = []
+        with self._lock:
+            for request_id, partial in self._partials.items():
+                if "format" in partial and now - partial["updated"] > _M4L_NACK_AFTER:
+                    missing = self._take_nack(partial)
+                    if missing is not None:
+                        # Give the retransmission time before the next round
+                        partial["updated"] = now
+                        nacks.append((request_id, missing))
+        for request_id, missing in nacks:
+            self._send_chunk_status(request_id, missing)
+
+    def _send_chunk_status(self, request_id: str, missing: List[int]):
+        """Tell the bridge which frames are missing; none = response complete."""
+        osc = self._build_osc_message("/chunk_status", [("s", request_id)] + [("i", i) for i in missing])
+        try:
+            self.send_sock.sendto(osc, (self.send_host, self.send_port))
+        except Exception as e:
+            logger.debug("Could not send chunk status for %s: %s", request_id, e)
+
+    @staticmethod
+    def _decode_param_table(body: bytes) -> Dict[str, Any]:
+        """Unpack a parameter table frame body into the discover_params result.
+
+        Layout (see _packParamTable in the bridge): device name and class as
+        u16-prefixed UTF-8, a u16 count, then per parameter
+        [index u16][flags u8][value, min, max, default as little-endian f64]
+        [name][value_items if flags & 2].
+        """
+        pos = 0
+
+        def read_str() -> str:
+            nonlocal pos
+            (length,) = struct.unpack_from(">H", body, pos)
+            pos += 2 + length
+            return body[pos - length:pos].decode("utf-8")
+
+        def number(x: float) -> Optional[float]:
+            # JSON.stringify turns NaN into null
+            return None if math.isnan(x) else x
+
+        device_name = read_str()
+        device_class = read_str()
+        (count,) = struct.unpack_from(">H", body, pos)
+        pos += 2
+        parameters = []
+        for _ in range(count):
+            index, flags = struct.unpack_from(">HB", body, pos)
+            value, min_value, max_value, default_value = struct.unpack_from("<4d", body, pos + 3)
+            pos += 35
+            info = {"index": index, "name": read_str(), "value": number(value),
+                    "min": number(min_value), "max": number(max_value),
+                    "is_quantized": bool(flags & 1), "default_value": number(default_value)}
+            if flags & 2:
+                info["value_items"] = read_str()
+            parameters.append(info)
+        return {"device_name": device_name, "device_class": device_class,
+                "parameter_count": count, "parameters": parameters}
+
+    @staticmethod
+    def _decode_value_table(body: bytes) -> Dict[str, Any]:
+        """Unpack a value table frame body into the get_param_values result:
+        name and class as in the parameter table, a u16 count, then one
+        little-endian f64 per parameter index.
+        """
+        name_len = struct.unpack_from(">H", body, 0)[0]
+        pos = 2 + name_len
+        class_len = struct.unpack_from(">H", body, pos)[0]
+        device_class = body[pos + 2:pos + 2 + class_len].decode("utf-8")
+        pos += 2 + class_len
+        (count,) = struct.unpack_from(">H", body, pos)
+        values = struct.unpack_from(f"<{count}d", body, pos + 2)
+        return {"device_name": body[2:2 + name_len].decode("utf-8"), "device_class": device_class,
+                "parameter_count": count,
+                "values": [None if math.isnan(v) else v for v in values]}
+
+    @staticmethod
+    def _decode_value_read(body: bytes) -> Dict[str, Any]:
+        """Unpack a read_param_values frame body (see _sendValueReadResult in
+        the bridge) into the same result its JSON reply has.
+        """
+        pos = 0
+
+        def read(fmt: str) -> tuple:
+            nonlocal pos
+            values = struct.unpack_from(fmt, body, pos)
+            pos += struct.calcsize(fmt)
+            return values
+
+        def read_str() -> str:
+            (length,) = read(">H")
+            return read(f"{length}s")[0].decode("utf-8")
+
+        def number(x: float) -> Optional[float]:
+            return None if math.isnan(x) else x
+
+        token, count = read(">IH")
+        devices = []
+        for _ in range(count):
+            track_index, device_index, kind = read(">HHB")
+            entry: Dict[str, Any] = {"track_index": track_index, "device_index": device_index}
+            if kind == 2:
+                entry["error"] = read_str()
+                devices.append(entry)
+                continue
+            entry["device_name"] = read_str()
+            entry["device_class"] = read_str()
+            (entry["parameter_count"],) = read(">H")
+            if kind == 1:
+                (changed,) = read(">H")
+                entry["changed"] = []
+                for _ in range(changed):
+                    (index,) = read(">H")
+                    entry["changed"].append([index, number(read("<d")[0])])
+            else:
+                entry["values"] = [number(v) for v in read(f"<{entry['parameter_count']}d")]
+            devices.append(entry)
+        return {"token": token, "devices": devices}
+
+    def _complete(self, message: Dict[str, Any]):
+        resp_id = message.get("id") or ""
+        with self._lock:
+            self._stats["responses"] += 1
+            request = self._pending.pop(resp_id, None)
+            if request is None and not resp_id and len(self._pending) == 1:
+                # Bridge versions that don't echo ids: only one candidate
+                request = self._pending.pop(next(iter(self._pending)))
+            if request is None:
+                self._stats["unmatched"] += 1
+        if request is None:
+            logger.debug("M4L response with no waiting request (id %r)", resp_id)
+            return
+        request.response = message
+        request.event.set()
+
+    def _expire_partials(self):
+        cutoff = time.time() - _M4L_PARTIAL_TTL
+        with self._lock:
+            for key in [k for k, p in self._partials.items() if p["updated"] < cutoff]:
+                logger.warning("M4L chunk reassembly: dropping incomplete response %r", key)
+                del self._partials[key]
 
     @staticmethod
     def _parse_m4l_response(data: bytes) -> Dict[str, Any]:
@@ -693,57 +1705,129 @@ class M4LConnection:
 
         raise json.JSONDecodeError("Could not parse M4L response", text, 0)
 
-    def _reassemble_chunked_response(self, first_chunk: Dict[str, Any]) -> Dict[str, Any]:
-        """Reassemble a chunked response from the M4L bridge.
+    def ping(self, timeout: float = None, attempts: int = 2) -> bool:
+        """Check if the M4L bridge device is responding."""
+        try:
+            result = self.send_command("ping", timeout=timeout, attempts=attempts)
+        except Exception:
+            return False
+        if result.get("status") != "success":
+            return False
+        self._capabilities = frozenset((result.get("result") or {}).get("capabilities", []))
+        return True
 
-        Large responses are split into multiple UDP packets, each containing:
-          {"_c": chunk_index, "_t": total_chunks, "_d": "url_safe_base64_piece"}
-        Each _d piece decodes to a fragment of the original JSON string.
-        We collect all chunks, decode each _d, concatenate, and parse.
-        """
-        total = first_chunk["_t"]
-        logger.info("M4L chunked response: %d total chunks", total)
+    def supports(self, capability: str) -> bool:
+        """Whether the loaded bridge advertises *capability* (pings it once if unknown)."""
+        if self._capabilities is None and not self.ping(timeout=2.0, attempts=1):
+            return False
+        return capability in (self._capabilities or ())
 
-        # Store chunks by index
-        chunks: Dict[int, str] = {first_chunk["_c"]: first_chunk["_d"]}
 
-        # Collect remaining chunks
-        # Give extra time: 100ms per chunk + 5s base
-        chunk_timeout = max(5.0, total * 0.1 + 5.0)
-        self.recv_sock.settimeout(chunk_timeout)
+class ParamLayoutCache:
+    """On-disk cache of device parameter layouts, keyed by Live version and class.
 
-        while len(chunks) < total:
-            try:
-                data, _ = self.recv_sock.recvfrom(65535)
-                parsed = self._parse_m4l_response(data)
-                if "_c" in parsed and "_t" in parsed:
-                    chunks[parsed["_c"]] = parsed["_d"]
-                else:
-                    # Got a non-chunk response (maybe from another command?)
-                    logger.warning("M4L chunk reassembly: got non-chunk packet, ignoring")
-            except socket.timeout:
-                logger.error("M4L chunk reassembly: timeout after %d/%d chunks", len(chunks), total)
-                raise Exception(f"Timeout receiving chunked M4L response ({len(chunks)}/{total} chunks received)")
+    A layout is everything discover_params reports except the values
+    (index, name, min, max, is_quantized, default_value, value_items).  It
+    is identical for every instance of a built-in device class, so once a
+    class has been discovered, later discoveries only read the values.
+    Plug-ins, Max devices and racks are never cached: their parameters
+    differ per instance.
+    """
 
-        # Reassemble: decode each piece and concatenate
-        json_parts = []
-        for i in range(total):
-            piece_b64 = chunks[i]
-            padded = piece_b64 + "=" * (-len(piece_b64) % 4)
-            piece_json = base64.urlsafe_b64decode(padded).decode("utf-8")
-            json_parts.append(piece_json)
+    UNCACHEABLE_CLASSES = frozenset([
+        "PluginDevice", "AuPluginDevice",
+        "MxDeviceAudioEffect", "MxDeviceInstrument", "MxDeviceMidiEffect",
+        "AudioEffectGroupDevice", "InstrumentGroupDevice",
+        "MidiEffectGroupDevice", "DrumGroupDevice",
+    ])
 
-        full_json = "".join(json_parts)
-        logger.info("M4L chunked response reassembled: %d chars from %d chunks", len(full_json), total)
-        return json.loads(full_json)
+    _LAYOUT_KEYS = ("index", "name", "min", "max", "is_quantized", "default_value", "value_items")
+
+    def __init__(self, path: str):
+        self.path = path
+        # "live_version|device_class" -> {"parameter_count", "parameters", "saved"}
+        self._layouts: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _ensure_loaded(self):
+        """Load the disk cache on first use.  Call under _lock."""
+        if self._layouts is not None:
+            return
+        self._layouts = {}
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get("version") == 1:
+                self._layouts = data.get("layouts", {})
+                logger.info("Loaded %d parameter layouts from disk", len(self._layouts))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("Failed to load parameter layout cache: %s", e)
 
-    def ping(self) -> bool:
-        """Check if the M4L bridge device is responding."""
+    def _save(self):
+        """Persist all layouts.  Call under _lock."""
         try:
-            result = self.send_command("ping")
-            return result.get("status") == "success"
-        except Exception:
-            return False
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump({"version": 1, "layouts": self._layouts}, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning("Failed to save parameter layout cache: %s", e)
+
+    def merge(self, live_version: str, values: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """discover_params parameters for a get_param_values result, or None.
+
+        None when the class isn't cached, or when the cached layout no
+        longer fits: a different parameter count or a value outside its
+        cached range.
+        """
+        device_class = values.get("device_class", "")
+        raw = values.get("values", [])
+        with self._lock:
+            self._ensure_loaded()
+            layout = self._layouts.get(f"{live_version}|{device_class}")
+        if layout is None or layout["parameter_count"] != len(raw):
+            self.misses += 1
+            return None
+        parameters = []
+        for entry in layout["parameters"]:
+            value = raw[entry["index"]] if entry["index"] < len(raw) else None
+            lo, hi = entry.get("min"), entry.get("max")
+            # Unreadable values stay in as null, so the shape matches discover_params
+            if value is not None and lo is not None and hi is not None \
+                    and not (lo - 1e-6 <= value <= hi + 1e-6):
+                self.misses += 1
+                return None
+            info = {"index": entry["index"], "name": entry["name"], "value": value}
+            info.update((k, entry[k]) for k in self._LAYOUT_KEYS[2:] if k in entry)
+            parameters.append(info)
+        self.hits += 1
+        return parameters
+
+    def store(self, live_version: str, parameter_count: int, discovered: Dict[str, Any]):
+        """Remember the layout of a discover_params result."""
+        device_class = discovered.get("device_class", "")
+        if not device_class or device_class in self.UNCACHEABLE_CLASSES:
+            return
+        layout = {
+            "parameter_count": parameter_count,
+            "parameters": [{k: p[k] for k in self._LAYOUT_KEYS if k in p}
+                           for p in discovered.get("parameters", [])],
+            "saved": time.time(),
+        }
+        with self._lock:
+            self._ensure_loaded()
+            self._layouts[f"{live_version}|{device_class}"] = layout
+            self._save()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            layouts = len(self._layouts) if self._layouts is not None else None
+        return {"layouts": layouts, "hits": self.hits, "misses": self.misses}
 
 
 @asynccontextmanager
@@ -783,31 +1867,13 @@ async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
 
             _m4l_connection = conn
 
-            # Build a raw OSC ping packet
-            ping_id = "autocon"
-            ping_osc = M4LConnection._build_osc_message("/ping", [("s", ping_id)])
-
             for attempt in range(1, 16):  # 15 attempts, ~2s apart
-                try:
-                    # Drain stale data
-                    conn._drain_recv_socket()
-                    conn.recv_sock.settimeout(2.0)
-
-                    # Send ping
-                    conn.send_sock.sendto(ping_osc, (conn.send_host, conn.send_port))
-
-                    # Wait for response
-                    data, _addr = conn.recv_sock.recvfrom(65535)
-                    result = conn._parse_m4l_response(data)
-                    if result.get("status") == "success":
-                        logger.info("M4L bridge auto-connected on attempt %d", attempt)
-                        _m4l_ping_cache["result"] = True
-                        _m4l_ping_cache["timestamp"] = time.time()
-                        return
-                except socket.timeout:
-                    logger.info("M4L auto-connect %d/15: no response (timeout), retrying...", attempt)
-                except Exception as e:
-                    logger.info("M4L auto-connect %d/15: %s", attempt, e)
+                if conn.ping(timeout=2.0, attempts=1):
+                    logger.info("M4L bridge auto-connected on attempt %d", attempt)
+                    _m4l_ping_cache["result"] = True
+                    _m4l_ping_cache["timestamp"] = time.time()
+                    return
+                logger.info("M4L auto-connect %d/15: no response, retrying...", attempt)
                 time.sleep(2)
             logger.warning("M4L bridge not available after 15 attempts — will retry when needed")
 
@@ -848,7 +1914,10 @@ async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
         yield {}
     finally:
         _stop_dashboard_server()
-        global _ableton_connection, _m4l_connection
+        global _ableton_connection, _m4l_connection, _live_subscriber
+        if _live_subscriber:
+            _live_subscriber.stop()
+            _live_subscriber = None
         if _ableton_connection:
             logger.info("Disconnecting from Ableton on shutdown")
             _ableton_connection.disconnect()
@@ -870,6 +1939,20 @@ mcp = FastMCP(
 # Global connections
 _ableton_connection = None
 _m4l_connection = None
+_live_subscriber: Optional[LiveChangeSubscriber] = None
+
+
+def _live_mirror(*topics: str) -> Optional[SessionMirror]:
+    """The change-subscription mirror when it is current for *topics*, else None.
+
+    Current means it also reflects this server's own latest write.
+    """
+    subscriber = _live_subscriber
+    if subscriber is None:
+        return None
+    connection = _ableton_connection
+    barrier = connection.write_barrier if connection is not None else (0, 0.0)
+    return subscriber.mirror_for(*topics, barrier=barrier)
 
 # v1.6.0 feature stores (in-memory, lost on restart)
 _snapshot_store: Dict[str, Dict[str, Any]] = {}
@@ -1006,6 +2089,12 @@ _BROWSER_DISK_CACHE_PATH = os.path.join(_BROWSER_DISK_CACHE_DIR, "browser_cache.
 _BROWSER_DISK_CACHE_PATH_LEGACY = os.path.join(_BROWSER_DISK_CACHE_DIR, "browser_cache.json")
 _BROWSER_DISK_CACHE_MAX_AGE = 604800.0  # 7 days — disk cache ignored if older
 
+# Device parameter layouts, so discovery of a known device class reads values only
+_param_layout_cache = ParamLayoutCache(os.path.join(_BROWSER_DISK_CACHE_DIR, "param_layouts.json.gz"))
+# Live version the layouts are keyed by; re-read now and then in case Live restarted
+_m4l_live_version_cache = {"value": None, "timestamp": 0.0}
+_M4L_LIVE_VERSION_TTL = 600.0
+
 # Dynamic device URI map — built from browser cache after each scan.
 # Maps lowercase device name -> correct URI from Ableton's LOM.
 _device_uri_map: Dict[str, str] = {}
@@ -1476,6 +2565,10 @@ async function refresh() {
       card('Macros', d.store_counts.macros, ''),
       card('Param Maps', d.store_counts.param_maps, ''),
       card('Total Tool Calls', d.total_tool_calls, ''),
+      card('Read Cache Hits', d.result_cache.hits+' / '+(d.result_cache.hits+d.result_cache.misses)+
+           ' ('+Math.round(d.result_cache.hit_rate*100)+'%)', ''),
+      card('Cache Evictions', d.result_cache.evictions+' LRU, '+d.result_cache.invalidations+' writes, '+
+           d.result_cache.expirations+' TTL', ''),
     ].join('');
     // Top tools
     const tt = document.getElementById('top-tools-section');
@@ -1549,7 +2642,7 @@ def _get_m4l_status() -> tuple:
         return sockets_ready, _m4l_ping_cache["result"]
 
     try:
-        result = _m4l_connection.ping()
+        result = _m4l_connection.ping(timeout=2.0, attempts=1)
     except Exception:
         result = False
 
@@ -1586,8 +2679,13 @@ def _build_status_json() -> dict:
         "version": _get_server_version(),
         "uptime_seconds": round(time.time() - _server_start_time, 1) if _server_start_time else 0,
         "ableton_connected": ableton_connected,
+        "ableton_wire_format": _ableton_connection.wire_format if ableton_connected else None,
+        "result_cache": (_ableton_connection.result_cache if _ableton_connection else ResultCache()).stats(),
+        "live_mirror": _live_subscriber.stats() if _live_subscriber else None,
         "m4l_connected": m4l_connected,
         "m4l_sockets_ready": m4l_sockets_ready,
+        "m4l_bridge": _m4l_connection.stats() if _m4l_connection else None,
+        "param_layout_cache": _param_layout_cache.stats(),
         "store_counts": {
             "snapshots": len(_snapshot_store),
             "macros": len(_macro_store),
@@ -1751,18 +2849,73 @@ def get_m4l_connection() -> M4LConnection:
     return _m4l_connection
 
 
+# Parameters per typed set_hidden_params message (8 bytes each on the wire)
+_M4L_PARAM_BATCH_SIZE = 64
+
+
 def _m4l_batch_set_params(
     m4l: M4LConnection,
     track_index: int,
     device_index: int,
     parameters: List[Dict],
 ) -> Dict[str, Any]:
-    """Set multiple hidden parameters by sending individual set_hidden_param
-    commands sequentially.  More reliable than the base64-encoded batch OSC
-    approach which can fail with longer payloads in Max.
+    """Set multiple hidden parameters on one device.
+
+    Bridges advertising "set_hidden_params" take the parameters as typed
+    OSC (index, value) pairs, up to _M4L_PARAM_BATCH_SIZE per message, and
+    acknowledge each one; a parameter missing from both the acks and the
+    errors of its reply counts as failed.  Older bridges get one
+    set_hidden_param round trip per parameter.
 
     Returns a dict with keys: params_set, params_failed, total_requested, errors.
     """
+    if not m4l.supports("set_hidden_params"):
+        return _m4l_set_params_sequential(m4l, track_index, device_index, parameters)
+
+    ok = 0
+    failed = 0
+    errors: List[str] = []
+    for start in range(0, len(parameters), _M4L_PARAM_BATCH_SIZE):
+        batch = parameters[start:start + _M4L_PARAM_BATCH_SIZE]
+        try:
+            result = m4l.send_command("set_hidden_params", {
+                "track_index": track_index,
+                "device_index": device_index,
+                "parameters": batch,
+            })
+        except Exception as e:
+            result = {"status": "error", "message": str(e)}
+        if result.get("status") != "success":
+            failed += len(batch)
+            errors.append(f"[{batch[0]['index']}..{batch[-1]['index']}]: {result.get('message', '?')}")
+            continue
+        data = result.get("result") or {}
+        acks = data.get("acks", [])
+        param_errors = data.get("errors", [])
+        ok += len(acks)
+        failed += len(param_errors)
+        errors.extend(f"[{e.get('index')}]: {e.get('error', '?')}" for e in param_errors)
+        unacknowledged = len(batch) - len(acks) - len(param_errors)
+        if unacknowledged > 0:
+            failed += unacknowledged
+            errors.append(f"{unacknowledged} parameter(s) not acknowledged")
+    return {
+        "params_set": ok,
+        "params_failed": failed,
+        "total_requested": ok + failed,
+        "errors": errors,
+    }
+
+
+def _m4l_set_params_sequential(
+    m4l: M4LConnection,
+    track_index: int,
+    device_index: int,
+    parameters: List[Dict],
+) -> Dict[str, Any]:
+    """Fallback for bridges without set_hidden_params: one
+    set_hidden_param command per parameter, sent sequentially.
+    """
     ok = 0
     failed = 0
     errors: List[str] = []
@@ -1793,6 +2946,100 @@ def _m4l_batch_set_params(
     }
 
 
+def _m4l_live_version(m4l: M4LConnection) -> Optional[str]:
+    """Live's version string via the bridge (cached), or None if unavailable."""
+    now = time.time()
+    if _m4l_live_version_cache["value"] and now - _m4l_live_version_cache["timestamp"] < _M4L_LIVE_VERSION_TTL:
+        return _m4l_live_version_cache["value"]
+    try:
+        data = _m4l_result(m4l.send_command("get_app_version"))
+    except Exception as e:
+        logger.debug("Could not read Live version: %s", e)
+        return None
+    version = data.get("version_string") or ".".join(
+        str(data.get(k)) for k in ("major", "minor", "bugfix") if data.get(k) is not None)
+    if not version:
+        return None
+    _m4l_live_version_cache["value"] = version
+    _m4l_live_version_cache["timestamp"] = now
+    return version
+
+
+def _m4l_discover_params(m4l: M4LConnection, track_index: int, device_index: int) -> Dict[str, Any]:
+    """discover_params, answered from the parameter layout cache when possible.
+
+    Reads the device's values with get_param_values (one LOM read per
+    parameter) and merges them with the cached layout of its class.  On a
+    cache miss the full discovery runs and its layout is cached.  Returns
+    the bridge response, same shape as send_command("discover_params").
+    """
+    params = {"track_index": track_index, "device_index": device_index}
+    live_version = _m4l_live_version(m4l) if m4l.supports("get_param_values") else None
+    if live_version is None:
+        return m4l.send_command("discover_params", params)
+
+    values_result = m4l.send_command("get_param_values", params)
+    if values_result.get("status") != "success":
+        return values_result
+    values = values_result.get("result", {})
+    return (_m4l_merge_layout(live_version, values, values_result.get("id"))
+            or _m4l_discover_and_cache(m4l, live_version, track_index, device_index, values))
+
+
+# Devices per read_param_values request
+_M4L_VALUE_READ_MAX_DEVICES = 64
+
+
+def _m4l_discover_many(m4l: M4LConnection, devices: List[tuple]) -> List[Dict[str, Any]]:
+    """_m4l_discover_params for several (track_index, device_index) pairs.
+
+    The values of all devices come from one read_param_values exchange per
+    _M4L_VALUE_READ_MAX_DEVICES devices; only devices whose class layout is
+    not cached get a full discovery.  Returns one bridge response per pair.
+    """
+    live_version = _m4l_live_version(m4l) if m4l.supports("read_param_values") else None
+    if live_version is None:
+        return [_m4l_discover_params(m4l, ti, di) for ti, di in devices]
+
+    responses = []
+    for start in range(0, len(devices), _M4L_VALUE_READ_MAX_DEVICES):
+        batch = devices[start:start + _M4L_VALUE_READ_MAX_DEVICES]
+        read = m4l.send_command("read_param_values", {"devices": batch})
+        if read.get("status") != "success":
+            responses.extend([read] * len(batch))
+            continue
+        for (ti, di), entry in zip(batch, read.get("result", {}).get("devices", [])):
+            if "error" in entry:
+                responses.append({"status": "error", "message": entry["error"]})
+            else:
+                responses.append(_m4l_merge_layout(live_version, entry)
+                                 or _m4l_discover_and_cache(m4l, live_version, ti, di, entry))
+    return responses
+
+
+def _m4l_merge_layout(live_version: str, values: Dict[str, Any],
+                      response_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """A discover_params response built from cached layout + values, or None on a miss."""
+    parameters = _param_layout_cache.merge(live_version, values)
+    if parameters is None:
+        return None
+    return {"status": "success", "id": response_id, "result": {
+        "device_name": values.get("device_name", "Unknown"),
+        "device_class": values.get("device_class", "Unknown"),
+        "parameter_count": len(parameters),
+        "parameters": parameters,
+    }}
+
+
+def _m4l_discover_and_cache(m4l: M4LConnection, live_version: str, track_index: int,
+                            device_index: int, values: Dict[str, Any]) -> Dict[str, Any]:
+    """Full discover_params walk; caches the layout for the next time."""
+    result = m4l.send_command("discover_params", {"track_index": track_index, "device_index": device_index})
+    if result.get("status") == "success":
+        _param_layout_cache.store(live_version, values.get("parameter_count", 0), result.get("result", {}))
+    return result
+
+
 # --- Input validation helpers ---
 
 def _validate_index(value: int, name: str) -> None:
@@ -1819,6 +3066,28 @@ def _validate_range(value: float, name: str, min_val: float, max_val: float) ->
         raise ValueError(f"{name} must be between {min_val} and {max_val}, got {value}.")
 
 
+def _parse_fields(fields: str) -> Optional[list]:
+    """Parse a field selection given as a JSON array or comma-separated names."""
+    if not fields or not fields.strip():
+        return None
+    if fields.strip().startswith("["):
+        parsed = json.loads(fields)
+        if not isinstance(parsed, list) or not all(isinstance(f, str) for f in parsed):
+            raise ValueError("fields must be a JSON array of field names.")
+        return parsed
+    return [f.strip() for f in fields.split(",") if f.strip()]
+
+
+def _add_paging(params: Dict[str, Any], prefix: str, offset: int, limit: Optional[int]) -> None:
+    """Validate an offset/limit pair and add the non-default values to *params*."""
+    _validate_index(offset, f"{prefix}offset")
+    if offset:
+        params[f"{prefix}offset"] = offset
+    if limit is not None:
+        _validate_index(limit, f"{prefix}limit")
+        params[f"{prefix}limit"] = limit
+
+
 def _validate_notes(notes: list) -> None:
     """Validate the structure of a MIDI notes list."""
     if not isinstance(notes, list):
@@ -2045,16 +3314,41 @@ def get_session_info(ctx: Context) -> str:
 
 @mcp.tool()
 @_tool_handler("getting track info")
-def get_track_info(ctx: Context, track_index: int) -> str:
+def get_track_info(ctx: Context, track_index: int, fields: str = "",
+                   slot_offset: int = 0, slot_limit: Optional[int] = None,
+                   device_offset: int = 0, device_limit: Optional[int] = None) -> str:
     """
     Get detailed information about a specific track in Ableton.
 
+    On large sets, ask only for what you need: unrequested fields are never
+    read from Live, so smaller requests are also faster. Requests for only
+    index, name and devices are served from the subscribe_live_changes
+    mirror without a round trip while it covers those topics.
+
     Parameters:
     - track_index: The index of the track to get information about
+    - fields: Optional comma-separated (or JSON array) subset of: index, name, is_group_track,
+      is_audio_track, is_midi_track, mute, solo, arm, volume, panning, is_grouped,
+      group_track_index, is_visible, is_showing_chains, can_show_chains, playing_slot_index,
+      fired_slot_index, clip_slots, devices (default: all)
+    - slot_offset / slot_limit: Page of clip slots to return (reports clip_slot_count when paged)
+    - device_offset / device_limit: Page of devices to return (reports device_count when paged)
     """
     _validate_index(track_index, "track_index")
-    ableton = get_ableton_connection()
-    result = ableton.send_command("get_track_info", {"track_index": track_index})
+    params: Dict[str, Any] = {"track_index": track_index}
+    selected = _parse_fields(fields)
+    if selected:
+        params["fields"] = selected
+    _add_paging(params, "slot_", slot_offset, slot_limit)
+    _add_paging(params, "device_", device_offset, device_limit)
+    if selected and set(selected) <= SessionMirror.MIRRORED_TRACK_FIELDS:
+        mirror = _live_mirror("tracks", *(["devices"] if "devices" in selected else []))
+        if mirror is not None:
+            result = mirror.track_info(track_index, selected, device_offset, device_limit)
+            if result is not None:
+                return json.dumps(result)
+    ableton = get_ableton_connection()
+    result = ableton.send_command("get_track_info", params)
     return json.dumps(result)
 
 @mcp.tool()
@@ -2692,10 +3986,22 @@ def set_clip_color(ctx: Context, track_index: int, clip_index: int, color_index:
 
 @mcp.tool()
 @_tool_handler("getting scenes")
-def get_scenes(ctx: Context) -> str:
-    """Get information about all scenes in the session."""
+def get_scenes(ctx: Context, fields: str = "", offset: int = 0, limit: Optional[int] = None) -> str:
+    """
+    Get information about all scenes in the session.
+
+    Parameters:
+    - fields: Optional comma-separated (or JSON array) subset of: index, name, tempo,
+      is_triggered, color_index (default: all)
+    - offset / limit: Page of scenes to return (reports the total when paged)
+    """
+    params: Dict[str, Any] = {}
+    selected = _parse_fields(fields)
+    if selected:
+        params["fields"] = selected
+    _add_paging(params, "", offset, limit)
     ableton = get_ableton_connection()
-    result = ableton.send_command("get_scenes")
+    result = ableton.send_command("get_scenes", params)
     return json.dumps(result)
 
 @mcp.tool()
@@ -3017,6 +4323,39 @@ def get_device_parameters(ctx: Context, track_index: int, device_index: int,
     })
     return json.dumps(result)
 @mcp.tool()
+@_tool_handler("prewarming display values")
+def prewarm_display_values(ctx: Context, track_index: int, device_index: int,
+                           parameter_names: str = "", track_type: str = "track") -> str:
+    """
+    Precompute display-string lookups for a device so later value_display sets are instant.
+
+    Setting a parameter by display string (e.g. an LFO rate of "1/4") normally
+    scans the parameter's values on Ableton's main thread. This fills the
+    lookup tables a few hundred values per tick in the background; they are
+    shared by every device of the same type.
+
+    Parameters:
+    - track_index: The index of the track containing the device
+    - device_index: The index of the device on the track
+    - parameter_names: Optional JSON list of parameter names, e.g. '["Rate", "Filter Type"]' (default: all)
+    - track_type: Type of track: "track" (default), "return", or "master"
+    """
+    _validate_index(track_index, "track_index")
+    _validate_index(device_index, "device_index")
+    if track_type not in ("track", "return", "master"):
+        return "Error: track_type must be 'track', 'return', or 'master'"
+    names = json.loads(parameter_names) if parameter_names else None
+    if names is not None and not isinstance(names, list):
+        return "Error: parameter_names must be a JSON array of parameter names"
+    ableton = get_ableton_connection()
+    result = ableton.send_command("prewarm_display_values", {
+        "track_index": track_index,
+        "device_index": device_index,
+        "parameter_names": names,
+        "track_type": track_type,
+    })
+    return json.dumps(result)
+@mcp.tool()
 @_tool_handler("setting device parameter")
 def set_device_parameter(ctx: Context, track_index: int, device_index: int,
                           parameter_name: str, value: float,
@@ -3159,6 +4498,293 @@ def realtime_batch_set_parameters(ctx: Context, track_index: int, device_index:
     })
     return f"Sent real-time batch update for {len(params_list)} parameters (fire-and-forget via UDP)"
 @mcp.tool()
+@_tool_handler("getting real-time update stats")
+def get_realtime_stats(ctx: Context) -> str:
+    """
+    Get counters for the UDP real-time parameter path.
+
+    Bursts of real-time updates are collapsed so each parameter is written at
+    most once per Ableton tick. Returns how many updates were received,
+    coalesced (superseded before being applied), dropped as out of order,
+    applied and failed, plus the number of flushes.
+    """
+    ableton = get_ableton_connection()
+    result = ableton.send_command("get_realtime_stats")
+    return json.dumps(result)
+@mcp.tool()
+@_tool_handler("starting parameter ramp")
+def start_parameter_ramp(ctx: Context, track_index: int, device_index: int, parameter_name: str,
+                         end_value: float, duration: float, start_value: Optional[float] = None,
+                         shape: str = "linear", steps: int = 4, sync: bool = False,
+                         track_type: str = "track") -> str:
+    """
+    Ramp a device parameter to a target value, run inside Ableton.
+
+    The Remote Script moves the parameter itself on every Ableton tick, so a
+    sweep costs one command instead of a stream of real-time updates. The
+    ramp finishes holding end_value. Starting a ramp or LFO on a parameter
+    replaces the one already running there.
+
+    Parameters:
+    - track_index, device_index, parameter_name: The parameter to move
+    - end_value: Target value, in the parameter's own units
+    - duration: Ramp length, in seconds (or beats when sync is true)
+    - start_value: Value to start from (default: the current value)
+    - shape: "linear", "exponential", "s_curve" or "stepped"
+    - steps: Number of levels for the "stepped" shape
+    - sync: Follow the song position in beats (tempo-synced, pauses with the transport)
+    - track_type: Type of track: "track" (default), "return", or "master"
+    """
+    _validate_index(track_index, "track_index")
+    _validate_index(device_index, "device_index")
+    if track_type not in ("track", "return", "master"):
+        return "Error: track_type must be 'track', 'return', or 'master'"
+    if duration <= 0:
+        return "Error: duration must be positive"
+    ableton = get_ableton_connection()
+    result = ableton.send_command("start_parameter_modulation", {
+        "kind": "ramp",
+        "track_index": track_index,
+        "device_index": device_index,
+        "parameter_name": parameter_name,
+        "track_type": track_type,
+        "start_value": start_value,
+        "end_value": end_value,
+        "duration": duration,
+        "shape": shape,
+        "steps": steps,
+        "sync": sync,
+    })
+    return json.dumps(result)
+@mcp.tool()
+@_tool_handler("starting parameter LFO")
+def start_parameter_lfo(ctx: Context, track_index: int, device_index: int, parameter_name: str,
+                        period: float, min_value: Optional[float] = None,
+                        max_value: Optional[float] = None, shape: str = "sine",
+                        phase: float = 0.0, duration: Optional[float] = None, steps: int = 4,
+                        sync: bool = False, track_type: str = "track") -> str:
+    """
+    Modulate a device parameter periodically (LFO), run inside Ableton.
+
+    Parameters:
+    - track_index, device_index, parameter_name: The parameter to modulate
+    - period: Cycle length, in seconds (or beats when sync is true)
+    - min_value / max_value: Modulation range (default: the parameter's full range)
+    - shape: "sine", "triangle", "saw", "square" or "stepped"
+    - phase: Starting phase, 0.0-1.0
+    - duration: Stop after this long (default: run until stopped)
+    - steps: Number of levels per cycle for the "stepped" shape
+    - sync: Follow the song position in beats (tempo-synced, pauses with the transport)
+    - track_type: Type of track: "track" (default), "return", or "master"
+    """
+    _validate_index(track_index, "track_index")
+    _validate_index(device_index, "device_index")
+    if track_type not in ("track", "return", "master"):
+        return "Error: track_type must be 'track', 'return', or 'master'"
+    if period <= 0:
+        return "Error: period must be positive"
+    ableton = get_ableton_connection()
+    result = ableton.send_command("start_parameter_modulation", {
+        "kind": "lfo",
+        "track_index": track_index,
+        "device_index": device_index,
+        "parameter_name": parameter_name,
+        "track_type": track_type,
+        "period": period,
+        "min_value": min_value,
+        "max_value": max_value,
+        "shape": shape,
+        "phase": phase,
+        "duration": duration,
+        "steps": steps,
+        "sync": sync,
+    })
+    return json.dumps(result)
+@mcp.tool()
+@_tool_handler("modifying parameter modulation")
+def modify_parameter_modulation(ctx: Context, modulator_id: int, settings: str,
+                                restart: bool = False) -> str:
+    """
+    Change a running ramp or LFO without stopping it.
+
+    Parameters:
+    - modulator_id: ID returned by start_parameter_ramp / start_parameter_lfo
+    - settings: JSON object of fields to change, e.g. '{"period": 2.0, "max_value": 0.8}'.
+      Accepted: shape, start_value, end_value, min_value, max_value, duration, period, phase, steps
+    - restart: Restart the ramp/cycle from the beginning
+    """
+    _validate_index(modulator_id, "modulator_id")
+    fields = json.loads(settings) if isinstance(settings, str) else settings
+    if not isinstance(fields, dict):
+        return "Error: settings must be a JSON object"
+    fields = dict(fields, modulator_id=modulator_id, restart=restart)
+    ableton = get_ableton_connection()
+    result = ableton.send_command("modify_parameter_modulation", fields)
+    return json.dumps(result)
+@mcp.tool()
+@_tool_handler("stopping parameter modulation")
+def stop_parameter_modulation(ctx: Context, modulator_id: Optional[int] = None) -> str:
+    """
+    Stop a running ramp or LFO; the parameter keeps its current value.
+
+    Parameters:
+    - modulator_id: The modulator to stop (default: stop all)
+    """
+    params = {}
+    if modulator_id is not None:
+        _validate_index(modulator_id, "modulator_id")
+        params["modulator_id"] = modulator_id
+    ableton = get_ableton_connection()
+    result = ableton.send_command("stop_parameter_modulation", params)
+    return json.dumps(result)
+@mcp.tool()
+@_tool_handler("getting parameter modulations")
+def get_parameter_modulations(ctx: Context) -> str:
+    """
+    List the ramps and LFOs currently running inside Ableton, with their
+    settings, elapsed time and last written value.
+    """
+    ableton = get_ableton_connection()
+    result = ableton.send_command("get_parameter_modulations")
+    return json.dumps(result)
+@mcp.tool()
+@_tool_handler("scheduling command")
+def schedule_command(ctx: Context, command_type: str, params: str = "{}",
+                     at_beat: Optional[float] = None, at_bar: Optional[float] = None,
+                     quantize: Optional[str] = None,
+                     max_lateness_beats: Optional[float] = None) -> str:
+    """
+    Run a modifying command at a musical position instead of immediately.
+
+    The command is held inside Ableton and fired from the tick closest to
+    the target song position, avoiding network and queueing jitter. It only
+    fires while the transport is playing. Give exactly one of at_beat,
+    at_bar or quantize.
+
+    Parameters:
+    - command_type: Any modifying command, e.g. "fire_clip", "set_track_volume", "set_device_parameter"
+    - params: JSON object of the command's parameters, e.g. '{"track_index": 0, "clip_index": 2}'
+    - at_beat: Absolute song position in beats
+    - at_bar: Song position as a 1-based bar number (e.g. 17 = start of bar 17)
+    - quantize: Next boundary: "global" (the song's launch quantization), "8_bars", "4_bars",
+      "2_bars", "bar", "half", "quarter", "eighth", "sixteenth", "thirtysecond" or a triplet
+      variant such as "eighth_triplet"
+    - max_lateness_beats: Skip the command if it would fire later than this (e.g. after a jump)
+
+    Use get_scheduled_commands to see pending commands and measured lateness.
+    """
+    targets = [t for t in (at_beat, at_bar, quantize) if t is not None]
+    if len(targets) != 1:
+        return "Error: give exactly one of at_beat, at_bar or quantize"
+    command_params = json.loads(params) if isinstance(params, str) else params
+    if not isinstance(command_params, dict):
+        return "Error: params must be a JSON object"
+    ableton = get_ableton_connection()
+    result = ableton.send_command("schedule_command", {
+        "command": command_type,
+        "params": command_params,
+        "at_beat": at_beat,
+        "at_bar": at_bar,
+        "quantize": quantize,
+        "max_lateness_beats": max_lateness_beats,
+    })
+    return json.dumps(result)
+@mcp.tool()
+@_tool_handler("cancelling scheduled command")
+def cancel_scheduled_command(ctx: Context, scheduled_id: Optional[int] = None) -> str:
+    """
+    Cancel a pending scheduled command.
+
+    Parameters:
+    - scheduled_id: ID returned by schedule_command (default: cancel all)
+    """
+    params = {}
+    if scheduled_id is not None:
+        _validate_index(scheduled_id, "scheduled_id")
+        params["scheduled_id"] = scheduled_id
+    ableton = get_ableton_connection()
+    result = ableton.send_command("cancel_scheduled_command", params)
+    return json.dumps(result)
+@mcp.tool()
+@_tool_handler("getting scheduled commands")
+def get_scheduled_commands(ctx: Context) -> str:
+    """
+    List pending scheduled commands and the recently fired ones.
+
+    Each fired command reports its target and fired song positions and its
+    lateness in beats and milliseconds (negative = slightly early), plus
+    aggregate timing stats for measuring scheduling accuracy.
+    """
+    ableton = get_ableton_connection()
+    result = ableton.send_command("get_scheduled_commands")
+    return json.dumps(result)
+@mcp.tool()
+@_tool_handler("loading timeline")
+def load_timeline(ctx: Context, events: str, start_beat: float = 0.0, quantize: Optional[str] = None,
+                  name: Optional[str] = None, paused: bool = False) -> str:
+    """
+    Upload a cue list of timed commands that Ableton plays back by itself.
+
+    Events fire from inside Ableton while the transport runs, on the tick
+    nearest their beat. Playback follows the transport: loop wraps repeat
+    the events inside the loop, jumps (set_song_time, arrangement clicks)
+    skip the events jumped over, and nothing fires while stopped or paused.
+
+    Parameters:
+    - events: JSON array of events, e.g.
+      '[{"beat": 0, "type": "fire_scene", "params": {"scene_index": 0}},
+        {"beat": 16, "type": "set_tempo", "params": {"tempo": 128}},
+        {"beat": 16, "type": "set_device_parameter", "params": {"track_index": 0, "device_index": 0,
+         "parameter_name": "Filter Freq", "value": 0.7}}]'
+      "type" can be any modifying command (fire_clip, fire_scene, set_track_volume, set_tempo, ...)
+    - start_beat: Song position added to every event's beat (default 0 = beats are absolute)
+    - quantize: Instead of start_beat, start at the next boundary ("bar", "4_bars", "global", ...)
+    - name: Optional label
+    - paused: Load without playing; start it with control_timeline(action="resume")
+
+    Returns the timeline ID used by control_timeline.
+    """
+    events_list = json.loads(events) if isinstance(events, str) else events
+    if not isinstance(events_list, list) or not events_list:
+        return "Error: events must be a non-empty JSON array of {beat, type, params} objects"
+    params = {"events": events_list, "start_beat": start_beat, "paused": paused}
+    if quantize:
+        params["quantize"] = quantize
+    if name:
+        params["name"] = name
+    ableton = get_ableton_connection()
+    result = ableton.send_command("load_timeline", params)
+    return json.dumps(result)
+@mcp.tool()
+@_tool_handler("controlling timeline")
+def control_timeline(ctx: Context, action: str, timeline_id: Optional[int] = None) -> str:
+    """
+    Pause, resume or remove a loaded timeline.
+
+    Parameters:
+    - action: "pause", "resume" (continues from the current song position) or "remove"
+    - timeline_id: ID returned by load_timeline (default: all timelines)
+    """
+    if action not in ("pause", "resume", "remove"):
+        return "Error: action must be 'pause', 'resume' or 'remove'"
+    params = {"action": action}
+    if timeline_id is not None:
+        _validate_index(timeline_id, "timeline_id")
+        params["timeline_id"] = timeline_id
+    ableton = get_ableton_connection()
+    result = ableton.send_command("control_timeline", params)
+    return json.dumps(result)
+@mcp.tool()
+@_tool_handler("getting timelines")
+def get_timelines(ctx: Context) -> str:
+    """
+    List loaded timelines with their next event beat, fired/failed counts and
+    timing accuracy (lateness in ms).
+    """
+    ableton = get_ableton_connection()
+    result = ableton.send_command("get_timelines")
+    return json.dumps(result)
+@mcp.tool()
 @_tool_handler("getting user library")
 def get_user_library(ctx: Context) -> str:
     """
@@ -3817,10 +5443,7 @@ def discover_device_params(ctx: Context, track_index: int, device_index: int) ->
     _validate_index(device_index, "device_index")
 
     m4l = get_m4l_connection()
-    result = m4l.send_command("discover_params", {
-        "track_index": track_index,
-        "device_index": device_index
-    })
+    result = _m4l_discover_params(m4l, track_index, device_index)
 
     data = _m4l_result(result)
     return json.dumps(data)
@@ -3844,10 +5467,7 @@ def get_device_hidden_parameters(ctx: Context, track_index: int, device_index: i
     _validate_index(device_index, "device_index")
 
     m4l = get_m4l_connection()
-    result = m4l.send_command("get_hidden_params", {
-        "track_index": track_index,
-        "device_index": device_index
-    })
+    result = _m4l_discover_params(m4l, track_index, device_index)
 
     data = _m4l_result(result)
     device_name = data.get("device_name", "Unknown")
@@ -3870,6 +5490,52 @@ def get_device_hidden_parameters(ctx: Context, track_index: int, device_index: i
     return output
 
 
+@mcp.tool()
+@_tool_handler("reading device parameter values")
+def get_device_param_values(
+    ctx: Context,
+    devices: List[Dict[str, int]],
+    since_token: int = 0
+) -> str:
+    """Read the current values of ALL parameters (including hidden ones) of one or more devices.
+
+    Returns only values, as a flat array per device indexed by LOM parameter
+    index: far faster than get_device_hidden_parameters when the names and
+    ranges are already known (from discover_device_params). All devices are
+    read in a single exchange with the M4L bridge.
+
+    Parameters:
+    - devices: List of {"track_index": int, "device_index": int} dicts (up to 64)
+    - since_token: The "token" of an earlier call. Devices last read under that
+      token return only "changed": [[parameter_index, value], ...]; others
+      return the full "values" array. 0 = always full values.
+
+    Unreadable parameters are null.
+
+    Requires the AbletonMCP_Bridge M4L device to be loaded on any track.
+    """
+    if not isinstance(devices, list) or len(devices) == 0:
+        raise ValueError("devices must be a non-empty list.")
+    if len(devices) > _M4L_VALUE_READ_MAX_DEVICES:
+        raise ValueError(f"At most {_M4L_VALUE_READ_MAX_DEVICES} devices per call, got {len(devices)}.")
+    refs = []
+    for i, d in enumerate(devices):
+        if not isinstance(d, dict) or "track_index" not in d or "device_index" not in d:
+            raise ValueError(f"Device at index {i} must have 'track_index' and 'device_index' keys.")
+        _validate_index(d["track_index"], "track_index")
+        _validate_index(d["device_index"], "device_index")
+        refs.append((d["track_index"], d["device_index"]))
+    _validate_index(since_token, "since_token")
+
+    m4l = get_m4l_connection()
+    if not m4l.supports("read_param_values"):
+        raise Exception("The loaded M4L bridge is too old for get_device_param_values; update the AbletonMCP_Bridge device.")
+    result = m4l.send_command("read_param_values", {"devices": refs, "since_token": since_token})
+    data = _m4l_result(result)
+    data["since_token"] = since_token
+    return json.dumps(data)
+
+
 @mcp.tool()
 @_tool_handler("setting hidden device parameter")
 def set_device_hidden_parameter(
@@ -4404,34 +6070,11 @@ def batch_set_hidden_parameters(
     if len(safe_params) == 0:
         return "No settable parameters after filtering (parameter 0 'Device On' is excluded)."
 
-    # Send individual set_hidden_param commands with a small delay between
-    # each to avoid overwhelming Ableton.  This is more reliable than the
-    # base64-encoded batch OSC approach which can fail with long payloads.
     m4l = get_m4l_connection()
-    ok_count = 0
-    fail_count = 0
-    errors = []
-
-    for p in safe_params:
-        try:
-            result = m4l.send_command("set_hidden_param", {
-                "track_index": track_index,
-                "device_index": device_index,
-                "parameter_index": int(p["index"]),
-                "value": float(p["value"])
-            })
-            if result.get("status") == "success":
-                ok_count += 1
-            else:
-                fail_count += 1
-                errors.append(f"[{p['index']}]: {result.get('message', '?')}")
-        except Exception as e:
-            fail_count += 1
-            errors.append(f"[{p['index']}]: {str(e)}")
-
-        # Small delay between params to let Ableton breathe
-        if len(safe_params) > 6:
-            time.sleep(0.05)
+    data = _m4l_batch_set_params(m4l, track_index, device_index, safe_params)
+    ok_count = data["params_set"]
+    fail_count = data["params_failed"]
+    errors = data["errors"]
 
     total = ok_count + fail_count
     msg = f"Batch set complete: {ok_count}/{total} parameters set successfully ({fail_count} failed)."
@@ -4465,10 +6108,7 @@ def snapshot_device_state(
     _validate_index(device_index, "device_index")
 
     m4l = get_m4l_connection()
-    result = m4l.send_command("discover_params", {
-        "track_index": track_index,
-        "device_index": device_index
-    })
+    result = _m4l_discover_params(m4l, track_index, device_index)
 
     if result.get("status") != "success":
         return f"M4L bridge error: {result.get('message', 'Unknown error')}"
@@ -4665,36 +6305,41 @@ def snapshot_all_devices(
     snapshot_ids = []
     device_count = 0
 
-    for ti in track_indices:
-        track_info = ableton.send_command("get_track_info", {"track_index": ti})
-        devices = track_info.get("devices", [])
-
-        for di, dev in enumerate(devices):
-            result = m4l.send_command("discover_params", {
-                "track_index": ti,
-                "device_index": di
-            })
-
-            if result.get("status") != "success":
-                continue
+    # Independent reads: pipelined, so Live can spread them over its ticks
+    # instead of answering one per round trip or all in one tick
+    track_results = ableton.send_pipelined(
+        [("get_track_info", {"track_index": ti, "fields": ["devices"]}) for ti in track_indices])
+
+    device_refs = []
+    for ti, entry in zip(track_indices, track_results):
+        if entry.get("status") != "success":
+            raise Exception(entry.get("message", "Unknown error from Ableton"))
+        devices = entry.get("result", {}).get("devices", [])
+        device_refs.extend((ti, di) for di in range(len(devices)))
+
+    # One value read for every device; full discovery only for device
+    # classes whose parameter layout isn't cached yet
+    for (ti, di), result in zip(device_refs, _m4l_discover_many(m4l, device_refs)):
+        if result.get("status") != "success":
+            continue
 
-            data = result.get("result", {})
-            snap_id = str(uuid.uuid4())[:8]
-
-            _snapshot_store[snap_id] = {
-                "id": snap_id,
-                "group_id": group_id,
-                "name": f"{data.get('device_name', 'Unknown')}_t{ti}_d{di}",
-                "timestamp": timestamp,
-                "track_index": ti,
-                "device_index": di,
-                "device_name": data.get("device_name", "Unknown"),
-                "device_class": data.get("device_class", "Unknown"),
-                "parameter_count": data.get("parameter_count", 0),
-                "parameters": data.get("parameters", [])
-            }
-            snapshot_ids.append(snap_id)
-            device_count += 1
+        data = result.get("result", {})
+        snap_id = str(uuid.uuid4())[:8]
+
+        _snapshot_store[snap_id] = {
+            "id": snap_id,
+            "group_id": group_id,
+            "name": f"{data.get('device_name', 'Unknown')}_t{ti}_d{di}",
+            "timestamp": timestamp,
+            "track_index": ti,
+            "device_index": di,
+            "device_name": data.get("device_name", "Unknown"),
+            "device_class": data.get("device_class", "Unknown"),
+            "parameter_count": data.get("parameter_count", 0),
+            "parameters": data.get("parameters", [])
+        }
+        snapshot_ids.append(snap_id)
+        device_count += 1
 
     group_name = snapshot_name or f"group_{group_id}"
 
@@ -5083,10 +6728,7 @@ def generate_preset(
         raise ValueError("variation_count must be between 1 and 5.")
 
     m4l = get_m4l_connection()
-    result = m4l.send_command("discover_params", {
-        "track_index": track_index,
-        "device_index": device_index
-    })
+    result = _m4l_discover_params(m4l, track_index, device_index)
 
     if result.get("status") != "success":
         return f"M4L bridge error: {result.get('message', 'Unknown error')}"
@@ -5170,10 +6812,7 @@ def create_parameter_map(
         raise ValueError("friendly_names must be a non-empty list.")
 
     m4l = get_m4l_connection()
-    result = m4l.send_command("discover_params", {
-        "track_index": track_index,
-        "device_index": device_index
-    })
+    result = _m4l_discover_params(m4l, track_index, device_index)
 
     data = _m4l_result(result)
     device_name = data.get("device_name", "Unknown")
@@ -6203,33 +7842,19 @@ def grid_to_clip(
         return "Error: No notes parsed from grid. Check the grid format."
 
     ableton = get_ableton_connection()
+    slot = {"track_index": track_index, "clip_index": clip_index}
 
-    # Create clip if it doesn't exist (ignore error if it already exists)
-    try:
-        ableton.send_command("create_clip", {
-            "track_index": track_index,
-            "clip_index": clip_index,
-            "length": length,
-        })
-    except Exception:
-        pass
-
-    # Clear existing notes if requested
+    # One round trip: create the clip (fails harmlessly if it already
+    # exists), optionally clear it, then add the parsed notes.
+    commands = [("create_clip", dict(slot, length=length))]
     if clear_existing:
-        try:
-            ableton.send_command("clear_clip_notes", {
-                "track_index": track_index,
-                "clip_index": clip_index,
-            })
-        except Exception:
-            pass
+        commands.append(("clear_clip_notes", dict(slot)))
+    commands.append(("add_notes_to_clip", dict(slot, notes=notes)))
+    results = ableton.send_batch(commands, stop_on_error=False)
 
-    # Add the parsed notes
-    ableton.send_command("add_notes_to_clip", {
-        "track_index": track_index,
-        "clip_index": clip_index,
-        "notes": notes,
-    })
+    last = results[-1] if results else {}
+    if last.get("status") != "success":
+        raise Exception(last.get("message", "Failed to add notes"))
     return f"Wrote {len(notes)} notes from grid to track {track_index}, slot {clip_index} ({length} beats)"
 # ==============================================================================
 # New Tools: Session / Transport
@@ -6364,10 +7989,145 @@ def tap_tempo(ctx: Context) -> str:
 
 @mcp.tool()
 @_tool_handler("getting all tracks info")
-def get_all_tracks_info(ctx: Context) -> str:
-    """Get information about all tracks in the session at once (bulk query)."""
+def get_all_tracks_info(ctx: Context, fields: str = "", offset: int = 0,
+                        limit: Optional[int] = None) -> str:
+    """
+    Get information about all tracks in the session at once (bulk query).
+
+    Parameters:
+    - fields: Optional comma-separated (or JSON array) subset of: index, name, is_audio,
+      is_midi, mute, solo, volume, panning, color_index, devices, arm, is_group_track
+      (default: all). Leaving out "devices" avoids walking every device chain.
+      A subset of index, name and devices is served from the subscribe_live_changes
+      mirror without a round trip while it covers those topics.
+    - offset / limit: Page of tracks to return (reports the total when paged)
+    """
+    params: Dict[str, Any] = {}
+    selected = _parse_fields(fields)
+    if selected:
+        params["fields"] = selected
+    _add_paging(params, "", offset, limit)
+    if selected and set(selected) <= SessionMirror.MIRRORED_TRACK_FIELDS:
+        mirror = _live_mirror("tracks", *(["devices"] if "devices" in selected else []))
+        if mirror is not None:
+            result = mirror.all_tracks_info(selected, offset, limit)
+            if result is not None:
+                return json.dumps(result)
+    ableton = get_ableton_connection()
+    result = ableton.send_command("get_all_tracks_info", params)
+    return json.dumps(result)
+
+
+@mcp.tool()
+@_tool_handler("getting track hierarchy")
+def get_track_hierarchy(ctx: Context) -> str:
+    """Get the group-track tree of the session in one call.
+
+    Returns "tree": top-level tracks, each group track with its nested
+    "children" (and "folded" state), every node with its index, name and
+    depth; plus "parents", the group track index of every track (null at top
+    level).
+    """
+    ableton = get_ableton_connection()
+    result = ableton.send_command("get_track_hierarchy")
+    return json.dumps(result)
+
+
+@mcp.tool()
+@_tool_handler("reading LOM properties")
+def get_lom_properties(ctx: Context, queries: str, properties: str = "") -> str:
+    """Read many properties of many Live objects in one call.
+
+    A general replacement for chains of narrow get_* calls: every query is
+    evaluated in one pass inside Ableton and returned as a compact table.
+
+    Parameters:
+    - queries: JSON array of {"selector": {...}, "properties": [...]} objects.
+      Selector keys: track_type ("track", "return", "master"), track_index, device_index,
+      parameter_index or parameter_name, clip_slot_index, clip (true = the slot's clip),
+      scene_index. Index keys accept "*" for every index; an empty selector is the song.
+      Unknown keys and conflicting combinations (scene with track, clip slot with device)
+      are rejected.
+      Properties are dotted paths relative to the object; numeric parts index lists.
+      Example (name, mute, solo, volume and first device of every track):
+      '[{"selector": {"track_index": "*"},
+         "properties": ["name", "mute", "solo", "mixer_device.volume.value", "devices.0.name"]}]'
+    - properties: Optional JSON array or comma-separated default property list for queries
+      that don't give their own
+
+    Returns {"results": [{"columns", "paths", "rows", "errors"?}, ...]}: one row per selected
+    object, null cells for values that could not be read (explained in "errors").
+    """
+    queries_list = json.loads(queries) if isinstance(queries, str) else queries
+    if not isinstance(queries_list, list) or not queries_list:
+        return "Error: queries must be a non-empty JSON array of {selector, properties} objects"
+    params: Dict[str, Any] = {"queries": queries_list}
+    default_properties = _parse_fields(properties)
+    if default_properties:
+        params["properties"] = default_properties
+    ableton = get_ableton_connection()
+    result = ableton.send_command("get_lom_properties", params)
+    return json.dumps(result)
+
+
+@mcp.tool()
+@_tool_handler("setting LOM properties")
+def set_lom_properties(ctx: Context, entries: str, undo_step: bool = False) -> str:
+    """Set many properties of many Live objects in one call and one Ableton tick.
+
+    Use instead of long runs of set_track_volume / set_track_send /
+    set_device_parameter calls, e.g. to restore a mix. All entries are
+    validated before anything is written; one invalid entry rejects the
+    whole batch. Parameter values are clamped to the parameter's range.
+
+    Parameters:
+    - entries: JSON array of {"selector": {...}, "property": "...", "value": ...} objects,
+      using the selectors and dotted property paths of get_lom_properties, e.g.
+      '[{"selector": {"track_index": "*"}, "property": "mixer_device.volume.value", "value": 0.7},
+        {"selector": {"track_index": 2}, "property": "mixer_device.sends.0.value", "value": 0.4},
+        {"selector": {"track_index": 0, "device_index": 1, "parameter_name": "Dry/Wet"},
+         "property": "value", "value": 0.25},
+        {"selector": {"scene_index": 3}, "property": "name", "value": "Drop"}]'
+    - undo_step: Group all writes into a single Live undo step
+
+    Returns one result per written object with its new value, or its error.
+    """
+    entries_list = json.loads(entries) if isinstance(entries, str) else entries
+    if not isinstance(entries_list, list) or not entries_list:
+        return "Error: entries must be a non-empty JSON array of {selector, property, value} objects"
+    ableton = get_ableton_connection()
+    result = ableton.send_command("set_lom_properties", {
+        "entries": entries_list,
+        "undo_step": undo_step,
+    })
+    return json.dumps(result)
+
+
+@mcp.tool()
+@_tool_handler("getting session delta")
+def get_session_delta(ctx: Context, since_generation: int = 0, epoch: str = "") -> str:
+    """Get only the tracks, clip slots and devices that changed since a generation.
+
+    Keeps a session view in sync for the cost of the changes rather than the
+    size of the set. Call with since_generation=0 for a full snapshot, then
+    pass back the returned "generation" and "epoch" on the next call.
+
+    Returns "full": true (everything is included) when the client is behind a
+    structural change such as adding/removing tracks or scenes, or the Remote
+    Script was reloaded. "device_lists" names tracks whose device list was
+    replaced, so devices not listed for them should be dropped.
+    Return and master tracks are not included.
+
+    Parameters:
+    - since_generation: The "generation" from the previous call (0 = full snapshot)
+    - epoch: The "epoch" from the previous call (optional)
+    """
+    _validate_index(since_generation, "since_generation")
+    params: Dict[str, Any] = {"since_generation": since_generation}
+    if epoch:
+        params["epoch"] = epoch
     ableton = get_ableton_connection()
-    result = ableton.send_command("get_all_tracks_info")
+    result = ableton.send_command("get_session_delta", params)
     return json.dumps(result)
 
 
@@ -8434,6 +10194,111 @@ def preview_browser_item(ctx: Context, uri: str = None, action: str = "preview")
         return "Preview stopped"
     name = result.get("name", "?")
     return f"Previewing: '{name}'"
+
+
+# --- Remote Script Diagnostics ---
+
+
+@mcp.tool()
+@_tool_handler("getting main-thread stats")
+def get_main_thread_stats(ctx: Context) -> str:
+    """Get saturation counters for the Remote Script's main-thread work queue.
+
+    Every TCP command and UDP update runs on Ableton's main thread via one
+    shared queue drained each control-surface tick. Returns queue depth
+    (current and max), executed/error counts, average and max wait time in
+    the queue, tick durations, and how many ticks hit the time budget.
+    Rising wait times or ticks_over_budget mean the main thread is saturated.
+    """
+    ableton = get_ableton_connection()
+    result = ableton.send_command("get_main_thread_stats")
+    return json.dumps(result)
+
+
+@mcp.tool()
+@_tool_handler("setting main-thread budget")
+def set_main_thread_budget(ctx: Context, tick_budget_ms: float) -> str:
+    """Set how much time per control-surface tick the Remote Script may spend on queued work.
+
+    Lower values keep Ableton's UI smoother under heavy load; higher values
+    drain large bursts of commands in fewer ticks.
+
+    Parameters:
+    - tick_budget_ms: Milliseconds per tick (1-500, default 50)
+    """
+    _validate_range(tick_budget_ms, "tick_budget_ms", 1.0, 500.0)
+    ableton = get_ableton_connection()
+    result = ableton.send_command("set_main_thread_budget", {"tick_budget_ms": tick_budget_ms})
+    return f"Main-thread tick budget set to {result.get('tick_budget_ms', tick_budget_ms)} ms"
+
+
+# --- Live Change Subscriptions ---
+
+
+@mcp.tool()
+@_tool_handler("subscribing to Live changes")
+def subscribe_live_changes(ctx: Context, topics: str = "song,tracks,clip_slots,devices",
+                           parameter_devices: str = "") -> str:
+    """Keep a server-side mirror of Live state current via pushed change events.
+
+    Opens a dedicated connection on which the Remote Script pushes changes
+    from Live's listeners (coalesced once per tick) instead of being polled.
+    Read the mirror with get_live_state_mirror; while it is live,
+    get_track_info and get_all_tracks_info answer index/name/devices
+    requests from it too. Calling again replaces the previous subscription.
+
+    Parameters:
+    - topics: Comma-separated topics: song (tempo, is_playing), tracks (track list),
+      clip_slots (has_clip per slot), devices (device list per track). Empty for none.
+    - parameter_devices: Optional JSON list of devices whose parameter values to watch, e.g.
+      '[{"track_index": 0, "device_index": 1, "track_type": "track"}]' (max 32)
+    """
+    global _live_subscriber
+    topic_list = [t.strip() for t in topics.split(",") if t.strip()]
+    devices = json.loads(parameter_devices) if parameter_devices else []
+    if not isinstance(devices, list):
+        return "Error: parameter_devices must be a JSON array of {track_index, device_index, track_type} objects"
+    if not topic_list and not devices:
+        return "Error: give at least one topic or parameter device"
+
+    if _live_subscriber is not None:
+        _live_subscriber.stop()
+        _live_subscriber = None
+    subscriber = LiveChangeSubscriber({"topics": topic_list, "parameters": devices})
+    subscribed = subscriber.start()
+    _live_subscriber = subscriber
+    return json.dumps({"subscribed": subscribed, "mirror": subscriber.stats()})
+
+
+@mcp.tool()
+@_tool_handler("reading the Live state mirror")
+def get_live_state_mirror(ctx: Context, topic: str = "all") -> str:
+    """Return the mirrored Live state maintained by subscribe_live_changes.
+
+    Served from memory without a round trip to Ableton.
+
+    Parameters:
+    - topic: "all" (default), "song", "tracks", "clip_slots", "devices" or "parameters"
+    """
+    if _live_subscriber is None:
+        return "Error: no active subscription; call subscribe_live_changes first"
+    state = _live_subscriber.mirror.snapshot(topic)
+    state["mirror"] = _live_subscriber.stats()
+    return json.dumps(state)
+
+
+@mcp.tool()
+@_tool_handler("unsubscribing from Live changes")
+def unsubscribe_live_changes(ctx: Context) -> str:
+    """Stop the change subscription and drop the mirrored state."""
+    global _live_subscriber
+    if _live_subscriber is None:
+        return "No active subscription"
+    _live_subscriber.stop()
+    _live_subscriber = None
+    return "Unsubscribed from Live changes"
+
+
 def main():
     """Run the MCP server"""
     mcp.run()
@@ -0,0 +1,598 @@
+# AbletonMCP Beta / wire.py
+#
+# Framing and codecs shared by the Remote Script and the MCP server.  The Remote Script
+# is copied into Live on its own and can't import MCP_Server, so this file
+# exists twice:
+#   AbletonMCP_Remote_Script/wire.py
+#   MCP_Server/wire.py
+# Keep the two copies identical.
+"""Wire framing and encodings for the command protocol on port 9877.
+
+Every connection starts out as newline-delimited JSON.  A client may send
+``negotiate_wire_format`` with the formats it understands; once the reply
+(still JSON) is out, both sides switch to the agreed codec.  Clients that
+never ask, and Remote Scripts that don't know the command, stay on JSON.
+
+The binary format is MessagePack, each message prefixed with its length
+as a 4-byte big-endian integer.  On top of the standard types it uses one
+extension type for lists of same-shaped dicts (note lists, parameter
+lists, meter rows), stored column by column so numeric columns pack and
+unpack in a single struct call.  Everything is pure Python so it runs in
+Live's bundled interpreter.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import collections
+import json
+import struct
+
+WIRE_FORMAT_JSON = "json"
+WIRE_FORMAT_MSGPACK = "msgpack"
+
+# Largest single binary message accepted; guards against a corrupt prefix
+MAX_FRAME_SIZE = 16 * 1048576
+
+
+class LineFramer(object):
+    """Accumulate received bytes and split them into newline-delimited frames.
+
+    Data is appended to one bytearray.  The delimiter search resumes where
+    the previous one stopped, and every run of complete frames is decoded
+    exactly once, in one call, straight out of the buffer.  Large or
+    heavily pipelined reads therefore stay linear in the bytes received
+    instead of re-copying the unread tail for every line.
+    """
+
+    def __init__(self, errors="strict"):
+        self.errors = errors
+        self._buf = bytearray()
+        self._scan = 0  # where the next delimiter search resumes
+        self._ready = collections.deque()
+
+    def feed(self, data):
+        """Append raw bytes read from the socket."""
+        self._buf += data
+
+    def next_frame(self):
+        """Return the next complete frame as text (no delimiter), or None."""
+        if not self._ready and not self._fill():
+            return None
+        return self._ready.popleft()
+
+    def frames(self):
+        """Yield every complete frame currently buffered."""
+        while True:
+            frame = self.next_frame()
+            if frame is None:
+                return
+            yield frame
+
+    def _fill(self):
+        buf = self._buf
+        if buf.find(b"\n", self._scan) < 0:
+            self._scan = len(buf)
+            return False
+        end = buf.rfind(b"\n")
+        # A newline byte never occurs inside a multi-byte UTF-8 sequence,
+        # so splitting the decoded text is the same as splitting the bytes.
+        view = memoryview(buf)
+        try:
+            text = str(view[:end], "utf-8", self.errors)
+        finally:
+            view.release()
+        self._ready.extend(text.split("\n"))
+        del buf[:end + 1]
+        self._scan = 0
+        return True
+
+    @property
+    def pending_bytes(self):
+        """Bytes buffered after the last complete frame."""
+        return len(self._buf)
+
+    def take_unframed(self):
+        """Remove and return the bytes after the last complete frame.
+
+        Used when a connection switches wire format mid-stream.
+        """
+        data = bytes(self._buf)
+        del self._buf[:]
+        self._scan = 0
+        return data
+
+    def clear(self):
+        del self._buf[:]
+        self._scan = 0
+        self._ready.clear()
+
+
+class LengthPrefixFramer(object):
+    """Split a byte stream of 4-byte-length-prefixed messages into frames."""
+
+    _HEADER = struct.Struct(">I")
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._ready = collections.deque()
+
+    def feed(self, data):
+        """Append raw bytes read from the socket."""
+        self._buf += data
+
+    def next_frame(self):
+        """Return the next complete message body as bytes, or None."""
+        if not self._ready and not self._fill():
+            return None
+        return self._ready.popleft()
+
+    def frames(self):
+        """Yield every complete frame currently buffered."""
+        while True:
+            frame = self.next_frame()
+            if frame is None:
+                return
+            yield frame
+
+    def _fill(self):
+        buf = self._buf
+        header = self._HEADER
+        pos = 0
+        while len(buf) - pos >= 4:
+            size = header.unpack_from(buf, pos)[0]
+            if size > MAX_FRAME_SIZE:
+                raise ValueError("Frame too large ({0} bytes)".format(size))
+            end = pos + 4 + size
+            if end > len(buf):
+                break
+            self._ready.append(bytes(buf[pos + 4:end]))
+            pos = end
+        if pos:
+            del buf[:pos]
+        return bool(self._ready)
+
+    @property
+    def pending_bytes(self):
+        """Bytes buffered after the last complete frame."""
+        return len(self._buf)
+
+    def take_unframed(self):
+        """Remove and return the bytes after the last complete frame."""
+        data = bytes(self._buf)
+        del self._buf[:]
+        return data
+
+    def clear(self):
+        del self._buf[:]
+        self._ready.clear()
+
+
+# ----------------------------------------------------------------------
+# MessagePack (pure Python)
+# ----------------------------------------------------------------------
+# Covers nil, bool, int (up to 64-bit), float, str, bin, array and map,
+# i.e. everything json.dumps accepts.  Non-string map keys are converted
+# the way json.dumps converts them, so both formats decode to the same
+# objects.
+#
+# Extension type 1 ("table") holds a list of at least _TABLE_MIN_ROWS
+# dicts that all have the same keys in the same order:
+#   u32 row count, msgpack array of keys, then one column per key:
+#   b"d" + float64s | b"i" + int32s | b"?" + bools | b"o" + msgpack array
+
+_TABLE_EXT = 1
+_TABLE_MIN_ROWS = 4
+
+_U8 = struct.Struct(">B")
+_U16 = struct.Struct(">H")
+_U32 = struct.Struct(">I")
+_U64 = struct.Struct(">Q")
+_I8 = struct.Struct(">b")
+_I16 = struct.Struct(">h")
+_I32 = struct.Struct(">i")
+_I64 = struct.Struct(">q")
+_F32 = struct.Struct(">f")
+_F64 = struct.Struct(">d")
+
+_pack_u8 = _U8.pack
+_pack_u16 = _U16.pack
+_pack_u32 = _U32.pack
+_pack_f64 = _F64.pack
+
+# Single-byte encodings of fixints and short-string headers
+_BYTE = [bytes(bytearray([i])) for i in range(256)]
+
+
+def _json_key(key):
+    if type(key) is str:
+        return key
+    if isinstance(key, str):
+        return str(key)
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, (int, float)):
+        return json.dumps(key)
+    raise TypeError("keys must be str, int, float, bool or None, not {0}".format(type(key).__name__))
+
+
+def _pack_int(n, out):
+    if 0 <= n < 0x80:
+        out.append(_BYTE[n])
+    elif -32 <= n < 0:
+        out.append(_BYTE[n & 0xff])
+    elif n >= 0:
+        if n <= 0xff:
+            out.append(b"\xcc" + _BYTE[n])
+        elif n <= 0xffff:
+            out.append(b"\xcd" + _pack_u16(n))
+        elif n <= 0xffffffff:
+            out.append(b"\xce" + _pack_u32(n))
+        elif n <= 0xffffffffffffffff:
+            out.append(b"\xcf" + _U64.pack(n))
+        else:
+            raise ValueError("Integer too large for msgpack: {0}".format(n))
+    elif n >= -0x80:
+        out.append(b"\xd0" + _I8.pack(n))
+    elif n >= -0x8000:
+        out.append(b"\xd1" + _I16.pack(n))
+    elif n >= -0x80000000:
+        out.append(b"\xd2" + _I32.pack(n))
+    elif n >= -0x8000000000000000:
+        out.append(b"\xd3" + _I64.pack(n))
+    else:
+        raise ValueError("Integer too large for msgpack: {0}".format(n))
+
+
+def _pack_str(obj, out):
+    data = obj.encode("utf-8")
+    n = len(data)
+    if n < 32:
+        out.append(_BYTE[0xa0 | n])
+    elif n <= 0xff:
+        out.append(b"\xd9" + _BYTE[n])
+    elif n <= 0xffff:
+        out.append(b"\xda" + _pack_u16(n))
+    else:
+        out.append(b"\xdb" + _pack_u32(n))
+    out.append(data)
+
+
+def _pack_array_header(n, out):
+    if n < 16:
+        out.append(_BYTE[0x90 | n])
+    elif n <= 0xffff:
+        out.append(b"\xdc" + _pack_u16(n))
+    else:
+        out.append(b"\xdd" + _pack_u32(n))
+
+
+def _pack_map_header(n, out):
+    if n < 16:
+        out.append(_BYTE[0x80 | n])
+    elif n <= 0xffff:
+        out.append(b"\xde" + _pack_u16(n))
+    else:
+        out.append(b"\xdf" + _pack_u32(n))
+
+
+def _pack_column(values, out):
+    kinds = set(map(type, values))
+    n = len(values)
+    if kinds == {float}:
+        out.append(b"d" + struct.pack(">{0}d".format(n), *values))
+    elif kinds == {bool}:
+        out.append(b"?" + struct.pack(">{0}?".format(n), *values))
+    elif kinds == {int} and -0x80000000 <= min(values) and max(values) <= 0x7fffffff:
+        out.append(b"i" + struct.pack(">{0}i".format(n), *values))
+    else:
+        out.append(b"o")
+        _pack_list(values, out)
+
+
+def _pack_table(rows, keys, out):
+    body = [_pack_u32(len(rows))]
+    _pack_list([_json_key(k) for k in keys], body)
+    for column in zip(*[tuple(row.values()) for row in rows]):
+        _pack_column(column, body)
+    payload = b"".join(body)
+    n = len(payload)
+    if n <= 0xff:
+        out.append(b"\xc7" + _BYTE[n] + _BYTE[_TABLE_EXT])
+    elif n <= 0xffff:
+        out.append(b"\xc8" + _pack_u16(n) + _BYTE[_TABLE_EXT])
+    else:
+        out.append(b"\xc9" + _pack_u32(n) + _BYTE[_TABLE_EXT])
+    out.append(payload)
+
+
+def _pack_list(obj, out):
+    n = len(obj)
+    if n >= _TABLE_MIN_ROWS:
+        first = obj[0]
+        if type(first) is dict and first:
+            keys = tuple(first)
+            if all(type(row) is dict and tuple(row) == keys for row in obj):
+                _pack_table(obj, keys, out)
+                return
+        elif type(first) is float and set(map(type, obj)) == {float}:
+            # Runs of float64 (values, meters) in one struct call
+            _pack_array_header(n, out)
+            values = [0xcb] * (2 * n)
+            values[1::2] = obj
+            out.append(struct.pack(">" + "Bd" * n, *values))
+            return
+    _pack_array_header(n, out)
+    for value in obj:
+        _pack(value, out)
+
+
+def _pack(obj, out):
+    t = type(obj)
+    if t is str:
+        _pack_str(obj, out)
+    elif t is float:
+        out.append(b"\xcb" + _pack_f64(obj))
+    elif t is int:
+        _pack_int(obj, out)
+    elif t is dict:
+        _pack_map_header(len(obj), out)
+        for key, value in obj.items():
+            if type(key) is str:
+                _pack_str(key, out)
+            else:
+                _pack_str(_json_key(key), out)
+            _pack(value, out)
+    elif t is list or t is tuple:
+        _pack_list(obj, out)
+    elif obj is None:
+        out.append(b"\xc0")
+    elif obj is True:
+        out.append(b"\xc3")
+    elif obj is False:
+        out.append(b"\xc2")
+    elif isinstance(obj, (bytes, bytearray)):
+        n = len(obj)
+        if n <= 0xff:
+            out.append(b"\xc4" + _BYTE[n])
+        elif n <= 0xffff:
+            out.append(b"\xc5" + _pack_u16(n))
+        else:
+            out.append(b"\xc6" + _pack_u32(n))
+        out.append(bytes(obj))
+    elif isinstance(obj, bool):
+        out.append(b"\xc3" if obj else b"\xc2")
+    elif isinstance(obj, int):
+        _pack_int(int(obj), out)
+    elif isinstance(obj, float):
+        out.append(b"\xcb" + _pack_f64(float(obj)))
+    elif isinstance(obj, str):
+        _pack_str(str(obj), out)
+    elif isinstance(obj, dict):
+        _pack(dict(obj), out)
+    elif isinstance(obj, (list, tuple)):
+        _pack_list(list(obj), out)
+    else:
+        raise TypeError("Object of type {0} is not msgpack serializable".format(type(obj).__name__))
+
+
+def packb(obj):
+    """Serialize *obj* to MessagePack bytes."""
+    out = []
+    _pack(obj, out)
+    return b"".join(out)
+
+
+_unpack_u16 = _U16.unpack_from
+_unpack_u32 = _U32.unpack_from
+_unpack_f64 = _F64.unpack_from
+
+# type byte -> (struct, size) for fixed-width scalars
+_FIXED = {
+    0xca: _F32, 0xcb: _F64,
+    0xcc: _U8, 0xcd: _U16, 0xce: _U32, 0xcf: _U64,
+    0xd0: _I8, 0xd1: _I16, 0xd2: _I32, 0xd3: _I64,
+}
+
+
+def _unpack_array(data, pos, n):
+    end = pos + 9 * n
+    if n > 1 and data[pos:end:9] == b"\xcb" * n:
+        # Run of float64s: decode in one struct call
+        return list(struct.unpack_from(">" + "xd" * n, data, pos)), end
+    items = []
+    append = items.append
+    for _ in range(n):
+        value, pos = _unpack(data, pos)
+        append(value)
+    return items, pos
+
+
+def _unpack_map(data, pos, n):
+    result = {}
+    for _ in range(n):
+        b = data[pos]
+        if 0xa0 <= b < 0xc0:
+            # fixstr key, by far the common case
+            end = pos + 1 + (b & 0x1f)
+            key = data[pos + 1:end].decode("utf-8")
+            pos = end
+        else:
+            key, pos = _unpack(data, pos)
+        result[key], pos = _unpack(data, pos)
+    return result, pos
+
+
+def _unpack_str(data, pos, n):
+    end = pos + n
+    if end > len(data):
+        raise ValueError("Truncated msgpack string")
+    return data[pos:end].decode("utf-8"), end
+
+
+def _unpack_table(data, pos, end):
+    rows = _unpack_u32(data, pos)[0]
+    keys, pos = _unpack(data, pos + 4)
+    columns = []
+    for _ in keys:
+        kind = data[pos:pos + 1]
+        pos += 1
+        if kind == b"d":
+            columns.append(struct.unpack_from(">{0}d".format(rows), data, pos))
+            pos += 8 * rows
+        elif kind == b"i":
+            columns.append(struct.unpack_from(">{0}i".format(rows), data, pos))
+            pos += 4 * rows
+        elif kind == b"?":
+            columns.append(struct.unpack_from(">{0}?".format(rows), data, pos))
+            pos += rows
+        elif kind == b"o":
+            column, pos = _unpack(data, pos)
+            columns.append(column)
+        else:
+            raise ValueError("Unknown msgpack table column kind {0!r}".format(kind))
+    if pos != end:
+        raise ValueError("Malformed msgpack table")
+    return [dict(zip(keys, row)) for row in zip(*columns)], end
+
+
+def _unpack_ext(data, pos, n):
+    code = data[pos]
+    start = pos + 1
+    end = start + n
+    if end > len(data):
+        raise ValueError("Truncated msgpack ext")
+    if code == _TABLE_EXT:
+        return _unpack_table(data, start, end)
+    raise ValueError("Unsupported msgpack ext type {0}".format(code))
+
+
+def _unpack(data, pos):
+    b = data[pos]
+    pos += 1
+    if b < 0x80:
+        return b, pos
+    if 0xa0 <= b < 0xc0:
+        end = pos + (b & 0x1f)
+        return data[pos:end].decode("utf-8"), end
+    if b == 0xcb:
+        return _unpack_f64(data, pos)[0], pos + 8
+    if b < 0x90:
+        return _unpack_map(data, pos, b & 0x0f)
+    if b < 0xa0:
+        return _unpack_array(data, pos, b & 0x0f)
+    if b >= 0xe0:
+        return b - 0x100, pos
+    if b == 0xc0:
+        return None, pos
+    if b == 0xc2:
+        return False, pos
+    if b == 0xc3:
+        return True, pos
+    fixed = _FIXED.get(b)
+    if fixed is not None:
+        return fixed.unpack_from(data, pos)[0], pos + fixed.size
+    if b == 0xd9:
+        return _unpack_str(data, pos + 1, data[pos])
+    if b == 0xda:
+        return _unpack_str(data, pos + 2, _unpack_u16(data, pos)[0])
+    if b == 0xdb:
+        return _unpack_str(data, pos + 4, _unpack_u32(data, pos)[0])
+    if b == 0xdc:
+        return _unpack_array(data, pos + 2, _unpack_u16(data, pos)[0])
+    if b == 0xdd:
+        return _unpack_array(data, pos + 4, _unpack_u32(data, pos)[0])
+    if b == 0xde:
+        return _unpack_map(data, pos + 2, _unpack_u16(data, pos)[0])
+    if b == 0xdf:
+        return _unpack_map(data, pos + 4, _unpack_u32(data, pos)[0])
+    if b == 0xc7:
+        return _unpack_ext(data, pos + 1, data[pos])
+    if b == 0xc8:
+        return _unpack_ext(data, pos + 2, _unpack_u16(data, pos)[0])
+    if b == 0xc9:
+        return _unpack_ext(data, pos + 4, _unpack_u32(data, pos)[0])
+    if b in (0xc4, 0xc5, 0xc6):
+        if b == 0xc4:
+            n, start = data[pos], pos + 1
+        elif b == 0xc5:
+            n, start = _unpack_u16(data, pos)[0], pos + 2
+        else:
+            n, start = _unpack_u32(data, pos)[0], pos + 4
+        if start + n > len(data):
+            raise ValueError("Truncated msgpack bin")
+        return bytes(data[start:start + n]), start + n
+    raise ValueError("Unsupported msgpack type byte 0x{0:02x}".format(b))
+
+
+def unpackb(data):
+    """Deserialize one MessagePack object that spans all of *data*."""
+    try:
+        obj, pos = _unpack(data, 0)
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError("Truncated or corrupt msgpack data: {0}".format(e))
+    if pos != len(data):
+        raise ValueError("Trailing bytes after msgpack object")
+    return obj
+
+
+# ----------------------------------------------------------------------
+# Codecs
+# ----------------------------------------------------------------------
+
+class JsonCodec(object):
+    """Newline-delimited JSON, the default and fallback format."""
+
+    name = WIRE_FORMAT_JSON
+
+    def __init__(self, errors="strict"):
+        self.errors = errors
+
+    def framer(self):
+        return LineFramer(self.errors)
+
+    def encode(self, obj):
+        return (json.dumps(obj) + "\n").encode("utf-8")
+
+    def decode(self, frame):
+        """Return the message in *frame*, or None for a blank line."""
+        frame = frame.strip()
+        if not frame:
+            return None
+        return json.loads(frame)
+
+
+class MsgpackCodec(object):
+    """Length-prefixed MessagePack."""
+
+    name = WIRE_FORMAT_MSGPACK
+
+    def __init__(self, errors="strict"):
+        self.errors = errors
+
+    def framer(self):
+        return LengthPrefixFramer()
+
+    def encode(self, obj):
+        payload = packb(obj)
+        return _U32.pack(len(payload)) + payload
+
+    def decode(self, frame):
+        return unpackb(frame)
+
+
+CODECS = {
+    WIRE_FORMAT_JSON: JsonCodec,
+    WIRE_FORMAT_MSGPACK: MsgpackCodec,
+}
+
+
+def choose_wire_format(offered):
+    """Pick the first format in *offered* this side supports, else JSON."""
+    for name in offered or ():
+        if name in CODECS:
+            return name
+    return WIRE_FORMAT_JSON
@@ -0,0 +1,97 @@
+"""Newline framing cost: str concatenation + split vs. LineFramer.
+
+Feeds the same byte stream to both receivers in socket-sized chunks and
+times how long it takes to pull every complete message out.  Two shapes
+are measured:
+
+  large    — a few ~1 MB responses (dense note lists, browser listings)
+  small    — 10k small pipelined messages arriving back to back
+
+  split    — the old approach: decode each chunk, append it to a str and
+             run buffer.split('\\n', 1) for every line
+  framer   — wire.LineFramer: bytearray accumulation, resumed delimiter
+             scan, complete frames decoded once per recv
+
+Usage:
+    python benchmarks/bench_framing.py [--repeat 5] [--chunk 65536]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from MCP_Server.wire import LineFramer  # noqa: E402
+
+
+def make_large(count: int = 4) -> bytes:
+    """~1 MB JSON responses shaped like get_notes_extended on a dense clip."""
+    notes = [{"pitch": 36 + i % 48, "start_time": i * 0.0625, "duration": 0.25,
+              "velocity": 100, "mute": False, "probability": 1.0} for i in range(9000)]
+    line = json.dumps({"status": "success", "result": {"notes": notes}, "id": 1}) + "\n"
+    return line.encode("utf-8") * count
+
+
+def make_small(count: int = 10000) -> bytes:
+    line = json.dumps({"status": "success", "result": {"volume": 0.85}, "id": 1}) + "\n"
+    return line.encode("utf-8") * count
+
+
+def chunks(data: bytes, size: int) -> list:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def run_split(parts: list) -> int:
+    buffer = ""
+    frames = 0
+    for part in parts:
+        buffer += part.decode("utf-8")
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            frames += 1
+    return frames
+
+
+def run_framer(parts: list) -> int:
+    framer = LineFramer()
+    frames = 0
+    for part in parts:
+        framer.feed(part)
+        for _line in framer.frames():
+            frames += 1
+    return frames
+
+
+def measure(fn, parts: list, repeat: int) -> tuple:
+    samples = []
+    frames = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        frames = fn(parts)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples), frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--chunk", type=int, default=65536, help="bytes per simulated recv()")
+    args = parser.parse_args()
+
+    streams = [("large", make_large()), ("small", make_small())]
+    print(f"recv size {args.chunk} bytes, median of {args.repeat} runs")
+    print(f"{'stream':<8}{'bytes':>12}{'frames':>8}{'split ms':>12}{'framer ms':>12}{'speedup':>10}")
+    for name, data in streams:
+        parts = chunks(data, args.chunk)
+        split_ms, split_frames = measure(run_split, parts, args.repeat)
+        framer_ms, framer_frames = measure(run_framer, parts, args.repeat)
+        assert split_frames == framer_frames
+        print(f"{name:<8}{len(data):>12}{framer_frames:>8}{split_ms:>12.2f}{framer_ms:>12.2f}"
+              f"{split_ms / framer_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Cost of resolving and setting a device parameter by name, per update.
+
+Drives thousands of set_device_parameter calls -- the path every UDP
+real-time packet takes -- against a mocked Live set whose target device
+has a few hundred parameters.  Names are drawn at random, so a linear
+scan touches half the parameter list on average.
+
+  scan     — handlers.devices.set_device_parameter without a cache:
+             resolve the track and device, then walk device.parameters
+             comparing names (the previous behaviour)
+  cached   — the same handler with the Remote Script's ParameterIndexCache
+             (device and name map cached, invalidated by listeners)
+
+Usage:
+    python benchmarks/bench_param_lookup.py [--updates 20000] [--params 200]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# The Remote Script package imports Live's _Framework on load; outside Live
+# a bare stand-in is enough since only the handlers are exercised here
+if "_Framework" not in sys.modules:
+    try:
+        import _Framework.ControlSurface  # noqa: F401
+    except ImportError:
+        framework = types.ModuleType("_Framework")
+        control_surface = types.ModuleType("_Framework.ControlSurface")
+        control_surface.ControlSurface = object
+        framework.ControlSurface = control_surface
+        sys.modules["_Framework"] = framework
+        sys.modules["_Framework.ControlSurface"] = control_surface
+
+from AbletonMCP_Remote_Script.handlers import devices  # noqa: E402
+from AbletonMCP_Remote_Script.param_cache import ParameterIndexCache  # noqa: E402
+
+
+class LiveObject:
+    """Attribute bag with Live-style add/remove/has listener methods."""
+
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+        self._listeners = {}
+
+    def __getattr__(self, name):
+        if name.startswith("add_") and name.endswith("_listener"):
+            return lambda cb: self._listeners.setdefault(name[4:-9], []).append(cb)
+        if name.startswith("remove_") and name.endswith("_listener"):
+            return lambda cb: self._listeners[name[7:-9]].remove(cb)
+        if name.endswith("_has_listener"):
+            return lambda cb: cb in self._listeners.get(name[:-13], [])
+        raise AttributeError(name)
+
+
+def make_song(n_params: int, n_tracks: int = 16, n_devices: int = 4) -> LiveObject:
+    def param(name):
+        p = LiveObject(name=name, value=0.0, min=0.0, max=1.0, is_quantized=False)
+        p.str_for_value = lambda v: "%.2f" % v
+        return p
+
+    tracks = []
+    for t in range(n_tracks):
+        devs = [LiveObject(name=f"Synth {d}", parameters=[param(f"Param {i}") for i in range(n_params)])
+                for d in range(n_devices)]
+        tracks.append(LiveObject(name=f"Track {t}", devices=devs))
+    return LiveObject(tracks=tracks, return_tracks=[], master_track=None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=20000)
+    parser.add_argument("--params", type=int, default=200)
+    args = parser.parse_args()
+
+    song = make_song(args.params)
+    rng = random.Random(3)
+    updates = [(rng.randrange(len(song.tracks)), rng.randrange(4), f"Param {rng.randrange(args.params)}",
+                rng.random()) for _ in range(args.updates)]
+
+    def run(ctrl) -> float:
+        start = time.perf_counter()
+        for t, d, name, value in updates:
+            devices.set_device_parameter(song, t, d, name, value, ctrl=ctrl)
+        return time.perf_counter() - start
+
+    scan_s = run(types.SimpleNamespace(log_message=lambda *a: None))
+    ctrl = types.SimpleNamespace(param_cache=ParameterIndexCache(), log_message=lambda *a: None)
+    cached_s = run(ctrl)
+
+    print(f"{args.updates} updates, {args.params} parameters per device, "
+          f"{len(song.tracks) * 4} devices")
+    print(f"{'lookup':<8}{'total ms':>10}{'us/update':>11}")
+    print(f"{'scan':<8}{scan_s * 1000:>10.1f}{scan_s / args.updates * 1e6:>11.2f}")
+    print(f"{'cached':<8}{cached_s * 1000:>10.1f}{cached_s / args.updates * 1e6:>11.2f}")
+    print(f"cache: {ctrl.param_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
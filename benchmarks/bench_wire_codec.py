@@ -0,0 +1,76 @@
+"""Encode/decode cost and size: newline JSON vs. the binary wire format.
+
+Payloads are shaped like the numeric-heavy responses that motivated the
+binary format:
+
+  params   — get_device_parameters on a 150-parameter device
+  notes    — get_clip_notes on a dense 5000-note clip
+  meters   — get_track_meters across 64 tracks plus a raw value list
+
+  json     — json.dumps/json.loads plus newline, the default format
+  msgpack  — wire.MsgpackCodec (pure Python, as run inside Live)
+
+Usage:
+    python benchmarks/bench_wire_codec.py [--repeat 20]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from MCP_Server.wire import JsonCodec, MsgpackCodec  # noqa: E402
+
+
+def make_payloads() -> list:
+    rng = random.Random(7)
+    params = {"status": "success", "result": {"device_name": "Operator", "parameters": [
+        {"index": i, "name": f"Param {i}", "value": rng.random(), "min": 0.0, "max": 1.0,
+         "is_quantized": i % 5 == 0, "value_items": ["Off", "On", "Sine", "Saw"] if i % 5 == 0 else []}
+        for i in range(150)]}}
+    notes = {"status": "success", "result": {"notes": [
+        {"pitch": 36 + i % 48, "start_time": i * 0.0625, "duration": 0.25, "velocity": 100, "mute": False}
+        for i in range(5000)]}}
+    meters = {"status": "success", "result": {
+        "tracks": [{"index": i, "output_meter_left": rng.random(), "output_meter_right": rng.random()}
+                   for i in range(64)],
+        "values": [rng.random() for _ in range(512)]}}
+    return [("params", params), ("notes", notes), ("meters", meters)]
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(samples)
+
+
+def measure(codec, obj, repeat: int) -> tuple:
+    encoded = codec.encode(obj)
+    framer = codec.framer()
+    framer.feed(encoded)
+    frame = framer.next_frame()
+    assert codec.decode(frame) == obj
+    return len(encoded), timed(lambda: codec.encode(obj), repeat), timed(lambda: codec.decode(frame), repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"median of {args.repeat} runs")
+    print(f"{'payload':<9}{'codec':<9}{'bytes':>10}{'encode ms':>11}{'decode ms':>11}")
+    for name, obj in make_payloads():
+        for codec in (JsonCodec(), MsgpackCodec()):
+            size, enc_ms, dec_ms = measure(codec, obj, args.repeat)
+            print(f"{name:<9}{codec.name:<9}{size:>10}{enc_ms:>11.2f}{dec_ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Per-command latency of modifying commands: fixed sleeps vs. settle signalling.
+
+Drives AbletonConnection against a simulated Remote Script that executes
+commands on a ticking "main thread" (Live's control-surface tick is roughly
+100 ms).  Two client/server pairings are measured:
+
+  before   — the old client path: sleep 100 ms after sending, read the
+             response, sleep another 100 ms
+  after    — AbletonConnection.send_command against a Remote Script that
+             marks responses "settled"; structural commands (track/device
+             creation) are held for one extra tick, value writes are not
+
+Usage:
+    python benchmarks/bench_write_latency.py [--commands 50] [--tick-ms 100]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from MCP_Server.server import AbletonConnection  # noqa: E402
+
+
+STRUCTURAL = {"create_midi_track"}
+
+COMMANDS = [
+    ("set_track_volume", {"track_index": 0, "volume": 0.7}),
+    ("create_midi_track", {"index": -1}),
+]
+
+
+class FakeRemoteScript:
+    """Minimal tick-driven stand-in for the AbletonMCP Remote Script."""
+
+    def __init__(self, tick_s: float, settle: bool):
+        self.tick_s = tick_s
+        self.settle = settle
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(1)
+        self.port = self.server.getsockname()[1]
+        self._pending = []
+        self._lock = threading.Lock()
+        self._running = True
+        threading.Thread(target=self._ticker, daemon=True).start()
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _ticker(self):
+        while self._running:
+            time.sleep(self.tick_s)
+            with self._lock:
+                due, self._pending = self._pending, []
+            for client, command, ticks_left in due:
+                if ticks_left > 0:
+                    with self._lock:
+                        self._pending.append((client, command, ticks_left - 1))
+                    continue
+                response = {"status": "success", "result": {}, "id": command.get("id")}
+                if self.settle:
+                    response["settled"] = True
+                    response["timing"] = {"exec_ms": 0.1, "settle_ms": 0.0}
+                client.sendall((json.dumps(response) + "\n").encode("utf-8"))
+
+    def _serve(self):
+        client, _ = self.server.accept()
+        buffer = b""
+        while self._running:
+            data = client.recv(8192)
+            if not data:
+                break
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                if line.strip():
+                    command = json.loads(line)
+                    settle_ticks = 1 if self.settle and command["type"] in STRUCTURAL else 0
+                    with self._lock:
+                        self._pending.append((client, command, settle_ticks))
+
+    def close(self):
+        self._running = False
+        self.server.close()
+
+
+def send_before(conn: AbletonConnection, command_type: str, params: dict) -> dict:
+    """Replay the old send path: fixed 100 ms sleeps around every write."""
+    command = {"type": command_type, "params": params, "id": next(conn._request_ids)}
+    conn.sock.sendall((json.dumps(command) + "\n").encode("utf-8"))
+    time.sleep(0.1)
+    response = conn.receive_full_response(conn.sock, timeout=15.0)
+    time.sleep(0.1)
+    return response
+
+
+def measure(mode: str, command_type: str, params: dict, count: int, tick_s: float) -> list:
+    fake = FakeRemoteScript(tick_s, settle=(mode == "after"))
+    conn = AbletonConnection(host="127.0.0.1", port=fake.port)
+    conn.connect()
+    samples = []
+    try:
+        for _ in range(count):
+            start = time.perf_counter()
+            if mode == "before":
+                send_before(conn, command_type, params)
+            else:
+                conn.send_command(command_type, params)
+            samples.append((time.perf_counter() - start) * 1000.0)
+    finally:
+        conn.disconnect()
+        fake.close()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=50)
+    parser.add_argument("--tick-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    print(f"{args.commands} commands per row, simulated tick {args.tick_ms:.0f} ms")
+    print(f"{'command':<20}{'mode':<8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'total s':>10}")
+    for command_type, params in COMMANDS:
+        for mode in ("before", "after"):
+            samples = measure(mode, command_type, params, args.commands, args.tick_ms / 1000.0)
+            ordered = sorted(samples)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            print(f"{command_type:<20}{mode:<8}{statistics.mean(samples):>10.1f}"
+                  f"{statistics.median(samples):>10.1f}{p95:>10.1f}{sum(samples) / 1000.0:>10.2f}")
+
+if __name__ == "__main__":
+    main()